@@ -0,0 +1,65 @@
+import os.path
+import statistics
+import subprocess
+import sys
+import time
+
+
+repository_path = os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                               os.pardir))
+
+HEAVY_MODULES = ("numpy", "pandas", "sklearn", "scipy", "catboost")
+
+
+def measure_cold_import(module_name="mlalgorithms.shell", repeat=10):
+    """
+    Measure cold import time of the module. Every measurement is done in a
+    fresh interpreter, so nothing is cached in sys.modules.
+
+    :param module_name: str, optional (default="mlalgorithms.shell").
+        Name of the module to import.
+
+    :param repeat: int, optional (default=10).
+        Number of fresh interpreters to start.
+
+    :return: dict.
+        Minimal and median import time in seconds and list of heavy modules
+        which were imported as a side effect.
+    """
+    code = (
+        f"import sys, time\n"
+        f"start = time.perf_counter()\n"
+        f"import {module_name}\n"
+        f"print(time.perf_counter() - start)\n"
+        f"print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))\n"
+    )
+
+    timings = []
+    heavy_modules = []
+    for _ in range(repeat):
+        output = subprocess.check_output([sys.executable, "-c", code],
+                                         cwd=repository_path,
+                                         universal_newlines=True)
+        lines = output.splitlines()
+        timings.append(float(lines[0]))
+        heavy_modules = lines[1].split() if len(lines) > 1 else []
+
+    return {
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "heavy_modules": heavy_modules
+    }
+
+
+def main():
+    start = time.perf_counter()
+    result = measure_cold_import()
+    print(f"Cold import of mlalgorithms.shell: "
+          f"min {result['min'] * 1000:.2f}ms, "
+          f"median {result['median'] * 1000:.2f}ms.")
+    print(f"Heavy modules imported: {result['heavy_modules'] or 'none'}.")
+    print(f"Total benchmark time: {time.perf_counter() - start:.2f}s.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+import sys
+import time
+
+import numpy as np
+
+from bench_import import repository_path
+
+sys.path.insert(0, repository_path)
+
+
+def generate_kernel_inputs(n_checks=100000, n_goods=300, random_state=0):
+    """
+    Generate inputs of every kernel: baskets with duplicated goods, interim
+    labels with ties and negative values.
+
+    :param n_checks: int, optional (default=100000).
+        Number of checks.
+
+    :param n_goods: int, optional (default=300).
+        Number of goods.
+
+    :param random_state: int, optional (default=0).
+        Seed of random generator.
+
+    :return: dict.
+        Dict with kernel names and lists of their arguments.
+    """
+    random_state = np.random.RandomState(random_state)
+
+    def baskets():
+        sizes = random_state.randint(0, 8, size=n_checks)
+        return [random_state.randint(n_goods // 10, size=x).tolist()
+                for x in sizes]
+
+    interim_labels = random_state.randint(-1, 4, size=(1000, n_goods))
+    return {
+        "intersection_sizes": [(baskets(), baskets())],
+        "f1_scores": [(baskets(), baskets())],
+        "to_final_label": [(x,) for x in interim_labels],
+        "to_interim_label": [(x, n_goods) for x in baskets()[:1000]],
+        "top_k_indices": [(x, 5) for x in interim_labels]
+    }
+
+
+def _conjunction(lst1, lst2):
+    # Former MeanF1Score.conjunction, lists must be sorted.
+    it1 = iter(lst1)
+    it2 = iter(lst2)
+    try:
+        value1 = next(it1)
+        value2 = next(it2)
+    except StopIteration:
+        return 0
+
+    result = 0
+    while True:
+        try:
+            if value1 == value2:
+                result += 1
+                value1 = next(it1)
+                value2 = next(it2)
+            elif value1 > value2:
+                value2 = next(it2)
+            else:
+                value1 = next(it1)
+        except StopIteration:
+            break
+    return result
+
+
+def _reference_intersection_sizes(lists1, lists2):
+    return [_conjunction(sorted(x), sorted(y)) for x, y in zip(lists1, lists2)]
+
+
+def _reference_f1_scores(validation_labels, predictions):
+    # Former MeanF1Score.test_check.
+    result = []
+    for validation_label, prediction in zip(validation_labels, predictions):
+        conj = _conjunction(sorted(prediction), sorted(validation_label))
+        p = conj / len(prediction) if prediction else 0
+        r = conj / len(validation_label) if validation_label else 0
+        result.append(2 * p * r / (p + r) if p or r else 0)
+    return result
+
+
+def _reference_to_final_label(interim_label):
+    # Former CommonParser.to_final_label.
+    result = []
+    for i, elem in enumerate(interim_label):
+        if elem != 0:
+            result += [i] * elem
+    return result
+
+
+def _reference_to_interim_label(label, width):
+    # Former CommonParser.to_interim_label.
+    result = [0] * width
+    for elem in label:
+        result[elem] += 1
+    return result
+
+
+def _reference_top_k_indices(values, k):
+    # Stable sort orders equal values by index.
+    return sorted(range(len(values)), key=lambda i: -values[i])[:k]
+
+
+# Pure Python kernels which every backend is compared with, so backends are
+# checked even if only one of them is available.
+REFERENCE_KERNELS = {
+    "intersection_sizes": _reference_intersection_sizes,
+    "f1_scores": _reference_f1_scores,
+    "to_final_label": _reference_to_final_label,
+    "to_interim_label": _reference_to_interim_label,
+    "top_k_indices": _reference_top_k_indices
+}
+
+
+def _is_equal(expected, result):
+    expected = np.asarray(expected)
+    if len(expected) != len(result):
+        return False
+    # Reference F1 score is computed by other formula.
+    if expected.dtype.kind == "f":
+        return np.allclose(result, expected, rtol=1e-12, atol=0.0)
+    return np.array_equal(result, expected)
+
+
+def compare_backends(inputs=None):
+    """
+    Run every kernel with all available backends, measure time and check
+    that results of every backend are identical to results of pure Python
+    reference kernel.
+
+    :param inputs: dict, optional (default=None).
+        Result of generate_kernel_inputs. None means default inputs.
+
+    :return: tuple (dict, list).
+        Time of every kernel and backend in seconds, reference kernels are
+        measured as "python" backend, and names of kernels with backends
+        which results differ from reference.
+    """
+    from mlalgorithms import kernels
+
+    if inputs is None:
+        inputs = generate_kernel_inputs()
+
+    backends = ["numpy"]
+    if kernels.is_numba_available():
+        backends.append("numba")
+
+    previous_backend = kernels.get_backend()
+    timings = dict()
+    mismatches = []
+    try:
+        for name, arguments in inputs.items():
+            start = time.perf_counter()
+            expected = [REFERENCE_KERNELS[name](*x) for x in arguments]
+            timings[(name, "python")] = time.perf_counter() - start
+
+            kernel = getattr(kernels, name)
+            for backend in backends:
+                kernels.set_backend(backend)
+                # The first call compiles Numba kernel, it is not measured.
+                kernel(*arguments[0])
+
+                start = time.perf_counter()
+                results = [kernel(*x) for x in arguments]
+                timings[(name, backend)] = time.perf_counter() - start
+
+                if not all(_is_equal(x, y)
+                           for x, y in zip(expected, results)):
+                    mismatches.append(f"{name} [{backend}]")
+    finally:
+        kernels.set_backend(previous_backend)
+    return timings, mismatches
+
+
+def main():
+    timings, mismatches = compare_backends()
+    for (name, backend), value in sorted(timings.items()):
+        print(f"{name} [{backend}]: {value:.4f}s")
+    for name in mismatches:
+        print(f"Backend differs from reference: {name}.")
+    if not mismatches:
+        print("Backends give results identical to reference.")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
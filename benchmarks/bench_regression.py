@@ -0,0 +1,307 @@
+import argparse
+import json
+import os.path
+import sys
+import time
+import tracemalloc
+
+from bench_import import measure_cold_import, repository_path
+from bench_kernels import compare_backends
+from synthetic_data import generate_train_data, generate_test_data
+
+sys.path.insert(0, repository_path)
+
+
+baseline_path = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             "baseline.json")
+
+# Stage regresses if its time or peak memory is larger than baseline value
+# multiplied by (1 + tolerance). Smaller absolute differences are noise.
+DEFAULT_TOLERANCE = 0.5
+MIN_TIME_DELTA = 0.01
+MIN_MEMORY_DELTA_MB = 1.0
+
+DATA_PARAMS = {
+    "n_persons": 2000,
+    "n_goods": 300,
+    "checks_per_day": 500
+}
+
+
+def _load_config(model_name):
+    from mlalgorithms.shell import ml_config_path
+
+    with open(ml_config_path, "r") as f:
+        config = json.loads(f.read())
+    config["selected_model"] = model_name
+    return config
+
+
+def _create_parser():
+    from mlalgorithms.parsers.common_parser import CommonParser
+
+    return CommonParser(proportion=0.7)
+
+
+class Benchmarks:
+
+    def __init__(self):
+        self.df_train = generate_train_data(**DATA_PARAMS)
+        self.df_set, self.df_menu = generate_test_data(
+            DATA_PARAMS["n_persons"], DATA_PARAMS["n_goods"],
+            checks_per_day=DATA_PARAMS["checks_per_day"]
+        )
+
+        # Checks of the day after train data for incremental updates.
+        self.df_next_day = generate_train_data(
+            DATA_PARAMS["n_persons"], DATA_PARAMS["n_goods"], n_days=1,
+            checks_per_day=DATA_PARAMS["checks_per_day"], random_state=2
+        ).assign(month=2, day=1)
+        self.df_next_day["chknum"] += self.df_train["chknum"].max()
+
+        self._parser = _create_parser()
+        self._parser.parse_train_data(self.df_train)
+
+    def setup_parse_train(self):
+        return _create_parser()
+
+    def run_parse_train(self, parser):
+        parser.parse_train_data(self.df_train)
+
+    def setup_build_labels(self):
+        return self._parser
+
+    @staticmethod
+    def run_build_labels(parser):
+        parser.get_train_data()
+
+    def setup_simple_model_predict(self):
+        from mlalgorithms.models.linear_model import LinearModel
+
+        model = LinearModel()
+        model.fit(*self._parser.get_train_data())
+        samples, _ = self._parser.get_validation_data()
+        return model, samples
+
+    @staticmethod
+    def run_simple_model_predict(state):
+        model, samples = state
+        model.predict(samples)
+
+    def setup_mean_f1_score(self):
+        from mlalgorithms.tester import MeanF1Score
+
+        answers = self._parser.answers_for_train
+        predictions = [x[::-1][:5] for x in answers[1:] + answers[:1]]
+        return MeanF1Score(0.5), answers, predictions
+
+    @staticmethod
+    def run_mean_f1_score(state):
+        metric, answers, predictions = state
+        metric.test(answers, predictions)
+
+    def setup_format_predictions(self):
+        from mlalgorithms.shell import Shell
+
+        shell = Shell(existing_parsed_json_dict=_load_config(
+            "MostPopularFromOwnOrders"
+        ))
+        shell.fit(self.df_train)
+        samples, _ = shell._parser.get_validation_data()
+        shell._predictions = shell._model.predict(samples)
+        return shell
+
+    @staticmethod
+    def run_format_predictions(shell):
+        shell._format_predictions()
+
+    def setup_partial_fit_after_predict(self):
+        from mlalgorithms.shell import Shell
+
+        # Parsing of test data replaces parsed samples, so partial fit must
+        # restore train data first.
+        shell = Shell(existing_parsed_json_dict=_load_config(
+            "MostPopularFromOwnOrders"
+        ))
+        shell.fit(self.df_train)
+        shell.predict(self.df_set, self.df_menu)
+        return shell
+
+    def run_partial_fit_after_predict(self, shell):
+        shell.partial_fit(self.df_next_day)
+        test_result, _ = shell.test()
+        if test_result is None:
+            raise RuntimeError("Validation data is not predicted after "
+                               "partial fit.")
+
+    def setup_pipeline(self):
+        from mlalgorithms.shell import Shell
+
+        return Shell(existing_parsed_json_dict=_load_config(
+            "MostPopularFromOwnOrders"
+        ))
+
+    def run_pipeline(self, shell):
+        shell.fit(self.df_train)
+        shell.test()
+        shell.predict(self.df_set, self.df_menu)
+
+    def names(self):
+        return [x[len("run_"):] for x in dir(self) if x.startswith("run_")]
+
+    def measure(self, name, repeat=3):
+        """
+        Measure minimal time of the benchmark and its peak traced memory.
+        Setup is not measured, memory is measured in a separate run because
+        tracing slows down the code.
+
+        :param name: str.
+            Benchmark name.
+
+        :param repeat: int, optional (default=3).
+            Number of timed runs.
+
+        :return: dict.
+            Time in seconds and peak memory in megabytes.
+        """
+        setup = getattr(self, "setup_" + name)
+        run = getattr(self, "run_" + name)
+
+        timings = []
+        for _ in range(repeat):
+            state = setup()
+            start = time.perf_counter()
+            run(state)
+            timings.append(time.perf_counter() - start)
+
+        state = setup()
+        tracemalloc.start()
+        try:
+            run(state)
+            peak_memory = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        return {
+            "time": min(timings),
+            "peak_memory_mb": peak_memory / 2 ** 20
+        }
+
+
+def run_benchmarks(names=None, repeat=3):
+    """
+    Run benchmarks on synthetic data.
+
+    :param names: list, optional (default=None).
+        Names of benchmarks. None means all benchmarks.
+
+    :param repeat: int, optional (default=3).
+        Number of timed runs of every benchmark.
+
+    :return: dict.
+        Dict with benchmark names and their results.
+    """
+    benchmarks = Benchmarks()
+    names = names or ["cold_import"] + benchmarks.names()
+
+    results = dict()
+    for name in names:
+        if name == "cold_import":
+            result = measure_cold_import(repeat=repeat)
+            results[name] = {"time": result["median"],
+                             "peak_memory_mb": None}
+        else:
+            results[name] = benchmarks.measure(name, repeat)
+        print(f"{name}: {results[name]['time']:.4f}s", flush=True)
+    return results
+
+
+def compare_with_baseline(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Find stages which are slower or use more memory than baseline.
+
+    :param results: dict.
+        Results of run_benchmarks.
+
+    :param baseline: dict.
+        Stored results of run_benchmarks.
+
+    :param tolerance: float, optional (default=0.5).
+        Allowed relative regression.
+
+    :return: list.
+        Messages about regressions and stages missing from baseline.
+    """
+    regressions = []
+    for name, result in results.items():
+        # Stage without baseline is never checked, so it must be added by
+        # --update-baseline together with the stage.
+        if name not in baseline:
+            regressions.append(f"{name}: no baseline, run with "
+                               f"--update-baseline")
+            continue
+
+        limits = (("time", MIN_TIME_DELTA, "s"),
+                  ("peak_memory_mb", MIN_MEMORY_DELTA_MB, "MB"))
+        for key, min_delta, unit in limits:
+            value, baseline_value = result[key], baseline[name][key]
+            if value is None or baseline_value is None:
+                continue
+            if (value > baseline_value * (1 + tolerance) and
+                    value - baseline_value > min_delta):
+                regressions.append(f"{name}: {key} {value:.4f}{unit}, "
+                                   f"baseline {baseline_value:.4f}{unit}")
+    return regressions
+
+
+def main(argv=None):
+    argument_parser = argparse.ArgumentParser(
+        description="Run performance regression benchmarks."
+    )
+    argument_parser.add_argument("names", nargs="*",
+                                 help="benchmarks to run, all by default")
+    argument_parser.add_argument("--baseline", default=baseline_path,
+                                 help="baseline JSON file")
+    argument_parser.add_argument("--update-baseline", action="store_true",
+                                 help="store results as new baseline")
+    argument_parser.add_argument("--tolerance", type=float,
+                                 default=DEFAULT_TOLERANCE,
+                                 help="allowed relative regression")
+    argument_parser.add_argument("--repeat", type=int, default=3,
+                                 help="number of timed runs")
+    args = argument_parser.parse_args(argv)
+
+    # Kernel backends must match reference before their timings matter.
+    _, mismatches = compare_backends()
+    for name in mismatches:
+        print(f"Kernel backend differs from reference: {name}.")
+    if mismatches:
+        return 1
+
+    results = run_benchmarks(args.names, args.repeat)
+
+    if args.update_baseline:
+        baseline = dict()
+        if os.path.exists(args.baseline):
+            with open(args.baseline, "r") as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Baseline is updated: {args.baseline}.")
+        return 0
+
+    with open(args.baseline, "r") as f:
+        baseline = json.load(f)
+
+    regressions = compare_with_baseline(results, baseline, args.tolerance)
+    for message in regressions:
+        print(f"Regression: {message}.")
+    if not regressions:
+        print("No regressions.")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+
+
+def generate_train_data(n_persons=1000, n_goods=200, n_days=28,
+                        checks_per_day=300, max_basket_size=6,
+                        random_state=0):
+    """
+    Generate train data in the Tinkoff schema. Popularity of goods follows
+    Zipf law and every person prefers own subset of goods, so models have
+    something to learn.
+
+    :param n_persons: int, optional (default=1000).
+        Number of persons.
+
+    :param n_goods: int, optional (default=200).
+        Number of goods.
+
+    :param n_days: int, optional (default=28).
+        Number of days, days are numbered inside months of 28 days.
+
+    :param checks_per_day: int, optional (default=300).
+        Number of checks of every day.
+
+    :param max_basket_size: int, optional (default=6).
+        Maximal number of goods in one check.
+
+    :param random_state: int, optional (default=0).
+        Seed of random generator.
+
+    :return: pd.DataFrame.
+        Data frame with chknum, person_id, month, day, good and good_id
+        columns.
+    """
+    random_state = np.random.RandomState(random_state)
+    popularity = 1.0 / np.arange(1, n_goods + 1)
+    favourites = random_state.randint(n_goods, size=(n_persons, 3))
+
+    n_checks = n_days * checks_per_day
+    persons = random_state.randint(n_persons, size=n_checks)
+    basket_sizes = random_state.randint(1, max_basket_size + 1,
+                                        size=n_checks)
+    check_ids = np.repeat(np.arange(n_checks), basket_sizes)
+
+    # Half of goods are person favourites, the other half are popular goods.
+    n_rows = len(check_ids)
+    goods = random_state.choice(n_goods, size=n_rows,
+                                p=popularity / popularity.sum())
+    use_favourite = random_state.rand(n_rows) < 0.5
+    favourite_goods = favourites[persons[check_ids],
+                                 random_state.randint(3, size=n_rows)]
+    goods[use_favourite] = favourite_goods[use_favourite]
+
+    days = check_ids // checks_per_day
+    df = pd.DataFrame({
+        "chknum": check_ids + 1,
+        "person_id": persons[check_ids],
+        "month": days // 28 + 1,
+        "day": days % 28 + 1,
+        "good": ["good_" + str(x) for x in goods],
+        "good_id": goods
+    }, columns=["chknum", "person_id", "month", "day", "good", "good_id"])
+    return df.drop_duplicates(["chknum", "good_id"]).reset_index(drop=True)
+
+
+def generate_test_data(n_persons=1000, n_goods=200, n_days=3,
+                       checks_per_day=300, menu_size=100, random_state=1):
+    """
+    Generate test set and menus in the Tinkoff schema for days after train
+    data.
+
+    :param n_persons: int, optional (default=1000).
+        Number of persons.
+
+    :param n_goods: int, optional (default=200).
+        Number of goods.
+
+    :param n_days: int, optional (default=3).
+        Number of test days.
+
+    :param checks_per_day: int, optional (default=300).
+        Number of checks of every day.
+
+    :param menu_size: int, optional (default=100).
+        Number of goods in menu of every day.
+
+    :param random_state: int, optional (default=1).
+        Seed of random generator.
+
+    :return: tuple of two pd.DataFrame.
+        Test set with chknum, person_id, month and day columns and menu with
+        month, day, good and good_id columns.
+    """
+    random_state = np.random.RandomState(random_state)
+
+    n_checks = n_days * checks_per_day
+    days = np.arange(n_checks) // checks_per_day
+    df_set = pd.DataFrame({
+        "chknum": np.arange(n_checks) + 10 ** 7,
+        "person_id": random_state.randint(n_persons, size=n_checks),
+        "month": 12,
+        "day": days + 1
+    }, columns=["chknum", "person_id", "month", "day"])
+
+    menus = [random_state.choice(n_goods, size=menu_size, replace=False)
+             for _ in range(n_days)]
+    df_menu = pd.DataFrame({
+        "month": 12,
+        "day": np.repeat(np.arange(n_days) + 1, menu_size),
+        "good": ["good_" + str(x) for x in np.concatenate(menus)],
+        "good_id": np.concatenate(menus)
+    }, columns=["month", "day", "good", "good_id"])
+    return df_set, df_menu
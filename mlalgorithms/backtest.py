@@ -0,0 +1,221 @@
+import concurrent.futures
+import copy
+import json
+import time
+
+import pandas as pd
+
+from .logger import get_logger
+from .shell import Shell, ml_config_path
+from .tester import MeanF1Score
+
+from . import checks
+
+
+UPDATE_MODES = ("partial", "refit")
+
+
+def _load_config(existing_parsed_json_dict=None):
+    """
+    Load config and switch off validation split, because every day of history
+    is used for training after it was scored.
+
+    :param existing_parsed_json_dict: dict, optional (default=None).
+        If config file was parsed, you can pass it to this function.
+
+    :return: dict.
+        Copy of config for backtesting.
+    """
+    if existing_parsed_json_dict is None:
+        with open(ml_config_path, "r") as f:
+            config = json.loads(f.read())
+    else:
+        checks.check_types(existing_parsed_json_dict, dict,
+                           var_name="existing_parsed_json_dict")
+        config = copy.deepcopy(existing_parsed_json_dict)
+
+    selected_parser = config["selected_parser"]
+    config["parsers"][selected_parser]["parser_params"]["proportion"] = 1.0
+    return config
+
+
+class Backtester:
+
+    def __init__(self, existing_parsed_json_dict=None, warmup_days=7,
+                 update_mode="partial"):
+        """
+        Constructor which initializes backtest parameters.
+
+        :param existing_parsed_json_dict: dict, optional (default=None).
+            If config file was parsed, you can pass it to this class.
+
+        :param warmup_days: int, optional (default=7).
+            Number of first days of history which are used only for initial
+            training.
+
+        :param update_mode: str, optional (default="partial").
+            How every scored day is folded into the model: "partial" calls
+            Shell.partial_fit with the day checks (models without incremental
+            training are refitted), "refit" trains model again on all days up
+            to the current one.
+        """
+        self._config = _load_config(existing_parsed_json_dict)
+
+        self._warmup_days = warmup_days
+        checks.check_types(self._warmup_days, int, var_name="warmup_days")
+        checks.check_value(self._warmup_days, 1, None, var_name="warmup_days")
+
+        self._update_mode = update_mode
+        if self._update_mode not in UPDATE_MODES:
+            raise ValueError(f"update_mode parameter must be one of "
+                             f"{UPDATE_MODES}: got {self._update_mode}.")
+
+        self._metric = MeanF1Score(
+            float(self._config["tester_params"]["border"])
+        )
+
+    @staticmethod
+    def _get_test_set(day_df):
+        return day_df[["chknum", "person_id", "month", "day"]]\
+            .drop_duplicates("chknum")
+
+    @staticmethod
+    def _get_menu(day_df, df_menu, date):
+        """
+        Get menu on the day from menu data frame or, if menu is not passed,
+        goods which were bought on the day.
+        """
+        if df_menu is None:
+            return day_df[["month", "day", "good", "good_id"]]\
+                .drop_duplicates("good_id")
+        return df_menu[(df_menu["month"] == date[0]) &
+                       (df_menu["day"] == date[1])]
+
+    @staticmethod
+    def _get_answers(day_df, chknums):
+        answers = day_df.groupby("chknum")["good_id"].apply(sorted)
+        return [answers[chknum] for chknum in chknums]
+
+    def _update(self, shell, day_df, history_parts):
+        if self._update_mode == "partial" and shell.supports_partial_fit():
+            shell.partial_fit(day_df, validate=False)
+        else:
+            shell.fit(pd.concat(history_parts, ignore_index=True))
+
+    def run(self, filepath_or_buffer_history, filepath_or_buffer_menu=None,
+            output_filename=None):
+        """
+        Walk through the days of history: predict checks of the day with the
+        day menu, score predictions with MeanF1Score and fold the day into
+        the model.
+
+        :param filepath_or_buffer_history: str, pathlib.Path,
+            py._path.local.LocalPath or any object with a read() method
+            (such as a file handle or StringIO) or pd.DataFrame.
+            History of checks in train data format.
+
+        :param filepath_or_buffer_menu: str, pathlib.Path,
+            py._path.local.LocalPath or any object with a read() method
+            (such as a file handle or StringIO) or pd.DataFrame,
+            optional (default=None).
+            Menus for history days. If it is not passed, goods bought on the
+            day are used as the day menu.
+
+        :param output_filename: str, file or buffer, optional (default=None).
+            Filename to output score series.
+
+        :return: pd.DataFrame.
+            Score series with month, day, number of checks, score and update
+            time for every scored day.
+        """
+        df_history = filepath_or_buffer_history
+        if not isinstance(df_history, pd.DataFrame):
+            df_history = pd.read_csv(df_history)
+
+        df_menu = filepath_or_buffer_menu
+        if df_menu is not None and not isinstance(df_menu, pd.DataFrame):
+            df_menu = pd.read_csv(df_menu)
+
+        days = [(date, day_df.reset_index(drop=True))
+                for date, day_df in df_history.groupby(["month", "day"])]
+        checks.check_value(len(days), self._warmup_days, None, True,
+                           var_name="number of days in history")
+
+        history_parts = [day_df for _, day_df in days[:self._warmup_days]]
+        shell = Shell(existing_parsed_json_dict=self._config)
+        shell.fit(pd.concat(history_parts, ignore_index=True))
+        if self._update_mode == "partial" and not shell.supports_partial_fit():
+            get_logger().info("Model does not support incremental training, "
+                              "refit is used.")
+
+        scores = []
+        for date, day_df in days[self._warmup_days:]:
+            test_set = self._get_test_set(day_df)
+            shell.predict(test_set, self._get_menu(day_df, df_menu, date))
+
+            answers = self._get_answers(day_df, test_set["chknum"])
+            score = self._metric.test(answers, shell.predictions)
+
+            start = time.time()
+            history_parts.append(day_df)
+            self._update(shell, day_df, history_parts)
+
+            scores.append({
+                "month": date[0],
+                "day": date[1],
+                "checks": len(answers),
+                "score": score,
+                "update_time": time.time() - start
+            })
+            get_logger().info(f"Backtest day {date[0]}-{date[1]}: "
+                              f"score {score:.6f}.")
+
+        result = pd.DataFrame(scores, columns=["month", "day", "checks",
+                                               "score", "update_time"])
+        if output_filename is not None:
+            result.to_csv(output_filename, index=False)
+        return result
+
+
+def _run_backtest(task):
+    config, kwargs, run_args = task
+    return Backtester(config, **kwargs).run(*run_args)
+
+
+def run_backtests(configs, filepath_history, filepath_menu=None, n_jobs=1,
+                  **kwargs):
+    """
+    Run backtests of independent model configs in the pool of worker
+    processes.
+
+    :param configs: dict.
+        Dict with names and parsed configs to backtest.
+
+    :param filepath_history: str.
+        File name of history of checks in train data format.
+
+    :param filepath_menu: str, optional (default=None).
+        File name of menus for history days.
+
+    :param n_jobs: int, optional (default=1).
+        Number of worker processes.
+
+    :param kwargs: dict, optional(default={}).
+        Additional parameters which pass into Backtester constructor.
+
+    :return: dict.
+        Dict with names of configs and their score series.
+    """
+    checks.check_types(configs, dict, var_name="configs")
+    checks.check_types(n_jobs, int, var_name="n_jobs")
+    checks.check_value(n_jobs, 1, None, var_name="n_jobs")
+
+    tasks = [(config, kwargs, (filepath_history, filepath_menu))
+             for config in configs.values()]
+    if n_jobs == 1:
+        results = map(_run_backtest, tasks)
+        return dict(zip(configs.keys(), results))
+
+    with concurrent.futures.ProcessPoolExecutor(n_jobs) as executor:
+        results = executor.map(_run_backtest, tasks)
+        return dict(zip(configs.keys(), results))
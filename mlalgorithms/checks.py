@@ -1,3 +1,39 @@
+import os
+
+
+# Optimised mode skips self-tests which are run on hot paths. It is enabled by
+# MLALGORITHMS_OPTIMIZED environment variable or by "optimized" flag in config.
+OPTIMIZED_BY_ENVIRONMENT = os.environ.get(
+    "MLALGORITHMS_OPTIMIZED", ""
+).lower() not in ("", "0", "false", "no")
+
+_is_optimized = OPTIMIZED_BY_ENVIRONMENT
+
+
+def set_optimized(flag=True):
+    """
+    Switch optimised mode on or off for the whole library.
+
+    :param flag: bool, optional (default=True).
+        New state of optimised mode.
+    """
+    global _is_optimized
+
+    check_types(flag, bool, var_name="flag")
+    _is_optimized = flag
+
+
+def is_optimized():
+    """
+    Return state of optimised mode. In optimised mode self-tests of the
+    library are skipped.
+
+    :return: bool.
+        True if optimised mode is on.
+    """
+    return _is_optimized
+
+
 def check_types(value, *types, var_name="value"):
     """
     Check value by types compliance.
@@ -56,39 +92,34 @@ def check_value(value, lower=None, upper=None, strict_less=False,
     if not upper_value and strict_greater:
         raise ValueError("strict_greater argument must be False when upper is "
                          "not specified.")
-
-    # Dict where keys have format like
-    # (lower_value, upper_value, strict_less, strict_greater)
-    possible_options = {
-        (True, False, True, False): {"res": lambda x: lower < x,
-                                     "str": f"({lower}, inf)"},
-
-        (True, False, False, False): {"res": lambda x: lower <= x,
-                                      "str": f"[{lower}, inf)"},
-
-        (False, True, False, True): {"res": lambda x: x < upper,
-                                     "str": f"(-inf, {upper})"},
-
-        (False, True, False, False): {"res": lambda x: x <= upper,
-                                      "str": f"(-inf, {upper}]"},
-
-        (True, True, True, True): {"res": lambda x: lower < x < upper,
-                                   "str": f"({lower}, {upper})"},
-
-        (True, True, False, True): {"res": lambda x: lower <= x < upper,
-                                    "str": f"[{lower}, {upper})"},
-
-        (True, True, True, False): {"res": lambda x: lower < x <= upper,
-                                    "str": f"({lower}, {upper}]"},
-
-        (True, True, False, False): {"res": lambda x: lower <= x <= upper,
-                                     "str": f"[{lower}, {upper}]"}
-    }
-
-    result = possible_options[lower_value, upper_value,
-                              strict_less, strict_greater]
-    if not result["res"](value):
-        raise ValueError(f"{var_name} parameter must be in {result['str']}: "
+    if not lower_value and not upper_value:
+        raise ValueError("At least one of lower and upper bounds must be "
+                         "specified.")
+
+    # Compare without any allocations, interval string is built only when
+    # value is out of bounds.
+    if lower_value:
+        if strict_less:
+            is_good_value = lower < value
+        else:
+            is_good_value = lower <= value
+    else:
+        is_good_value = True
+
+    if is_good_value and upper_value:
+        if strict_greater:
+            is_good_value = value < upper
+        else:
+            is_good_value = value <= upper
+
+    if not is_good_value:
+        left = f"({lower}" if strict_less else f"[{lower}"
+        right = f"{upper})" if strict_greater else f"{upper}]"
+        if not lower_value:
+            left = "(-inf"
+        if not upper_value:
+            right = "inf)"
+        raise ValueError(f"{var_name} parameter must be in {left}, {right}: "
                          f"got {value}.")
 
 
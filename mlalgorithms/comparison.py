@@ -0,0 +1,181 @@
+import argparse
+import copy
+import json
+import multiprocessing
+import os
+import time
+
+from .logger import get_logger
+from .shell import Shell, ml_config_path
+
+from . import checks
+
+
+# TestModel predicts validation answers, it is useful only for debugging.
+EXCLUDED_MODELS = ("TestModel",)
+
+COLUMNS = ("model", "f1", "fit_time", "predict_time", "peak_memory_mb",
+           "error")
+
+# Config and parsed train data of the current worker process, they are sent
+# to every worker only once by pool initializer.
+_worker_config = None
+_worker_parser = None
+
+
+def _init_worker(config, parser):
+    global _worker_config, _worker_parser
+
+    _worker_config = config
+    _worker_parser = parser
+
+
+def _get_peak_memory_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Maximal resident set size is in kilobytes on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _get_memory_mb():
+    # Current resident set size, /proc is available only on Linux.
+    try:
+        with open("/proc/self/statm", "r") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+
+
+def _compare_model(model_name):
+    result = dict.fromkeys(COLUMNS)
+    result["model"] = model_name
+
+    # Forked worker starts with pages of parsed data inherited from the
+    # parent, so only growth of memory over the start is used by the model.
+    start_memory = _get_memory_mb()
+    if start_memory is None:
+        start_memory = _get_peak_memory_mb()
+
+    config = copy.deepcopy(_worker_config)
+    config["selected_model"] = model_name
+    # Models are ranked by MeanF1Score whatever metric is selected in config.
+    config["selected_metric"] = "f1"
+    config["metrics"]["f1"] = "MeanF1Score"
+    try:
+        shell = Shell(existing_parsed_json_dict=config)
+
+        start = time.time()
+        shell.fit_parsed(_worker_parser, predict_validation=False)
+        result["fit_time"] = time.time() - start
+
+        start = time.time()
+        shell.predict_validation()
+        result["predict_time"] = time.time() - start
+
+        result["f1"], _ = shell.test()
+    except Exception as e:
+        # Failed model is ranked last, traceback is kept in the log.
+        get_logger().exception(f"Model {model_name} failed.")
+        result["error"] = f"{type(e).__name__}: {e}"
+
+    peak_memory = _get_peak_memory_mb()
+    if peak_memory is not None and start_memory is not None:
+        result["peak_memory_mb"] = max(peak_memory - start_memory, 0.0)
+    return result
+
+
+def compare_models(filepath_or_buffer, model_names=None,
+                   existing_parsed_json_dict=None, n_jobs=1,
+                   output_filename=None):
+    """
+    Parse train data once, then fit and predict every model on the same
+    parsed data in the pool of worker processes. Every model is trained in
+    a new worker, so peak memory of the worker over its memory at start is
+    peak memory of the model.
+
+    :param filepath_or_buffer: str, pathlib.Path, py._path.local.LocalPath
+        or any object accepted by Shell.fit.
+        Train data, validation part of it is used for scoring.
+
+    :param model_names: list, optional (default=None).
+        Names of models from config to compare. None means all models.
+
+    :param existing_parsed_json_dict: dict, optional (default=None).
+        If config file was parsed, you can pass it to this function.
+
+    :param n_jobs: int, optional (default=1).
+        Number of worker processes.
+
+    :param output_filename: str, file or buffer, optional (default=None).
+        Filename to output comparison table.
+
+    :return: pd.DataFrame.
+        Table with MeanF1Score, fit time, predict time and peak memory of
+        every model, ranked by score.
+    """
+    import pandas as pd
+
+    if existing_parsed_json_dict is None:
+        with open(ml_config_path, "r") as f:
+            config = json.loads(f.read())
+    else:
+        checks.check_types(existing_parsed_json_dict, dict,
+                           var_name="existing_parsed_json_dict")
+        config = copy.deepcopy(existing_parsed_json_dict)
+
+    if model_names is None:
+        model_names = [x for x in config["models"]
+                       if x not in EXCLUDED_MODELS]
+    checks.check_types(model_names, list, var_name="model_names")
+    checks.check_types(n_jobs, int, var_name="n_jobs")
+    checks.check_value(n_jobs, 1, None, var_name="n_jobs")
+
+    parser = Shell(existing_parsed_json_dict=config)\
+        .parse_train_data(filepath_or_buffer)
+
+    if "fork" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("fork")
+    else:
+        context = multiprocessing.get_context()
+    with context.Pool(n_jobs, _init_worker, (config, parser),
+                      maxtasksperchild=1) as pool:
+        results = pool.map(_compare_model, model_names, chunksize=1)
+
+    for result in results:
+        if result["error"] is not None:
+            get_logger().info(f"Model {result['model']} failed: "
+                              f"{result['error']}")
+
+    table = pd.DataFrame(results, columns=COLUMNS)
+    table = table.sort_values("f1", ascending=False, kind="mergesort")\
+        .reset_index(drop=True)
+    table.index += 1
+    if output_filename is not None:
+        table.to_csv(output_filename, index_label="rank")
+    return table
+
+
+def main(argv=None):
+    argument_parser = argparse.ArgumentParser(
+        description="Compare configured models on one parsed dataset."
+    )
+    argument_parser.add_argument("train", help="train data file")
+    argument_parser.add_argument("--models", nargs="+", default=None,
+                                 help="models to compare, all configured "
+                                      "models by default")
+    argument_parser.add_argument("--n-jobs", type=int, default=1,
+                                 help="number of worker processes")
+    argument_parser.add_argument("--output", default=None,
+                                 help="file to output comparison table")
+    args = argument_parser.parse_args(argv)
+
+    table = compare_models(args.train, args.models, n_jobs=args.n_jobs,
+                           output_filename=args.output)
+    print(table.to_string())
+
+
+if __name__ == "__main__":
+    main()
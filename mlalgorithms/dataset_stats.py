@@ -0,0 +1,103 @@
+import itertools
+
+import numpy as np
+
+
+LABEL_FORMATS = ("auto", "list", "dense", "sparse")
+
+# Labels are stored in CSR matrix if share of non-zero values is less than
+# this threshold and dense matrix would have at least MIN_SPARSE_SIZE
+# elements. Small matrices are faster in dense form anyway.
+SPARSE_DENSITY_THRESHOLD = 0.05
+MIN_SPARSE_SIZE = 2 ** 20
+
+
+def compute_dataset_stats(instances, labels, width):
+    """
+    Compute statistics of parsed train data in one pass over checks.
+
+    :param instances: list.
+        Parsed checks, dicts with person_id, month and day keys.
+
+    :param labels: list.
+        Good ids of every check.
+
+    :param width: int.
+        Width of interim labels, i.e. max good id plus one.
+
+    :return: dict.
+        Number of persons, goods, days and checks, mean basket size, density
+        of interim labels and maximal count of one good in one check.
+    """
+    lengths = np.fromiter((len(x) for x in labels), dtype=np.int64,
+                          count=len(labels))
+    goods = np.fromiter(itertools.chain.from_iterable(labels),
+                        dtype=np.int64, count=int(lengths.sum()))
+
+    # Pairs of check and good, duplicated goods of one check are counted in
+    # one element of interim label.
+    rows = np.repeat(np.arange(len(labels), dtype=np.int64), lengths)
+    _, pair_counts = np.unique(rows * max(width, 1) + goods,
+                               return_counts=True)
+
+    n_checks = len(labels)
+    return {
+        "n_persons": len(set(x["person_id"] for x in instances)),
+        "n_goods": len(np.unique(goods)),
+        "n_days": len(set((x["month"], x["day"]) for x in instances)),
+        "n_checks": n_checks,
+        "width": int(width),
+        "mean_basket_size": float(lengths.mean()) if n_checks else 0.0,
+        "density": (float(len(pair_counts) / (n_checks * width))
+                    if n_checks and width else 0.0),
+        "max_count": int(pair_counts.max(initial=0))
+    }
+
+
+def choose_label_format(stats):
+    """
+    Choose storage of interim labels by dataset statistics.
+
+    :param stats: dict.
+        Result of compute_dataset_stats.
+
+    :return: str.
+        "sparse" for CSR matrix or "dense" for NumPy array.
+    """
+    if (stats["density"] < SPARSE_DENSITY_THRESHOLD and
+            stats["n_checks"] * stats["width"] >= MIN_SPARSE_SIZE):
+        return "sparse"
+    return "dense"
+
+
+def choose_label_dtype(stats):
+    """
+    Choose the smallest integer type which holds every element of interim
+    labels.
+
+    :param stats: dict.
+        Result of compute_dataset_stats.
+
+    :return: np.dtype.
+        Signed integer type.
+    """
+    for dtype in (np.int8, np.int16, np.int32):
+        if stats["max_count"] <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+def format_dataset_stats(stats):
+    """
+    Format statistics for logs.
+
+    :param stats: dict.
+        Result of compute_dataset_stats.
+
+    :return: str.
+        One line with all statistics.
+    """
+    return (f"{stats['n_persons']} persons, {stats['n_goods']} goods, "
+            f"{stats['n_days']} days, {stats['n_checks']} checks, "
+            f"mean basket size {stats['mean_basket_size']:.2f}, "
+            f"density {stats['density']:.5f}")
@@ -0,0 +1,193 @@
+import numpy as np
+import pandas as pd
+
+from . import checks
+from . import kernels
+
+
+# Columns of check information which define every slice.
+SLICES = {
+    "person": ["person_id"],
+    "day": ["month", "day"],
+    "basket_size": ["basket_size"]
+}
+
+SCORE_COLUMNS = ["precision", "recall", "f1"]
+
+
+def _divide(numerator, denominator):
+    # Empty prediction or basket has zero score.
+    result = np.zeros(len(numerator))
+    np.divide(numerator, denominator, out=result, where=denominator > 0)
+    return result
+
+
+def _rows_of(offsets):
+    return np.repeat(np.arange(len(offsets) - 1, dtype=np.int64),
+                     np.diff(offsets))
+
+
+def _distinct_pairs(values, offsets):
+    """
+    Get distinct (check, good) pairs from flattened sorted lists.
+    """
+    rows = _rows_of(offsets)
+    is_distinct = np.ones(len(values), dtype=bool)
+    is_distinct[1:] = ((rows[1:] != rows[:-1]) |
+                       (values[1:] != values[:-1]))
+    return rows[is_distinct], values[is_distinct]
+
+
+def _goods_hit_rates(values1, offsets1, values2, offsets2):
+    """
+    Count checks where every good was bought, predicted and both.
+    """
+    rows1, goods1 = _distinct_pairs(values1, offsets1)
+    rows2, goods2 = _distinct_pairs(values2, offsets2)
+
+    width = int(max(goods1.max(initial=-1), goods2.max(initial=-1))) + 1
+    is_hit = np.isin(rows1 * width + goods1, rows2 * width + goods2,
+                     assume_unique=True)
+
+    goods = pd.DataFrame({
+        "good_id": np.arange(width),
+        "support": np.bincount(goods1, minlength=width),
+        "predicted": np.bincount(goods2, minlength=width),
+        "hits": np.bincount(goods1[is_hit], minlength=width)
+    }, columns=["good_id", "support", "predicted", "hits"])
+    goods = goods[(goods["support"] > 0) | (goods["predicted"] > 0)]
+
+    # Rates of goods which were never bought or predicted are NaN.
+    goods = goods.assign(hit_rate=goods["hits"] / goods["support"],
+                         precision=goods["hits"] / goods["predicted"])
+    return goods.set_index("good_id")
+
+
+def _count_in_rows(mask, offsets, rows):
+    # Number of true values of mask before every element of its row.
+    cumulative = np.zeros(len(mask) + 1, dtype=np.int64)
+    np.cumsum(mask, out=cumulative[1:])
+    return cumulative[:-1] - cumulative[offsets[rows]]
+
+
+def ranking_scores(validation_labels, predictions, k=5):
+    """
+    Calculate F1 score, precision@k, recall@k, hit rate@k and average
+    precision@k of every check in one pass over flattened labels and
+    predictions.
+
+    Predicted goods are ranked by their order in the prediction, repeated
+    goods are skipped by ranking metrics. F1 score treats lists as
+    multisets, the same as MeanF1Score.
+
+    :param validation_labels: list.
+        List of lists with known good ids.
+
+    :param predictions: list.
+        List of lists with predicted good ids in order of their rank.
+
+    :param k: int, optional (default=5).
+        Number of top predicted goods for ranking metrics.
+
+    :return: dict.
+        Dict with np.ndarray values: "f1", "precision_at_k", "recall_at_k",
+        "hit_rate" and "average_precision".
+    """
+    checks.check_types(k, int, var_name="k")
+    checks.check_value(k, 0, None, True, var_name="k")
+
+    values1, offsets1 = kernels.flatten_sorted(validation_labels)
+    values2, offsets2 = kernels.flatten(predictions)
+    conj = kernels.sorted_intersection_sizes(
+        values1, offsets1, kernels.sort_flattened(values2, offsets2), offsets2
+    )
+    basket_sizes = np.diff(offsets1)
+    f1 = _divide(2.0 * conj, basket_sizes + np.diff(offsets2))
+
+    n_checks = len(offsets1) - 1
+    rows1, goods1 = _distinct_pairs(values1, offsets1)
+    n_relevant = np.bincount(rows1, minlength=n_checks)
+
+    # Goods are encoded with check numbers, so membership of predicted goods
+    # in labels of their checks is checked for all checks at once.
+    rows2 = _rows_of(offsets2)
+    width = int(max(goods1.max(initial=-1), values2.max(initial=-1))) + 1
+    keys2 = rows2 * width + values2
+    is_first = np.zeros(len(values2), dtype=bool)
+    is_first[np.unique(keys2, return_index=True)[1]] = True
+
+    ranks = _count_in_rows(is_first, offsets2, rows2)
+    is_hit = (is_first & (ranks < k) &
+              np.isin(keys2, rows1 * width + goods1))
+    hits = np.bincount(rows2[is_hit], minlength=n_checks)
+
+    # Precision at rank of every hit is summed for average precision.
+    precisions = (_count_in_rows(is_hit, offsets2, rows2) + 1) / (ranks + 1)
+    average_precision = _divide(
+        np.bincount(rows2[is_hit], weights=precisions[is_hit],
+                    minlength=n_checks),
+        np.minimum(n_relevant, k)
+    )
+
+    return {
+        "f1": f1,
+        "precision_at_k": hits / k,
+        "recall_at_k": _divide(hits, n_relevant),
+        "hit_rate": (hits > 0).astype(np.float64),
+        "average_precision": average_precision
+    }
+
+
+def sliced_evaluation(validation_labels, predictions, checks_info=None):
+    """
+    Evaluate predictions per check and aggregate precision, recall and F1
+    score over persons, days and basket sizes. All values are computed from
+    one flattened form of labels and predictions.
+
+    :param validation_labels: list.
+        List of lists with known good ids.
+
+    :param predictions: list.
+        List of lists with predicted good ids.
+
+    :param checks_info: pd.DataFrame, optional (default=None).
+        Information about every check, e.g. result of
+        IParser.get_validation_info with person_id, month and day columns.
+        Slices by persons and days are computed only if it is passed.
+
+    :return: dict.
+        Dict with pd.DataFrame values: "checks" with scores of every check,
+        "person", "day" and "basket_size" with mean scores and number of
+        checks of every group, "goods" with support, number of predictions,
+        hits, hit rate and precision of every good.
+    """
+    values1, offsets1 = kernels.flatten_sorted(validation_labels)
+    values2, offsets2 = kernels.flatten_sorted(predictions)
+    conj = kernels.sorted_intersection_sizes(values1, offsets1,
+                                             values2, offsets2)
+
+    basket_sizes = np.diff(offsets1)
+    prediction_sizes = np.diff(offsets2)
+    check_scores = pd.DataFrame({
+        "basket_size": basket_sizes,
+        "prediction_size": prediction_sizes,
+        "hits": conj,
+        "precision": _divide(conj, prediction_sizes),
+        "recall": _divide(conj, basket_sizes),
+        "f1": _divide(2.0 * conj, basket_sizes + prediction_sizes)
+    }, columns=["basket_size", "prediction_size", "hits"] + SCORE_COLUMNS)
+    if checks_info is not None:
+        check_scores = pd.concat(
+            [checks_info.reset_index(drop=True), check_scores], axis=1
+        )
+
+    result = {"checks": check_scores}
+    for name, columns in SLICES.items():
+        if not all(x in check_scores.columns for x in columns):
+            continue
+        groups = check_scores.groupby(columns)
+        result[name] = groups[SCORE_COLUMNS].mean()
+        result[name]["checks"] = groups.size()
+
+    result["goods"] = _goods_hit_rates(values1, offsets1, values2, offsets2)
+    return result
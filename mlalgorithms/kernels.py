@@ -0,0 +1,364 @@
+import importlib.util
+import itertools
+import os
+
+import numpy as np
+
+
+# Kernels are compiled by Numba if it is installed, otherwise they are
+# implemented with NumPy. Backend can be set explicitly by
+# MLALGORITHMS_KERNELS environment variable or by set_backend.
+BACKENDS = ("numpy", "numba")
+
+_backend = None
+_numba_kernels = None
+
+
+def is_numba_available():
+    """
+    Check whether Numba is installed without importing it.
+
+    :return: bool.
+        True if Numba backend can be used.
+    """
+    return importlib.util.find_spec("numba") is not None
+
+
+def set_backend(name):
+    """
+    Select implementation of kernels for the whole library.
+
+    :param name: str.
+        "numpy" or "numba".
+    """
+    global _backend
+
+    if name not in BACKENDS:
+        raise ValueError(f"name parameter must be one of {BACKENDS}: "
+                         f"got {name}.")
+    if name == "numba" and not is_numba_available():
+        raise ValueError("Numba backend is selected, but numba is not "
+                         "installed.")
+    _backend = name
+
+
+def get_backend():
+    """
+    Get name of the current backend. On the first call backend is selected
+    by MLALGORITHMS_KERNELS environment variable or by availability of
+    Numba.
+
+    :return: str.
+        "numpy" or "numba".
+    """
+    if _backend is None:
+        name = os.environ.get("MLALGORITHMS_KERNELS", "").lower()
+        if not name:
+            name = "numba" if is_numba_available() else "numpy"
+        set_backend(name)
+    return _backend
+
+
+def _compile_numba_kernels():
+    import numba
+
+    @numba.njit(cache=True)
+    def intersection_sizes(values1, offsets1, values2, offsets2):
+        result = np.zeros(len(offsets1) - 1, dtype=np.int64)
+        for row in range(len(result)):
+            i, end1 = offsets1[row], offsets1[row + 1]
+            j, end2 = offsets2[row], offsets2[row + 1]
+            while i < end1 and j < end2:
+                if values1[i] == values2[j]:
+                    result[row] += 1
+                    i += 1
+                    j += 1
+                elif values1[i] > values2[j]:
+                    j += 1
+                else:
+                    i += 1
+        return result
+
+    @numba.njit(cache=True)
+    def to_final_label(interim_label):
+        size = 0
+        for x in interim_label:
+            if x > 0:
+                size += x
+        result = np.empty(size, dtype=np.int64)
+        position = 0
+        for i in range(len(interim_label)):
+            for _ in range(interim_label[i]):
+                result[position] = i
+                position += 1
+        return result
+
+    @numba.njit(cache=True)
+    def to_interim_label(label, width):
+        result = np.zeros(width, dtype=np.int64)
+        for x in label:
+            result[x] += 1
+        return result
+
+    @numba.njit(cache=True)
+    def top_k_indices(values, k):
+        # k passes of selection are faster than sorting for small k, strict
+        # comparison selects the smallest index among equal values.
+        result = np.empty(k, dtype=np.int64)
+        selected = np.zeros(len(values), dtype=np.bool_)
+        for position in range(k):
+            best = -1
+            for i in range(len(values)):
+                if not selected[i] and (best == -1 or
+                                        values[i] > values[best]):
+                    best = i
+            selected[best] = True
+            result[position] = best
+        return result
+
+    return {
+        "intersection_sizes": intersection_sizes,
+        "to_final_label": to_final_label,
+        "to_interim_label": to_interim_label,
+        "top_k_indices": top_k_indices
+    }
+
+
+def _get_numba_kernel(name):
+    global _numba_kernels
+
+    # Numba is imported and kernels are compiled only on the first use.
+    if _numba_kernels is None:
+        _numba_kernels = _compile_numba_kernels()
+    return _numba_kernels[name]
+
+
+def flatten(lists):
+    """
+    Concatenate lists into one array with offsets of every list, order of
+    values is kept.
+
+    :param lists: list.
+        List of lists with good ids.
+
+    :return: tuple (np.ndarray, np.ndarray).
+        Concatenated values and offsets, values of list i are
+        values[offsets[i]:offsets[i + 1]].
+    """
+    lengths = np.fromiter((len(x) for x in lists), dtype=np.int64,
+                          count=len(lists))
+    offsets = np.zeros(len(lists) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    values = np.fromiter(itertools.chain.from_iterable(lists),
+                         dtype=np.int64, count=int(offsets[-1]))
+    return values, offsets
+
+
+def sort_flattened(values, offsets):
+    """
+    Sort values of every list flattened by flatten.
+
+    :param values: np.ndarray.
+        Concatenated values.
+
+    :param offsets: np.ndarray.
+        Offsets of every list.
+
+    :return: np.ndarray.
+        Concatenated values, values of every list are sorted.
+    """
+    if len(values) == 0:
+        return values.copy()
+
+    # Values are sorted as keys row * stride + value, arrays are changed in
+    # place to keep only three arrays of values size alive.
+    min_value = values.min()
+    stride = values.max() - min_value + 1
+    row_keys = np.repeat(np.arange(len(offsets) - 1, dtype=np.int64),
+                         np.diff(offsets))
+    row_keys *= stride
+    keys = values - min_value
+    keys += row_keys
+    keys.sort()
+    keys -= row_keys
+    keys += min_value
+    return keys
+
+
+def flatten_sorted(lists):
+    """
+    Concatenate lists into one array with offsets of every list, values of
+    every list are sorted.
+
+    :param lists: list.
+        List of lists with good ids.
+
+    :return: tuple (np.ndarray, np.ndarray).
+        Concatenated values and offsets, values of list i are
+        values[offsets[i]:offsets[i + 1]].
+    """
+    values, offsets = flatten(lists)
+    return sort_flattened(values, offsets), offsets
+
+
+def _row_keys(values, offsets, min_value, stride):
+    # Keys row * stride + value - min_value are sorted for sorted lists.
+    keys = np.repeat(np.arange(len(offsets) - 1, dtype=np.int64) * stride -
+                     min_value, np.diff(offsets))
+    keys += values
+    return keys
+
+
+def _intersection_sizes_numpy(values1, offsets1, values2, offsets2):
+    n_rows = len(offsets1) - 1
+    if len(values1) == 0 or len(values2) == 0:
+        return np.zeros(n_rows, dtype=np.int64)
+
+    min_value = min(values1.min(), values2.min())
+    stride = max(values1.max(), values2.max()) - min_value + 1
+    keys1 = _row_keys(values1, offsets1, min_value, stride)
+    keys2 = _row_keys(values2, offsets2, min_value, stride)
+
+    # Key of the first lists is common if the second lists contain more
+    # equal keys than its number among equal keys, so intersection of
+    # multisets is found by binary search without temporary key tables.
+    numbers = np.searchsorted(keys1, keys1, "left")
+    np.subtract(np.arange(len(keys1)), numbers, out=numbers)
+    counts = np.searchsorted(keys2, keys1, "right")
+    counts -= np.searchsorted(keys2, keys1, "left")
+    common = counts > numbers
+    del numbers, counts
+
+    return np.bincount(keys1[common] // stride, minlength=n_rows)
+
+
+def sorted_intersection_sizes(values1, offsets1, values2, offsets2):
+    """
+    Calculate cardinality of intersection of every pair of lists flattened
+    by flatten_sorted, lists are treated as multisets.
+
+    :param values1: np.ndarray.
+        Values of the first lists.
+
+    :param offsets1: np.ndarray.
+        Offsets of the first lists.
+
+    :param values2: np.ndarray.
+        Values of the second lists.
+
+    :param offsets2: np.ndarray.
+        Offsets of the second lists.
+
+    :return: np.ndarray.
+        Cardinality of intersection of every pair.
+    """
+    if get_backend() == "numba":
+        return _get_numba_kernel("intersection_sizes")(values1, offsets1,
+                                                       values2, offsets2)
+    return _intersection_sizes_numpy(values1, offsets1, values2, offsets2)
+
+
+def intersection_sizes(lists1, lists2):
+    """
+    Calculate cardinality of intersection of every pair of lists, lists are
+    treated as multisets.
+
+    :param lists1: list.
+        List of lists with good ids, e.g. validation labels.
+
+    :param lists2: list.
+        List of lists with good ids of the same length, e.g. predictions.
+
+    :return: np.ndarray.
+        Cardinality of intersection of every pair.
+    """
+    return sorted_intersection_sizes(*flatten_sorted(lists1),
+                                     *flatten_sorted(lists2))
+
+
+def f1_scores(validation_labels, predictions):
+    """
+    Calculate F1 score of every check.
+
+    :param validation_labels: list.
+        List of lists with known good ids.
+
+    :param predictions: list.
+        List of lists with predicted good ids.
+
+    :return: np.ndarray.
+        F1 score of every check, 0.0 if both lists are empty.
+    """
+    values1, offsets1 = flatten_sorted(validation_labels)
+    values2, offsets2 = flatten_sorted(predictions)
+    conj = sorted_intersection_sizes(values1, offsets1, values2, offsets2)
+
+    # F1 score 2 * p * r / (p + r) is equal to 2 * conj / (|x| + |y|).
+    total = np.diff(offsets1) + np.diff(offsets2)
+    result = np.zeros(len(conj))
+    np.divide(2.0 * conj, total, out=result, where=total > 0)
+    return result
+
+
+def to_final_label(interim_label):
+    """
+    Transform interim label to list of good ids: every index is repeated by
+    its count, non-positive counts are skipped.
+
+    :param interim_label: array-like.
+        Integer counts of goods.
+
+    :return: np.ndarray.
+        Sorted good ids.
+    """
+    interim_label = np.asarray(interim_label, dtype=np.int64)
+    if get_backend() == "numba":
+        return _get_numba_kernel("to_final_label")(interim_label)
+    return np.repeat(np.arange(len(interim_label)),
+                     np.maximum(interim_label, 0))
+
+
+def to_interim_label(label, width):
+    """
+    Transform list of good ids to counts of goods.
+
+    :param label: array-like.
+        Good ids.
+
+    :param width: int.
+        Length of result, good ids must be less than width.
+
+    :return: np.ndarray.
+        Counts of goods.
+    """
+    label = np.asarray(label, dtype=np.int64)
+    if len(label) > 0 and (label.min() < 0 or label.max() >= width):
+        raise IndexError(f"Good ids must be in [0, {width}).")
+
+    if get_backend() == "numba":
+        return _get_numba_kernel("to_interim_label")(label, width)
+    return np.bincount(label, minlength=width)
+
+
+def top_k_indices(values, k):
+    """
+    Find indices of k largest values. Equal values are ordered by index.
+
+    :param values: np.ndarray.
+        One-dimensional array.
+
+    :param k: int.
+        Number of indices, it is reduced to the length of values.
+
+    :return: np.ndarray.
+        Indices in descending order of values.
+    """
+    values = np.asarray(values)
+    k = max(min(k, len(values)), 0)
+    if get_backend() == "numba":
+        return _get_numba_kernel("top_k_indices")(values, k)
+
+    # Stable ascending sort of reversed array, reversed back, orders equal
+    # values by index.
+    order = np.argsort(values[::-1], kind="mergesort")[::-1][:k]
+    return len(values) - 1 - order
@@ -6,6 +6,10 @@ import time
 import types
 
 
+# Set to True after the first successful call of setup_logging.
+_is_configured = False
+
+
 def _log_newline(self, how_many_lines=1):
     """
     Add option to log blank new line at Streams.
@@ -59,6 +63,16 @@ def get_logger():
     return logging.getLogger("mlalgorithms")
 
 
+def is_logging_configured():
+    """
+    Check whether logging for the library has already been set up.
+
+    :return: bool
+        True if setup_logging was called before.
+    """
+    return _is_configured
+
+
 def setup_logging(config_filename="log_config.json"):
     """
     Setup logging for the library.
@@ -66,10 +80,13 @@ def setup_logging(config_filename="log_config.json"):
     :param config_filename: str
         File name of the logger config.
     """
+    global _is_configured
+
     with open(config_filename, "r") as logging_configuration_file:
         config = json.load(logging_configuration_file)
     logging.config.dictConfig(config)
     _configure_logger()
+    _is_configured = True
 
     # ATTENTION! Do not see at the warning on next code line, in
     # _configure_logger method we add newline method for Logger instance.
@@ -0,0 +1,224 @@
+import argparse
+import hashlib
+import json
+import os
+import os.path
+import pickle
+
+from . import checks
+
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache",
+                                 "mlalgorithms")
+
+# Size of the file head and tail which are hashed by fingerprint.
+FINGERPRINT_BLOCK_SIZE = 2 ** 20
+
+ENTRY_SUFFIX = ".mdl"
+
+
+def file_fingerprint(filepath_or_buffer):
+    """
+    Compute fast fingerprint of the input data: size, modification time and
+    hash of the head and the tail of the file. Data frames are hashed
+    entirely.
+
+    :param filepath_or_buffer: str, pathlib.Path, pd.DataFrame or any other
+        object accepted by Shell.fit.
+        Input data.
+
+    :return: str, None.
+        Fingerprint or None if data can not be fingerprinted, e.g. buffer.
+    """
+    data_hash = hashlib.sha1()
+    if hasattr(filepath_or_buffer, "columns"):
+        import pandas as pd
+
+        data_hash.update(repr(list(filepath_or_buffer.columns)).encode())
+        data_hash.update(pd.util.hash_pandas_object(
+            filepath_or_buffer, index=False).values.tobytes())
+        return data_hash.hexdigest()
+
+    if not isinstance(filepath_or_buffer, (str, os.PathLike)):
+        return None
+    filename = os.path.abspath(os.fspath(filepath_or_buffer))
+    if not os.path.isfile(filename):
+        return None
+
+    stat = os.stat(filename)
+    data_hash.update(f"{filename}:{stat.st_size}:{stat.st_mtime_ns}"
+                     .encode())
+    with open(filename, "rb") as input_stream:
+        data_hash.update(input_stream.read(FINGERPRINT_BLOCK_SIZE))
+        if stat.st_size > FINGERPRINT_BLOCK_SIZE:
+            input_stream.seek(-min(FINGERPRINT_BLOCK_SIZE,
+                                   stat.st_size - FINGERPRINT_BLOCK_SIZE), 2)
+            data_hash.update(input_stream.read())
+    return data_hash.hexdigest()
+
+
+class ModelCache:
+
+    def __init__(self, directory=None, max_size_mb=1024):
+        """
+        On-disk cache of trained models and parser states with LRU eviction.
+
+        :param directory: str, optional (default=None).
+            Cache directory. None means ~/.cache/mlalgorithms.
+
+        :param max_size_mb: int, float, optional (default=1024).
+            Maximal size of the cache in megabytes. Least recently used
+            entries are removed when the cache becomes larger.
+        """
+        self.directory = directory or DEFAULT_CACHE_DIR
+        checks.check_types(self.directory, str, var_name="directory")
+
+        self.max_size_mb = max_size_mb
+        checks.check_types(self.max_size_mb, int, float,
+                           var_name="max_size_mb")
+        checks.check_value(self.max_size_mb, 0, None, var_name="max_size_mb")
+
+    @staticmethod
+    def get_key(model_parameters, parser_parameters, fingerprint):
+        """
+        Compute key of the cache entry.
+
+        :param model_parameters: dict.
+            Class name, module name and parameters of the model.
+
+        :param parser_parameters: dict.
+            Class name, module name and parameters of the parser.
+
+        :param fingerprint: str.
+            Fingerprint of the train data.
+
+        :return: str.
+            Key of the entry.
+        """
+        content = json.dumps({
+            "model": model_parameters,
+            "parser": parser_parameters,
+            "data": fingerprint
+        }, sort_keys=True, default=repr)
+        return hashlib.sha1(content.encode()).hexdigest()
+
+    def _get_filename(self, key):
+        return os.path.join(self.directory, key + ENTRY_SUFFIX)
+
+    def entries(self):
+        """
+        Get cache entries from the least to the most recently used.
+
+        :return: list.
+            List of tuples with key, size in bytes and last usage time.
+        """
+        if not os.path.isdir(self.directory):
+            return []
+
+        result = []
+        for filename in os.listdir(self.directory):
+            if not filename.endswith(ENTRY_SUFFIX):
+                continue
+            stat = os.stat(os.path.join(self.directory, filename))
+            result.append((filename[:-len(ENTRY_SUFFIX)], stat.st_size,
+                           stat.st_mtime))
+        return sorted(result, key=lambda x: x[2])
+
+    def load(self, key):
+        """
+        Load cached model and parser state.
+
+        :param key: str.
+            Key of the entry.
+
+        :return: tuple, None.
+            Pair of model and parser or None if there is no such entry.
+        """
+        filename = self._get_filename(key)
+        try:
+            with open(filename, "rb") as input_stream:
+                model, parser = pickle.loads(input_stream.read())
+        except (OSError, EOFError, AttributeError, ImportError,
+                pickle.UnpicklingError):
+            # Missed or broken entry, or entry of changed classes.
+            return None
+
+        # Modification time is used as the last usage time for LRU.
+        os.utime(filename)
+        return model, parser
+
+    def save(self, key, model, parser):
+        """
+        Save trained model and parser state and evict old entries.
+
+        :param key: str.
+            Key of the entry.
+
+        :param model: IModel.
+            Trained model.
+
+        :param parser: IParser.
+            Parser with parsed train data.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        filename = self._get_filename(key)
+        with open(filename + ".tmp", "wb") as output_stream:
+            output_stream.write(pickle.dumps((model, parser)))
+        os.replace(filename + ".tmp", filename)
+        self._evict()
+
+    def _evict(self):
+        entries = self.entries()
+        total_size = sum(size for _, size, _ in entries)
+        max_size = self.max_size_mb * 2 ** 20
+        for key, size, _ in entries:
+            if total_size <= max_size:
+                break
+            self.invalidate(key)
+            total_size -= size
+
+    def invalidate(self, key=None):
+        """
+        Remove entry from the cache.
+
+        :param key: str, optional (default=None).
+            Key of the entry. None means all entries.
+        """
+        if key is None:
+            keys = [x for x, _, _ in self.entries()]
+        else:
+            keys = [key]
+
+        for x in keys:
+            try:
+                os.remove(self._get_filename(x))
+            except FileNotFoundError:
+                pass
+
+
+def main(argv=None):
+    argument_parser = argparse.ArgumentParser(
+        description="Manage cache of trained models."
+    )
+    argument_parser.add_argument("command", choices=("list", "invalidate"),
+                                 help="list entries or remove them")
+    argument_parser.add_argument("keys", nargs="*",
+                                 help="keys to invalidate, all entries "
+                                      "are removed if keys are missed")
+    argument_parser.add_argument("--cache-dir", default=None,
+                                 help="cache directory")
+    args = argument_parser.parse_args(argv)
+
+    cache = ModelCache(args.cache_dir)
+    if args.command == "list":
+        for key, size, _ in cache.entries():
+            print(f"{key} {size / 2 ** 20:.2f}MB")
+    elif args.keys:
+        for key in args.keys:
+            cache.invalidate(key)
+    else:
+        cache.invalidate()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,21 @@
-from sklearn.multioutput import MultiOutputRegressor
-
 from catboost import CatBoostRegressor
 
 from . import model
+from . import multi_output
 
 
 class CatBoostModel(model.SimpleModel):
 
-    def __init__(self, **kwargs):
-        super().__init__(MultiOutputRegressor(CatBoostRegressor(**kwargs)))
+    def __init__(self, n_output_jobs=1, output_memory_limit_mb=None,
+                 min_output_support=0, checkpoint_dir=None,
+                 label_compression=None, **kwargs):
+        super().__init__(multi_output.PerOutputRegressor(
+            CatBoostRegressor(**kwargs),
+            n_jobs=n_output_jobs,
+            memory_limit_mb=output_memory_limit_mb,
+            min_support=min_output_support,
+            checkpoint_dir=checkpoint_dir
+        ), label_compression)
 
     @staticmethod
     def get_weights_by_date(instances):
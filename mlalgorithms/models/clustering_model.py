@@ -20,39 +20,109 @@ class ClusteringModel(model.SimpleModel):
         self.clustering_table = pd.DataFrame()
         self.largest_cluster_goods = []
 
-    def fit(self, train_samples, train_labels, **kwargs):
-        checks.check_equality(len(train_samples), len(train_labels),
+    def _add_orders(self, train_samples, train_labels):
+        checks.check_equality(len(train_samples),
+                              model.get_labels_count(train_labels),
                               message="Samples and labels have different "
                                       "sizes")
 
         persons_ids = [person_data[0] for person_data in train_samples]
-        for persons_id, label in zip(persons_ids, train_labels):
-            if self.orders.get(persons_id) is None:
-                self.orders[persons_id] = np.array(label)
-            else:
-                self.orders[persons_id] += np.array(label)
-
-        self.clustering_table = pd.DataFrame(
-            self.model.fit_predict(pd.DataFrame.from_dict(self.orders,
-                                                          orient="index")),
-            columns=[self.COL_NAME]
-        )
+        return model.accumulate_labels(self.orders, persons_ids, train_labels)
 
+    def _update_largest_cluster_goods(self):
         cluster_id = self.clustering_table[self.COL_NAME]\
             .value_counts().index[0]
         larg_clust_center = self.model.cluster_centers_[cluster_id]
         self.largest_cluster_goods = (larg_clust_center >=
-                                      self.CLUSTER_BORDER).astype(np.int)
+                                      self.CLUSTER_BORDER).astype(int)
+
+    def _nearest_clusters(self, orders):
+        """
+        Find nearest cluster centers for orders without refitting clusters.
+        New goods which are absent in cluster centers have zero coordinates
+        in centers.
+
+        :param orders: np.ndarray.
+            Matrix with summed orders of persons.
+
+        :return: np.ndarray.
+            Identifiers of nearest clusters.
+        """
+        centers = self.model.cluster_centers_
+        width = max(orders.shape[1], centers.shape[1])
+        orders = np.pad(orders, ((0, 0), (0, width - orders.shape[1])),
+                        "constant")
+        centers = np.pad(centers, ((0, 0), (0, width - centers.shape[1])),
+                         "constant")
+
+        # Squared euclidean distances without the constant norm of orders.
+        distances = (-2 * orders.dot(centers.T) +
+                     (centers ** 2).sum(axis=1))
+        return distances.argmin(axis=1)
+
+    def fit(self, train_samples, train_labels, **kwargs):
+        self.orders = {}
+        self._add_orders(train_samples, train_labels)
+
+        orders_table = pd.DataFrame.from_dict(self.orders, orient="index")
+        self.clustering_table = pd.DataFrame(
+            self.model.fit_predict(orders_table),
+            index=orders_table.index,
+            columns=[self.COL_NAME]
+        )
+        self._update_largest_cluster_goods()
+
+    def partial_fit(self, train_samples, train_labels, **kwargs):
+        # Cluster centers are kept, only persons with new orders are assigned
+        # to the nearest clusters again.
+        updated_persons_ids = list(self._add_orders(train_samples,
+                                                    train_labels))
+        if not updated_persons_ids:
+            return
+
+        width = max(len(self.orders[x]) for x in updated_persons_ids)
+        orders = np.zeros((len(updated_persons_ids), width))
+        for i, persons_id in enumerate(updated_persons_ids):
+            person_orders = self.orders[persons_id]
+            orders[i, :len(person_orders)] = person_orders
+
+        self.clustering_table = pd.concat([
+            self.clustering_table.drop(updated_persons_ids, errors="ignore"),
+            pd.DataFrame(self._nearest_clusters(orders),
+                         index=updated_persons_ids,
+                         columns=[self.COL_NAME])
+        ])
+        self._update_largest_cluster_goods()
 
     def predict(self, samples, **kwargs):
-        predictions = []
-        for i in samples:
-            if i[0] in self.clustering_table.index:
-                cluster_id = self.clustering_table.at[i[0], self.COL_NAME]
-                clust_center = self.model.cluster_centers_[cluster_id]
-                prediction = (clust_center >=
-                              self.CLUSTER_BORDER).astype(np.int)
-            else:
-                prediction = np.array(self.largest_cluster_goods)
-            predictions.append(prediction)
-        return predictions
+        candidates = kwargs.get("candidates")
+        if candidates is None:
+            predictions = []
+            for i in samples:
+                if i[0] in self.clustering_table.index:
+                    cluster_id = self.clustering_table.at[i[0], self.COL_NAME]
+                    clust_center = self.model.cluster_centers_[cluster_id]
+                    prediction = (clust_center >=
+                                  self.CLUSTER_BORDER).astype(int)
+                else:
+                    prediction = np.array(self.largest_cluster_goods)
+                predictions.append(prediction)
+            return predictions
+
+        # Goods of every cluster are selected only among candidates once per
+        # call, checks of the same cluster share one prediction array.
+        centers = self.model.cluster_centers_
+        columns = model.get_candidate_columns(candidates, centers.shape[1])
+        clusters_goods = np.zeros(centers.shape, dtype=int)
+        clusters_goods[:, columns] = (centers[:, columns] >=
+                                      self.CLUSTER_BORDER)
+        largest_cluster_goods = model.restrict_to_candidates(
+            self.largest_cluster_goods, candidates
+        )
+
+        cluster_ids = self.clustering_table[self.COL_NAME].reindex(
+            [i[0] for i in samples]
+        )
+        return [largest_cluster_goods if np.isnan(cluster_id)
+                else clusters_goods[int(cluster_id)]
+                for cluster_id in cluster_ids]
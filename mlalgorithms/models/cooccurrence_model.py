@@ -0,0 +1,108 @@
+import numpy as np
+from scipy import sparse
+
+import mlalgorithms.checks as checks
+
+from . import model
+from .sparse_utils import to_csr_labels, persons_matrix, predict_top_goods
+
+
+# Co-occurrence matrix is converted to dense array for scoring if it has no
+# more elements than this limit (128 MB of float64 values), because product
+# of sparse history and dense matrix is much faster than sparse product with
+# almost dense result.
+DENSE_COOCCURRENCE_LIMIT = 2 ** 24
+
+
+class CooccurrenceModel(model.IModel):
+
+    def __init__(self, num_popular_ids=5, self_weight=1.0,
+                 batch_size=10000):
+        """
+        Item-to-item model: goods which are often bought together with goods
+        from the person history are recommended.
+
+        :param num_popular_ids: int, optional (default=5).
+            Number of goods to predict for every check.
+
+        :param self_weight: float, optional (default=1.0).
+            Weight of goods from own history of the person in addition to
+            co-occurrence scores.
+
+        :param batch_size: int, optional (default=10000).
+            Number of samples scored with one matrix product.
+        """
+        super().__init__()
+        self.num_popular_ids = num_popular_ids
+        checks.check_types(self.num_popular_ids, int,
+                           var_name="num_popular_ids")
+        checks.check_value(self.num_popular_ids, 0, None, True,
+                           var_name="num_popular_ids")
+
+        self.self_weight = self_weight
+        checks.check_types(self.self_weight, float, var_name="self_weight")
+
+        self.batch_size = batch_size
+        checks.check_types(self.batch_size, int, var_name="batch_size")
+        checks.check_value(self.batch_size, 0, None, True,
+                           var_name="batch_size")
+
+        self.persons_index = dict()
+        self.history = sparse.csr_matrix((0, 0))
+        self.cooccurrence = sparse.csr_matrix((0, 0))
+        self.popularity = np.zeros(0)
+
+    def fit(self, train_samples, train_labels, **kwargs):
+        baskets = to_csr_labels(train_labels)
+        checks.check_equality(len(train_samples), baskets.shape[0],
+                              message="Samples and labels have different "
+                                      "sizes")
+
+        baskets.data = np.ones_like(baskets.data, dtype=np.float64)
+
+        # Get person ids from train samples, samples format:
+        # [[person_id, month, day], [person_id, month, day], ...].
+        persons_ids = [person_data[0] for person_data in train_samples]
+        self.persons_index = {
+            x: i for i, x in enumerate(dict.fromkeys(persons_ids))
+        }
+
+        # Good x good matrix with number of checks where goods were bought
+        # together and person x good matrix with history of every person.
+        self.cooccurrence = baskets.T.dot(baskets).tocsr()
+        self.cooccurrence = (self.cooccurrence -
+                             sparse.diags(self.cooccurrence.diagonal()))
+        self.cooccurrence.eliminate_zeros()
+        checks_to_persons = persons_matrix(persons_ids, self.persons_index)
+        self.history = checks_to_persons.T.dot(baskets).tocsr()
+        self.popularity = np.asarray(baskets.sum(axis=0)).ravel()
+
+    def _score(self, rows, cooccurrence, columns):
+        history = self.history[rows]
+        scores = history.dot(cooccurrence)
+        if sparse.issparse(scores):
+            scores = scores.toarray()
+        if self.self_weight != 0.0:
+            scores += self.self_weight * history[:, columns].toarray()
+        return scores
+
+    def predict(self, samples, **kwargs):
+        # Popularity of goods scaled below one co-occurrence breaks ties and
+        # fills predictions of persons with short history.
+        popular_scores = (self.popularity /
+                          (1000.0 * max(self.popularity.max(initial=0), 1)))
+
+        # Only candidate goods are scored, e.g. goods from the day menu.
+        columns = model.get_candidate_columns(kwargs.get("candidates"),
+                                              len(self.popularity))
+        popular_scores = popular_scores[columns]
+        cooccurrence = self.cooccurrence[:, columns]
+        if np.prod(cooccurrence.shape) <= DENSE_COOCCURRENCE_LIMIT:
+            cooccurrence = cooccurrence.toarray()
+
+        return predict_top_goods(
+            samples, self.persons_index,
+            lambda rows: self._score(rows, cooccurrence, columns),
+            popular_scores, columns, len(self.popularity),
+            self.num_popular_ids, self.batch_size
+        )
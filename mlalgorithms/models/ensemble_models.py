@@ -2,26 +2,31 @@ from sklearn.ensemble import RandomForestRegressor
 from sklearn.ensemble import ExtraTreesRegressor
 from sklearn.ensemble import GradientBoostingRegressor
 
-from sklearn.multioutput import MultiOutputRegressor
-
 from . import model
+from . import multi_output
 
 
 class RandomForestModel(model.SimpleModel):
 
-    def __init__(self, **kwargs):
-        super().__init__(RandomForestRegressor(**kwargs))
+    def __init__(self, label_compression=None, **kwargs):
+        super().__init__(RandomForestRegressor(**kwargs), label_compression)
 
 
 class ExtraTreesModel(model.SimpleModel):
 
-    def __init__(self, **kwargs):
-        super().__init__(ExtraTreesRegressor(**kwargs))
+    def __init__(self, label_compression=None, **kwargs):
+        super().__init__(ExtraTreesRegressor(**kwargs), label_compression)
 
 
 class GradientBoostingModel(model.SimpleModel):
 
-    def __init__(self, **kwargs):
-        super().__init__(MultiOutputRegressor(
-            GradientBoostingRegressor(**kwargs))
-        )
+    def __init__(self, n_output_jobs=1, output_memory_limit_mb=None,
+                 min_output_support=0, checkpoint_dir=None,
+                 label_compression=None, **kwargs):
+        super().__init__(multi_output.PerOutputRegressor(
+            GradientBoostingRegressor(**kwargs),
+            n_jobs=n_output_jobs,
+            memory_limit_mb=output_memory_limit_mb,
+            min_support=min_output_support,
+            checkpoint_dir=checkpoint_dir
+        ), label_compression)
@@ -1,6 +1,7 @@
 import numpy as np
 
 import mlalgorithms.checks as checks
+import mlalgorithms.kernels as kernels
 
 from . import model
 
@@ -13,15 +14,23 @@ class MostPopular(model.IModel):
         self.most_popular_goods = dict()
 
     def fit(self, train_samples, train_labels, **kwargs):
-        checks.check_equality(len(train_samples), len(train_labels),
+        checks.check_equality(len(train_samples),
+                              model.get_labels_count(train_labels),
                               message="Samples and labels have different "
                                       "sizes")
         self.most_popular_goods = kwargs["most_popular_goods"]
 
+    def partial_fit(self, train_samples, train_labels, **kwargs):
+        self.fit(train_samples, train_labels, **kwargs)
+
     def predict(self, samples, **kwargs):
+        most_popular_goods = model.restrict_to_candidates(
+            self.most_popular_goods, kwargs.get("candidates")
+        )
+
         predictions = []
         for _ in samples:
-            prediction = np.array(self.most_popular_goods)
+            prediction = np.array(most_popular_goods)
             predictions.append(prediction)
         return predictions
 
@@ -35,7 +44,17 @@ class SameAsBefore(model.IModel):
         self.most_popular_goods = dict()
 
     def fit(self, train_samples, train_labels, **kwargs):
-        checks.check_equality(len(train_samples), len(train_labels),
+        checks.check_equality(len(train_samples),
+                              model.get_labels_count(train_labels),
+                              message="Samples and labels have different "
+                                      "sizes")
+
+        self.latest_orders = dict()
+        self.partial_fit(train_samples, train_labels, **kwargs)
+
+    def partial_fit(self, train_samples, train_labels, **kwargs):
+        checks.check_equality(len(train_samples),
+                              model.get_labels_count(train_labels),
                               message="Samples and labels have different "
                                       "sizes")
 
@@ -44,15 +63,29 @@ class SameAsBefore(model.IModel):
         # Get person ids from train samples, samples format:
         # [[person_id, month, day], [person_id, month, day], ...].
         persons_ids = [person_data[0] for person_data in train_samples]
-        self.latest_orders = dict(zip(persons_ids, train_labels))
+
+        # Only the latest label of every person is copied, so matrix of
+        # train labels is not kept alive by its rows.
+        latest_indices = dict(zip(persons_ids, range(len(persons_ids))))
+        self.latest_orders.update(
+            (x, model.to_dense_label(train_labels[i]))
+            for x, i in latest_indices.items()
+        )
 
     def predict(self, samples, **kwargs):
+        candidates = kwargs.get("candidates")
+        most_popular_goods = model.restrict_to_candidates(
+            self.most_popular_goods, candidates
+        )
+
         predictions = []
         for sample in samples:
             if self.latest_orders.get(sample[0]) is None:
-                prediction = np.array(self.most_popular_goods)
+                prediction = np.array(most_popular_goods)
             else:
-                prediction = np.array(self.latest_orders[sample[0]])
+                prediction = model.restrict_to_candidates(
+                    self.latest_orders[sample[0]], candidates
+                )
             predictions.append(prediction)
         return predictions
 
@@ -68,21 +101,32 @@ class MostPopularFromOwnOrders(model.IModel):
         checks.check_value(self.num_popular_ids, 0, 100, True, False,
                            var_name="num_popular_ids")
 
+        # Summed orders of every person and processed orders for prediction.
+        self.order_counts = dict()
         self.orders = dict()
         self.most_popular_goods = dict()
         self.most_popular_good_ids = list()
         self.max_good_id = 0
 
-    def process_orders(self):
+    def process_orders(self, persons_ids=None):
         """
         Find most popular goods, then set popular good identifiers equal to
         one but other good identifiers equal to zero.
+
+        :param persons_ids: iterable, optional (default=None).
+            Persons which orders need to be processed. None means all persons.
         """
-        for person_orders in self.orders.values():
+        if persons_ids is None:
+            persons_ids = self.order_counts.keys()
+
+        for persons_id in persons_ids:
+            person_orders = self.order_counts[persons_id].copy()
+            self.orders[persons_id] = person_orders
+
             non_zero_count = np.count_nonzero(person_orders)
 
             if non_zero_count < self.num_popular_ids:
-                non_zero_ind = person_orders.argsort()[::-1][:non_zero_count]
+                non_zero_ind = np.flatnonzero(person_orders)
                 sub_index = []
 
                 for index in self.most_popular_good_ids:
@@ -100,14 +144,14 @@ class MostPopularFromOwnOrders(model.IModel):
                     )
                 person_orders[sub_index] = 1
             else:
-                indices = person_orders.argsort()[::-1][:self.num_popular_ids]
-                not_in_indices = [x for x in range(len(person_orders))
-                                  if x not in indices]
-                person_orders[not_in_indices] = 0
+                indices = kernels.top_k_indices(person_orders,
+                                                self.num_popular_ids)
+                person_orders[:] = 0
                 person_orders[indices] = 1
 
-    def fit(self, train_samples, train_labels, **kwargs):
-        checks.check_equality(len(train_samples), len(train_labels),
+    def _add_orders(self, train_samples, train_labels, **kwargs):
+        checks.check_equality(len(train_samples),
+                              model.get_labels_count(train_labels),
                               message="Samples and labels have different "
                                       "sizes")
 
@@ -123,20 +167,80 @@ class MostPopularFromOwnOrders(model.IModel):
         # Get person ids from train samples, samples format:
         # [[person_id, month, day], [person_id, month, day], ...].
         persons_ids = [person_data[0] for person_data in train_samples]
-        for persons_id, label in zip(persons_ids, train_labels):
-            if self.orders.get(persons_id) is None:
-                self.orders[persons_id] = np.array(label)
-            else:
-                self.orders[persons_id] += np.array(label)
+        return model.accumulate_labels(self.order_counts, persons_ids,
+                                       train_labels)
 
+    def fit(self, train_samples, train_labels, **kwargs):
+        self.order_counts = dict()
+        self.orders = dict()
+        self._add_orders(train_samples, train_labels, **kwargs)
         self.process_orders()
 
+    def partial_fit(self, train_samples, train_labels, **kwargs):
+        # Only persons with new orders are processed again.
+        updated_persons_ids = self._add_orders(train_samples, train_labels,
+                                               **kwargs)
+        self.process_orders(updated_persons_ids)
+
+    def _process_orders_on_candidates(self, persons_id, candidates,
+                                      popular_candidates):
+        """
+        Find most popular goods of the person among candidate goods and fill
+        the rest of prediction like process_orders: with most popular goods,
+        then with random goods, but only from candidate goods.
+        """
+        width = len(self.most_popular_goods)
+        person_orders = self.order_counts.get(persons_id)
+        if person_orders is not None:
+            width = max(width, len(person_orders))
+        prediction = np.zeros(width, dtype=int)
+
+        if person_orders is not None:
+            columns = model.get_candidate_columns(candidates,
+                                                  len(person_orders))
+            order = np.argsort(-person_orders[columns], kind="mergesort")
+            indices = columns[order[:self.num_popular_ids]]
+            prediction[indices[person_orders[indices] > 0]] = 1
+
+        for index in popular_candidates:
+            if np.count_nonzero(prediction) >= self.num_popular_ids:
+                break
+            prediction[index] = 1
+
+        missing_count = self.num_popular_ids - np.count_nonzero(prediction)
+        if missing_count > 0:
+            free_candidates = candidates[candidates < width]
+            free_candidates = free_candidates[
+                prediction[free_candidates] == 0
+            ]
+            prediction[np.random.choice(
+                free_candidates, min(missing_count, len(free_candidates)),
+                replace=False
+            )] = 1
+        return prediction
+
     def predict(self, samples, **kwargs):
-        predictions = []
+        candidates = kwargs.get("candidates")
+        if candidates is None:
+            predictions = []
+            for sample in samples:
+                if self.orders.get(sample[0]) is None:
+                    prediction = np.array(self.most_popular_goods)
+                else:
+                    prediction = self.orders[sample[0]]
+                predictions.append(prediction)
+            return predictions
+
+        candidates_set = set(candidates.tolist())
+        popular_candidates = [x for x in self.most_popular_good_ids
+                              if x in candidates_set]
+
+        # Checks of the same person share one prediction array.
+        persons_predictions = dict()
         for sample in samples:
-            if self.orders.get(sample[0]) is None:
-                prediction = np.array(self.most_popular_goods)
-            else:
-                prediction = self.orders[sample[0]]
-            predictions.append(prediction)
-        return predictions
+            if sample[0] not in persons_predictions:
+                persons_predictions[sample[0]] = \
+                    self._process_orders_on_candidates(
+                        sample[0], candidates, popular_candidates
+                    )
+        return [persons_predictions[sample[0]] for sample in samples]
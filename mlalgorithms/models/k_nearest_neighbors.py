@@ -5,5 +5,5 @@ from . import model
 
 class KNearestNeighborsModel(model.SimpleModel):
 
-    def __init__(self, **kwargs):
-        super().__init__(KNeighborsRegressor(**kwargs))
+    def __init__(self, label_compression=None, **kwargs):
+        super().__init__(KNeighborsRegressor(**kwargs), label_compression)
@@ -0,0 +1,213 @@
+import abc
+
+import numpy as np
+from scipy import sparse
+
+import mlalgorithms.checks as checks
+
+
+class ILabelTransformer(abc.ABC):
+
+    @abc.abstractmethod
+    def fit(self, labels):
+        """
+        Learn transformation from train labels.
+
+        :param labels: array-like, sparse matrix.
+            Matrix of interim labels with shape (n_samples, max_good_id + 1).
+        """
+        raise NotImplementedError("Called abstract class method!")
+
+    @abc.abstractmethod
+    def transform(self, labels):
+        """
+        Compress labels for model training.
+
+        :param labels: array-like, sparse matrix.
+            Matrix of interim labels with shape (n_samples, max_good_id + 1).
+
+        :return: np.ndarray.
+            Compressed labels with shape (n_samples, n_components).
+        """
+        raise NotImplementedError("Called abstract class method!")
+
+    @abc.abstractmethod
+    def inverse_transform(self, compressed_labels):
+        """
+        Reconstruct full width labels from model predictions.
+
+        :param compressed_labels: array-like.
+            Compressed labels with shape (n_samples, n_components).
+
+        :return: np.ndarray.
+            Reconstructed labels with shape (n_samples, max_good_id + 1).
+        """
+        raise NotImplementedError("Called abstract class method!")
+
+    def fit_transform(self, labels):
+        """
+        Learn transformation and compress train labels.
+
+        :param labels: array-like, sparse matrix.
+            Matrix of interim labels with shape (n_samples, max_good_id + 1).
+
+        :return: np.ndarray.
+            Compressed labels with shape (n_samples, n_components).
+        """
+        self.fit(labels)
+        return self.transform(labels)
+
+
+class UnusedLabelsDropper(ILabelTransformer):
+
+    def __init__(self):
+        self.n_labels = 0
+        self.used_labels = np.array([], dtype=np.int64)
+
+    @staticmethod
+    def _to_matrix(labels):
+        if sparse.issparse(labels):
+            return labels.tocsr()
+        return np.asarray(labels)
+
+    @staticmethod
+    def _to_dense(labels):
+        if sparse.issparse(labels):
+            return labels.toarray()
+        return labels
+
+    def fit(self, labels):
+        labels = self._to_matrix(labels)
+        self.n_labels = labels.shape[1]
+
+        # Goods which were never purchased have only zeros in their columns.
+        column_sums = np.asarray(abs(labels).sum(axis=0)).ravel()
+        self.used_labels = np.flatnonzero(column_sums)
+
+    def transform(self, labels):
+        labels = self._to_matrix(labels)
+        return self._to_dense(labels[:, self.used_labels]).astype(np.float64)
+
+    def inverse_transform(self, compressed_labels):
+        compressed_labels = np.asarray(compressed_labels)
+        compressed_labels = compressed_labels.reshape(
+            compressed_labels.shape[0], -1
+        )
+
+        result = np.zeros((compressed_labels.shape[0], self.n_labels))
+        result[:, self.used_labels] = compressed_labels
+        return result
+
+
+class LowRankLabelCompressor(UnusedLabelsDropper):
+
+    def __init__(self, n_components=32, random_state=None):
+        super().__init__()
+        self.n_components = n_components
+        checks.check_types(self.n_components, int, var_name="n_components")
+        checks.check_value(self.n_components, 0, None, True,
+                           var_name="n_components")
+
+        self.random_state = random_state
+        self.components = np.zeros((0, 0))
+
+    def fit(self, labels):
+        from sklearn.utils.extmath import randomized_svd
+
+        super().fit(labels)
+        used_labels = super().transform(labels)
+
+        # Do not compress if used goods already fit into n_components.
+        if used_labels.shape[1] <= self.n_components:
+            self.components = np.eye(used_labels.shape[1])
+            return
+
+        _, _, self.components = randomized_svd(
+            used_labels, self.n_components, random_state=self.random_state
+        )
+
+    def transform(self, labels):
+        return super().transform(labels).dot(self.components.T)
+
+    def inverse_transform(self, compressed_labels):
+        compressed_labels = np.asarray(compressed_labels).reshape(
+            len(compressed_labels), -1
+        )
+        return super().inverse_transform(
+            compressed_labels.dot(self.components)
+        )
+
+
+class HashingLabelCompressor(UnusedLabelsDropper):
+
+    def __init__(self, n_components=32, random_state=None):
+        super().__init__()
+        self.n_components = n_components
+        checks.check_types(self.n_components, int, var_name="n_components")
+        checks.check_value(self.n_components, 0, None, True,
+                           var_name="n_components")
+
+        self.random_state = random_state
+        self.hashing_matrix = sparse.csr_matrix((0, 0))
+
+    def fit(self, labels):
+        super().fit(labels)
+
+        # Signed hashing of goods into buckets: every good is projected into
+        # one bucket with random sign, reconstruction is the transposed
+        # projection.
+        n_used_labels = len(self.used_labels)
+        random_state = np.random.RandomState(self.random_state)
+        buckets = random_state.randint(self.n_components, size=n_used_labels)
+        signs = random_state.choice([-1.0, 1.0], size=n_used_labels)
+
+        self.hashing_matrix = sparse.csr_matrix(
+            (signs, (np.arange(n_used_labels), buckets)),
+            shape=(n_used_labels, self.n_components)
+        )
+
+    def transform(self, labels):
+        compressed_labels = self.hashing_matrix.T.dot(
+            super().transform(labels).T
+        )
+        return np.asarray(compressed_labels).T
+
+    def inverse_transform(self, compressed_labels):
+        compressed_labels = np.asarray(compressed_labels).reshape(
+            len(compressed_labels), -1
+        )
+        return super().inverse_transform(
+            np.asarray(self.hashing_matrix.dot(compressed_labels.T)).T
+        )
+
+
+LABEL_TRANSFORMERS = {
+    "drop_unused": UnusedLabelsDropper,
+    "low_rank": LowRankLabelCompressor,
+    "hashing": HashingLabelCompressor
+}
+
+
+def get_label_transformer(label_compression=None):
+    """
+    Create label transformer from model parameters in config.
+
+    :param label_compression: dict, optional (default=None).
+        Dict with "method" key ("drop_unused", "low_rank" or "hashing") and
+        constructor parameters of the transformer, for example
+        {"method": "low_rank", "n_components": 32, "random_state": 1}.
+
+    :return: ILabelTransformer, None.
+        Label transformer or None if compression is switched off.
+    """
+    if label_compression is None:
+        return None
+
+    checks.check_types(label_compression, dict, var_name="label_compression")
+
+    params = dict(label_compression)
+    method = params.pop("method", None)
+    if method not in LABEL_TRANSFORMERS:
+        raise ValueError(f"label_compression method must be one of "
+                         f"{list(LABEL_TRANSFORMERS)}: got {method}.")
+    return LABEL_TRANSFORMERS[method](**params)
@@ -6,11 +6,11 @@ from . import model
 
 class LinearModel(model.SimpleModel):
 
-    def __init__(self, **kwargs):
-        super().__init__(LinearRegression(**kwargs))
+    def __init__(self, label_compression=None, **kwargs):
+        super().__init__(LinearRegression(**kwargs), label_compression)
 
 
 class RidgeModel(model.SimpleModel):
 
-    def __init__(self, **kwargs):
-        super().__init__(Ridge(**kwargs))
+    def __init__(self, label_compression=None, **kwargs):
+        super().__init__(Ridge(**kwargs), label_compression)
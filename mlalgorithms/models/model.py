@@ -1,9 +1,133 @@
 import abc
 
 import numpy as np
+from scipy import sparse
 
 import mlalgorithms.checks as checks
 
+from . import label_transformers
+
+
+def get_labels_count(labels):
+    """
+    Get number of labels in any label storage returned by parser.
+
+    :param labels: list, np.ndarray, sparse matrix.
+        Interim labels.
+
+    :return: int.
+        Number of labels.
+    """
+    if sparse.issparse(labels):
+        return labels.shape[0]
+    return len(labels)
+
+
+def to_dense_label(label):
+    """
+    Convert one interim label to np.ndarray.
+
+    :param label: list, np.ndarray, sparse matrix.
+        Interim label, e.g. row of labels matrix.
+
+    :return: np.ndarray.
+        One-dimensional array.
+    """
+    if sparse.issparse(label):
+        return label.toarray().ravel()
+    return np.array(label)
+
+
+def accumulate_labels(storage, keys, labels):
+    """
+    Sum labels with the same keys into storage. Stored arrays are extended
+    with zeros if labels become wider, e.g. new goods appear in the data.
+
+    :param storage: dict.
+        Dict with keys and summed labels to update.
+
+    :param keys: list.
+        Keys of labels, e.g. person ids.
+
+    :param labels: list, np.ndarray, sparse matrix.
+        Labels to add.
+
+    :return: set.
+        Keys which were updated.
+    """
+    if sparse.issparse(labels):
+        # Labels of the same key are summed by one sparse product, so only
+        # one dense row per key is created.
+        unique_keys = list(dict.fromkeys(keys))
+        keys_index = {x: i for i, x in enumerate(unique_keys)}
+        indicator = sparse.csr_matrix(
+            (np.ones(len(keys), dtype=np.int64),
+             ([keys_index[x] for x in keys], np.arange(len(keys)))),
+            shape=(len(unique_keys), len(keys))
+        )
+        keys, labels = unique_keys, indicator.dot(labels).toarray()
+
+    updated_keys = set()
+    for key, label in zip(keys, labels):
+        # Labels can be stored in small integer type, but sums can not.
+        label = np.array(label, dtype=np.int64)
+        stored_label = storage.get(key)
+        if stored_label is None:
+            storage[key] = label
+        else:
+            if len(stored_label) < len(label):
+                stored_label = np.concatenate([
+                    stored_label,
+                    np.zeros(len(label) - len(stored_label),
+                             dtype=stored_label.dtype)
+                ])
+            stored_label[:len(label)] += label
+            storage[key] = stored_label
+        updated_keys.add(key)
+    return updated_keys
+
+
+def get_candidate_columns(candidates, width):
+    """
+    Get columns of interim labels which can be predicted.
+
+    :param candidates: np.ndarray, None.
+        Sorted unique good ids allowed for prediction, e.g. menu of the day.
+        None means all goods.
+
+    :param width: int.
+        Width of interim labels.
+
+    :return: np.ndarray.
+        Sorted candidate columns which fit into interim labels.
+    """
+    if candidates is None:
+        return np.arange(width)
+    return candidates[:np.searchsorted(candidates, width)]
+
+
+def restrict_to_candidates(label, candidates):
+    """
+    Set values of goods which are not candidates to zero.
+
+    :param label: array-like.
+        Interim label or matrix of interim labels.
+
+    :param candidates: np.ndarray, None.
+        Sorted unique good ids allowed for prediction. None means all goods.
+
+    :return: np.ndarray.
+        Restricted copy of label.
+    """
+    label = np.array(label)
+    if candidates is None:
+        return label
+
+    result = np.zeros_like(label)
+    columns = get_candidate_columns(candidates, label.shape[-1])
+    result[..., columns] = label[..., columns]
+    return result
+
 
 class IModel(abc.ABC):
 
@@ -23,6 +147,23 @@ class IModel(abc.ABC):
         """
         raise NotImplementedError("Called abstract class method!")
 
+    def partial_fit(self, train_samples, train_labels, **kwargs):
+        """
+        Update trained model with new data without training from scratch.
+        Models which support incremental training override this method.
+
+        :param train_samples: array-like, sparse matrix.
+            New training data.
+
+        :param train_labels: array-like, sparse matrix.
+            New target values.
+
+        :param kwargs: dict, optional(default={}).
+            Additional keyword arguments.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support "
+                                  f"incremental training!")
+
     @abc.abstractmethod
     def predict(self, samples, **kwargs):
         """
@@ -33,7 +174,9 @@ class IModel(abc.ABC):
             Data for prediction.
 
         :param kwargs: dict, optional(default={}).
-            Additional keyword arguments.
+            Additional keyword arguments. Shell passes "candidates" with
+            sorted np.ndarray of good ids from the day menu, models can
+            score only these goods.
 
         :return: array.
             Returns predicted values.
@@ -43,17 +186,25 @@ class IModel(abc.ABC):
 
 class SimpleModel(IModel):
 
-    def __init__(self, model=None):
+    def __init__(self, model=None, label_compression=None):
         """
         Constructor of abstract model class which initialize model for working.
 
         :param model: object.
             Instance of model class.
+
+        :param label_compression: dict, optional (default=None).
+            Parameters of label transformer which compresses train labels
+            before fit and reconstructs full labels after predict. See
+            label_transformers.get_label_transformer for the format.
         """
         if type(self) is IModel:
             raise Exception("IModel is an abstract class and cannot be "
                             "instantiated directly")
         self.model = model
+        self.label_transformer = label_transformers.get_label_transformer(
+            label_compression
+        )
 
     def fit(self, train_samples, train_labels, **kwargs):
         """
@@ -68,10 +219,17 @@ class SimpleModel(IModel):
         :param kwargs: dict, optional(default={}).
             Additional keyword arguments.
         """
-        checks.check_equality(len(train_samples), len(train_labels),
+        checks.check_equality(len(train_samples),
+                              get_labels_count(train_labels),
                               message="Samples and labels have different "
                                       "sizes")
 
+        if self.label_transformer is not None:
+            train_labels = self.label_transformer.fit_transform(train_labels)
+        elif sparse.issparse(train_labels):
+            # Most of estimators do not support sparse targets.
+            train_labels = train_labels.toarray()
+
         self.model.fit(train_samples, train_labels, **kwargs)
 
     def predict(self, samples, **kwargs):
@@ -88,8 +246,32 @@ class SimpleModel(IModel):
         :return: array.
             Returns predicted values.
         """
-        predictions = []
-        for sample in samples:
-            prediction = self.model.predict(np.array(sample).reshape(1, -1))[0]
-            predictions.append(prediction)
+        if len(samples) == 0:
+            return []
+
+        # Predict all samples with one call instead of one call per sample.
+        samples = np.array(samples).reshape(len(samples), -1)
+        candidates = kwargs.get("candidates")
+        if (candidates is not None and self.label_transformer is None and
+                hasattr(self.model, "coef_")):
+            return list(self._predict_linear_candidates(samples, candidates))
+
+        predictions = self.model.predict(samples)
+
+        if self.label_transformer is not None:
+            predictions = self.label_transformer.inverse_transform(predictions)
+        return list(restrict_to_candidates(predictions, candidates))
+
+    def _predict_linear_candidates(self, samples, candidates):
+        """
+        Compute outputs of linear model only for candidate goods, other
+        outputs are equal to zero.
+        """
+        coef = np.atleast_2d(self.model.coef_)
+        intercept = np.broadcast_to(self.model.intercept_, coef.shape[:1])
+        columns = get_candidate_columns(candidates, coef.shape[0])
+
+        predictions = np.zeros((len(samples), coef.shape[0]))
+        predictions[:, columns] = (samples.dot(coef[columns].T) +
+                                   intercept[columns])
         return predictions
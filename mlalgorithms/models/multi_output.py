@@ -0,0 +1,231 @@
+import hashlib
+import json
+import multiprocessing
+import os
+import os.path
+import pickle
+
+import numpy as np
+
+import mlalgorithms.checks as checks
+
+
+# Fitted estimator of one output keeps some copies of the training samples
+# (sorted features, gradients and etc.), so worker memory is estimated as
+# size of the samples and one target column multiplied by this factor.
+WORKER_MEMORY_FACTOR = 4
+
+# Estimator and samples of the current worker process, they are sent to every
+# worker only once by pool initializer.
+_worker_estimator = None
+_worker_samples = None
+
+
+def _init_worker(estimator, samples):
+    global _worker_estimator, _worker_samples
+
+    _worker_estimator = estimator
+    _worker_samples = samples
+
+
+def _fit_output(task):
+    from sklearn.base import clone
+
+    output_index, target, sample_weight = task
+    estimator = clone(_worker_estimator)
+    if sample_weight is None:
+        estimator.fit(_worker_samples, target)
+    else:
+        estimator.fit(_worker_samples, target, sample_weight=sample_weight)
+    return output_index, estimator
+
+
+class PerOutputRegressor:
+
+    def __init__(self, estimator, n_jobs=1, memory_limit_mb=None,
+                 min_support=0, checkpoint_dir=None):
+        """
+        Multi-output regressor which trains one estimator per output in the
+        pool of worker processes. Outputs with small support are not trained
+        and are answered with a constant.
+
+        :param estimator: object.
+            Regressor with fit and predict methods, cloned for every output.
+
+        :param n_jobs: int, optional (default=1).
+            Number of worker processes, -1 means number of CPUs.
+
+        :param memory_limit_mb: int, float, optional (default=None).
+            Memory limit for all workers in megabytes. Number of workers is
+            reduced to fit into the limit. None means no limit.
+
+        :param min_support: int, optional (default=0).
+            Minimal number of samples with non-zero target for training
+            estimator of the output.
+
+        :param checkpoint_dir: str, optional (default=None).
+            Directory to save every fitted output, so interrupted fit can be
+            resumed. None means no checkpoints.
+        """
+        self.estimator = estimator
+
+        self.n_jobs = n_jobs
+        checks.check_types(self.n_jobs, int, var_name="n_jobs")
+        if self.n_jobs != -1:
+            checks.check_value(self.n_jobs, 1, None, var_name="n_jobs")
+
+        self.memory_limit_mb = memory_limit_mb
+        checks.check_types(self.memory_limit_mb, type(None), int, float,
+                           var_name="memory_limit_mb")
+        if self.memory_limit_mb is not None:
+            checks.check_value(self.memory_limit_mb, 0, None, True,
+                               var_name="memory_limit_mb")
+
+        self.min_support = min_support
+        checks.check_types(self.min_support, int, var_name="min_support")
+        checks.check_value(self.min_support, 0, None, var_name="min_support")
+
+        self.checkpoint_dir = checkpoint_dir
+        checks.check_types(self.checkpoint_dir, type(None), str,
+                           var_name="checkpoint_dir")
+
+        self.estimators_ = []
+        self.constants_ = np.zeros(0)
+
+    def _get_n_workers(self, samples, targets, n_tasks):
+        n_workers = self.n_jobs
+        if n_workers == -1:
+            n_workers = os.cpu_count() or 1
+
+        if self.memory_limit_mb is not None:
+            worker_memory = samples.nbytes + targets[:, 0].nbytes
+            worker_memory_mb = worker_memory * WORKER_MEMORY_FACTOR / 2 ** 20
+            n_workers = min(n_workers,
+                            int(self.memory_limit_mb // worker_memory_mb))
+
+        return max(1, min(n_workers, n_tasks))
+
+    def _get_checkpoint_meta(self, samples, targets):
+        data_hash = hashlib.sha1()
+        data_hash.update(np.ascontiguousarray(samples).tobytes())
+        data_hash.update(np.ascontiguousarray(targets).tobytes())
+        return {
+            "estimator": json.dumps(self.estimator.get_params(),
+                                    sort_keys=True, default=repr),
+            "min_support": self.min_support,
+            "shape": list(targets.shape),
+            "data_hash": data_hash.hexdigest()
+        }
+
+    def _get_checkpoint_filename(self, output_index):
+        return os.path.join(self.checkpoint_dir, f"output_{output_index}.pkl")
+
+    def _load_checkpoints(self, samples, targets):
+        """
+        Load fitted outputs of previous interrupted fit with the same
+        estimator and data. Stale checkpoints are removed.
+
+        :return: dict.
+            Dict with output indices and fitted estimators.
+        """
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        meta_filename = os.path.join(self.checkpoint_dir, "meta.json")
+        meta = self._get_checkpoint_meta(samples, targets)
+
+        saved_meta = None
+        if os.path.exists(meta_filename):
+            with open(meta_filename, "r") as input_stream:
+                saved_meta = json.load(input_stream)
+
+        fitted_outputs = dict()
+        for output_index in range(targets.shape[1]):
+            filename = self._get_checkpoint_filename(output_index)
+            if not os.path.exists(filename):
+                continue
+            if saved_meta != meta:
+                os.remove(filename)
+                continue
+            with open(filename, "rb") as input_stream:
+                fitted_outputs[output_index] = pickle.loads(
+                    input_stream.read()
+                )
+
+        with open(meta_filename, "w") as output_stream:
+            json.dump(meta, output_stream)
+        return fitted_outputs
+
+    def _save_checkpoint(self, output_index, estimator):
+        # Write to temporary file first, so interrupted write does not leave
+        # broken checkpoint.
+        filename = self._get_checkpoint_filename(output_index)
+        with open(filename + ".tmp", "wb") as output_stream:
+            output_stream.write(pickle.dumps(estimator))
+        os.replace(filename + ".tmp", filename)
+
+    def fit(self, samples, targets, sample_weight=None):
+        """
+        Train estimators for all outputs with enough support.
+
+        :param samples: array-like.
+            Training data.
+
+        :param targets: array-like.
+            Target values with shape (n_samples, n_outputs).
+
+        :param sample_weight: array-like, optional (default=None).
+            Sample weights passed into every estimator.
+        """
+        samples = np.asarray(samples)
+        targets = np.asarray(targets)
+        targets = targets.reshape(targets.shape[0], -1)
+        n_outputs = targets.shape[1]
+
+        self.estimators_ = [None] * n_outputs
+        self.constants_ = targets.mean(axis=0)
+
+        support = np.count_nonzero(targets, axis=0)
+        outputs_to_fit = np.flatnonzero(support >= self.min_support).tolist()
+
+        if self.checkpoint_dir is not None:
+            for output_index, estimator in self._load_checkpoints(
+                    samples, targets).items():
+                self.estimators_[output_index] = estimator
+            outputs_to_fit = [i for i in outputs_to_fit
+                              if self.estimators_[i] is None]
+
+        tasks = ((i, targets[:, i], sample_weight) for i in outputs_to_fit)
+        n_workers = self._get_n_workers(samples, targets, len(outputs_to_fit))
+        if n_workers == 1:
+            _init_worker(self.estimator, samples)
+            try:
+                self._collect_results(map(_fit_output, tasks))
+            finally:
+                _init_worker(None, None)
+        else:
+            with multiprocessing.Pool(n_workers, _init_worker,
+                                      (self.estimator, samples)) as pool:
+                self._collect_results(pool.imap_unordered(_fit_output, tasks))
+
+    def _collect_results(self, results):
+        for output_index, estimator in results:
+            self.estimators_[output_index] = estimator
+            if self.checkpoint_dir is not None:
+                self._save_checkpoint(output_index, estimator)
+
+    def predict(self, samples):
+        """
+        Make predictions for all outputs. Outputs without estimator are
+        answered with mean of their train targets.
+
+        :param samples: array-like.
+            Data for prediction.
+
+        :return: np.ndarray.
+            Predictions with shape (n_samples, n_outputs).
+        """
+        samples = np.asarray(samples)
+        predictions = np.tile(self.constants_, (len(samples), 1))
+        for output_index, estimator in enumerate(self.estimators_):
+            if estimator is not None:
+                predictions[:, output_index] = estimator.predict(samples)
+        return predictions
@@ -0,0 +1,325 @@
+import numpy as np
+from scipy import sparse
+
+import mlalgorithms.checks as checks
+
+from . import model
+from .sparse_utils import to_csr_labels, persons_matrix, predict_top_goods
+
+
+SIMILARITIES = ("cosine", "jaccard")
+INDEX_TYPES = ("exact", "minhash")
+
+# Mersenne prime for universal hash functions of MinHash signatures.
+MINHASH_PRIME = 2 ** 31 - 1
+
+
+def _top_neighbors(rows, columns, similarities, n_rows, n_neighbors):
+    """
+    Select n_neighbors most similar columns for every row from sparse
+    similarity triples.
+
+    :return: tuple.
+        Matrices of neighbor rows (-1 for missing neighbors) and their
+        similarities with shape (n_rows, n_neighbors).
+    """
+    neighbors = np.full((n_rows, n_neighbors), -1, dtype=np.int64)
+    weights = np.zeros((n_rows, n_neighbors))
+
+    # Sort triples by row and descending similarity, then rank of the triple
+    # in its row is the column of the neighbor table.
+    order = np.lexsort((columns, -similarities, rows))
+    rows = rows[order]
+    row_starts = np.searchsorted(rows, np.arange(n_rows))
+    ranks = np.arange(len(rows)) - row_starts[rows]
+
+    selected = ranks < n_neighbors
+    neighbors[rows[selected], ranks[selected]] = columns[order][selected]
+    weights[rows[selected], ranks[selected]] = similarities[order][selected]
+    return neighbors, weights
+
+
+class PersonNeighborsModel(model.IModel):
+
+    def __init__(self, num_popular_ids=5, n_neighbors=20,
+                 similarity="cosine", index="exact", n_hashes=64,
+                 n_bands=16, max_bucket_size=50, self_weight=1.0,
+                 batch_size=1000, random_state=None):
+        """
+        User-to-user model: persons are indexed by their basket frequency
+        vectors and goods which were bought by the most similar persons are
+        recommended.
+
+        :param num_popular_ids: int, optional (default=5).
+            Number of goods to predict for every check.
+
+        :param n_neighbors: int, optional (default=20).
+            Number of neighbors which are kept for every person.
+
+        :param similarity: str, optional (default="cosine").
+            Similarity of persons: "cosine" of frequency vectors or "jaccard"
+            of sets of purchased goods.
+
+        :param index: str, optional (default="exact").
+            Neighbor index: "exact" computes similarities of all pairs of
+            persons with common goods, "minhash" compares only persons which
+            share a bucket of MinHash LSH.
+
+        :param n_hashes: int, optional (default=64).
+            Length of MinHash signatures, it is used only by "minhash" index.
+
+        :param n_bands: int, optional (default=16).
+            Number of LSH bands, n_hashes must be divisible by it.
+
+        :param max_bucket_size: int, optional (default=50).
+            Maximal number of persons compared inside one LSH bucket, persons
+            out of the limit are compared with their nearest bucket members
+            only.
+
+        :param self_weight: float, optional (default=1.0).
+            Weight of own history of the person in addition to neighbors.
+
+        :param batch_size: int, optional (default=1000).
+            Number of persons processed with one matrix product.
+
+        :param random_state: int, optional (default=None).
+            Seed of MinHash functions.
+        """
+        super().__init__()
+        self.num_popular_ids = num_popular_ids
+        checks.check_types(self.num_popular_ids, int,
+                           var_name="num_popular_ids")
+        checks.check_value(self.num_popular_ids, 0, None, True,
+                           var_name="num_popular_ids")
+
+        self.n_neighbors = n_neighbors
+        checks.check_types(self.n_neighbors, int, var_name="n_neighbors")
+        checks.check_value(self.n_neighbors, 0, None, True,
+                           var_name="n_neighbors")
+
+        self.similarity = similarity
+        if self.similarity not in SIMILARITIES:
+            raise ValueError(f"similarity parameter must be one of "
+                             f"{SIMILARITIES}: got {self.similarity}.")
+
+        self.index = index
+        if self.index not in INDEX_TYPES:
+            raise ValueError(f"index parameter must be one of "
+                             f"{INDEX_TYPES}: got {self.index}.")
+
+        self.n_hashes = n_hashes
+        checks.check_types(self.n_hashes, int, var_name="n_hashes")
+        checks.check_value(self.n_hashes, 0, None, True,
+                           var_name="n_hashes")
+        self.n_bands = n_bands
+        checks.check_types(self.n_bands, int, var_name="n_bands")
+        checks.check_value(self.n_bands, 1, self.n_hashes,
+                           var_name="n_bands")
+        checks.check_equality(self.n_hashes % self.n_bands, 0,
+                              message="n_hashes must be divisible by "
+                                      "n_bands")
+
+        self.max_bucket_size = max_bucket_size
+        checks.check_types(self.max_bucket_size, int,
+                           var_name="max_bucket_size")
+        checks.check_value(self.max_bucket_size, 2, None,
+                           var_name="max_bucket_size")
+
+        self.self_weight = self_weight
+        checks.check_types(self.self_weight, float, var_name="self_weight")
+
+        self.batch_size = batch_size
+        checks.check_types(self.batch_size, int, var_name="batch_size")
+        checks.check_value(self.batch_size, 0, None, True,
+                           var_name="batch_size")
+
+        self.random_state = random_state
+
+        self.persons_index = dict()
+        self.history = sparse.csr_matrix((0, 0))
+        self.neighbors = np.zeros((0, self.n_neighbors), dtype=np.int64)
+        self.weights = np.zeros((0, self.n_neighbors))
+        self.popularity = np.zeros(0)
+
+    def _get_vectors(self, frequencies):
+        """
+        Get person vectors whose dot products are similarities (cosine) or
+        intersection sizes (jaccard).
+        """
+        vectors = frequencies.copy()
+        if self.similarity == "jaccard":
+            vectors.data = np.ones_like(vectors.data)
+            return vectors
+
+        norms = np.sqrt(np.asarray(vectors.multiply(vectors).sum(axis=1)))
+        norms[norms == 0] = 1.0
+        return sparse.csr_matrix(vectors.multiply(1.0 / norms))
+
+    def _to_similarities(self, rows, columns, products, sizes):
+        if self.similarity == "jaccard":
+            return products / (sizes[rows] + sizes[columns] - products)
+        return products
+
+    def _exact_pairs(self, vectors, sizes):
+        """
+        Compute similarities of all pairs of persons with common goods by
+        blocks of rows and keep only best neighbors of every block.
+        """
+        vectors_t = vectors.T.tocsr()
+        results = []
+        for begin in range(0, vectors.shape[0], self.batch_size):
+            products = vectors[begin:begin + self.batch_size]\
+                .dot(vectors_t).tocoo()
+            rows = products.row.astype(np.int64) + begin
+            columns = products.col.astype(np.int64)
+
+            not_self = rows != columns
+            rows, columns = rows[not_self], columns[not_self]
+            similarities = self._to_similarities(
+                rows, columns, products.data[not_self], sizes
+            )
+
+            block_neighbors, block_weights = _top_neighbors(
+                rows - begin, columns, similarities,
+                min(self.batch_size, vectors.shape[0] - begin),
+                self.n_neighbors
+            )
+            results.append((block_neighbors, block_weights))
+
+        if not results:
+            return self.neighbors, self.weights
+        return (np.vstack([x for x, _ in results]),
+                np.vstack([x for _, x in results]))
+
+    def _minhash_signatures(self, vectors):
+        random_state = np.random.RandomState(self.random_state)
+        a = random_state.randint(1, MINHASH_PRIME, size=self.n_hashes)
+        b = random_state.randint(0, MINHASH_PRIME, size=self.n_hashes)
+
+        # Minimum of hashes of person goods for every hash function, every
+        # person has at least one good, so all CSR rows are not empty.
+        goods = vectors.indices.astype(np.int64)
+        row_starts = vectors.indptr[:-1]
+        signatures = np.empty((vectors.shape[0], self.n_hashes),
+                              dtype=np.int64)
+        for i in range(self.n_hashes):
+            hashes = (a[i] * goods + b[i]) % MINHASH_PRIME
+            signatures[:, i] = np.minimum.reduceat(hashes, row_starts)
+        return signatures
+
+    def _candidate_pairs(self, signatures):
+        """
+        Get pairs of persons which share a bucket in at least one LSH band.
+        """
+        n_persons = signatures.shape[0]
+        rows_per_band = self.n_hashes // self.n_bands
+        pairs = []
+        for band in range(self.n_bands):
+            band_signatures = signatures[
+                :, band * rows_per_band:(band + 1) * rows_per_band
+            ]
+            _, buckets = np.unique(band_signatures, axis=0,
+                                   return_inverse=True)
+            buckets = buckets.ravel()
+            order = np.argsort(buckets, kind="mergesort")
+            sorted_buckets = buckets[order]
+
+            # Members of the same bucket are adjacent after sorting, every
+            # person is paired with the next max_bucket_size - 1 members.
+            for offset in range(1, min(self.max_bucket_size, n_persons)):
+                same = sorted_buckets[:-offset] == sorted_buckets[offset:]
+                if not same.any():
+                    break
+                pairs.append(order[:-offset][same] * n_persons +
+                             order[offset:][same])
+
+        if not pairs:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        pairs = np.unique(np.concatenate(pairs))
+        rows, columns = pairs // n_persons, pairs % n_persons
+        return (np.concatenate([rows, columns]),
+                np.concatenate([columns, rows]))
+
+    def _minhash_pairs(self, vectors, sizes):
+        rows, columns = self._candidate_pairs(
+            self._minhash_signatures(vectors)
+        )
+        products = np.asarray(
+            vectors[rows].multiply(vectors[columns]).sum(axis=1)
+        ).ravel()
+        similarities = self._to_similarities(rows, columns, products, sizes)
+        return _top_neighbors(rows, columns, similarities, vectors.shape[0],
+                              self.n_neighbors)
+
+    def fit(self, train_samples, train_labels, **kwargs):
+        baskets = to_csr_labels(train_labels)
+        checks.check_equality(len(train_samples), baskets.shape[0],
+                              message="Samples and labels have different "
+                                      "sizes")
+
+        baskets.data = np.ones_like(baskets.data, dtype=np.float64)
+
+        # Get person ids from train samples, samples format:
+        # [[person_id, month, day], [person_id, month, day], ...].
+        persons_ids = [person_data[0] for person_data in train_samples]
+        self.persons_index = {
+            x: i for i, x in enumerate(dict.fromkeys(persons_ids))
+        }
+
+        frequencies = persons_matrix(persons_ids, self.persons_index).T\
+            .dot(baskets).tocsr()
+        frequencies.eliminate_zeros()
+        self.popularity = np.asarray(baskets.sum(axis=0)).ravel()
+
+        # Contribution of every neighbor is the share of goods in the
+        # neighbor history, so persons with long history do not dominate.
+        totals = np.asarray(frequencies.sum(axis=1))
+        totals[totals == 0] = 1.0
+        self.history = sparse.csr_matrix(frequencies.multiply(1.0 / totals))
+
+        vectors = self._get_vectors(frequencies)
+        sizes = np.diff(vectors.indptr).astype(np.float64)
+        if self.index == "exact":
+            self.neighbors, self.weights = self._exact_pairs(vectors, sizes)
+        else:
+            self.neighbors, self.weights = self._minhash_pairs(vectors,
+                                                               sizes)
+
+    def _score(self, rows, history):
+        # Sparse matrix with weights of neighbors (and the person)
+        # for every scored person, so all neighbors are aggregated with one
+        # matrix product.
+        neighbors = self.neighbors[rows]
+        weights = self.weights[rows]
+        found = neighbors >= 0
+        batch_rows = np.repeat(np.arange(len(rows)), found.sum(axis=1))
+        neighbor_weights = sparse.csr_matrix(
+            (weights[found], (batch_rows, neighbors[found])),
+            shape=(len(rows), self.history.shape[0])
+        )
+        if self.self_weight != 0.0:
+            neighbor_weights = neighbor_weights + sparse.csr_matrix(
+                (np.full(len(rows), self.self_weight),
+                 (np.arange(len(rows)), rows)),
+                shape=neighbor_weights.shape
+            )
+        return neighbor_weights.dot(history).toarray()
+
+    def predict(self, samples, **kwargs):
+        # Popularity of goods scaled below any neighbor score breaks ties and
+        # fills predictions of persons without neighbors.
+        popular_scores = (self.popularity /
+                          (1e6 * max(self.popularity.max(initial=0), 1)))
+
+        # Only candidate goods are scored, e.g. goods from the day menu.
+        columns = model.get_candidate_columns(kwargs.get("candidates"),
+                                              len(self.popularity))
+        popular_scores = popular_scores[columns]
+        history = self.history[:, columns]
+
+        return predict_top_goods(
+            samples, self.persons_index,
+            lambda rows: self._score(rows, history),
+            popular_scores, columns, len(self.popularity),
+            self.num_popular_ids, self.batch_size
+        )
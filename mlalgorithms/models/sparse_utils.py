@@ -0,0 +1,121 @@
+import numpy as np
+from scipy import sparse
+
+
+def to_csr_labels(labels):
+    """
+    Convert interim labels to sparse matrix with checks in rows and goods in
+    columns.
+
+    :param labels: list, np.ndarray, sparse matrix.
+        Interim labels.
+
+    :return: sparse.csr_matrix.
+        Sparse matrix with labels.
+    """
+    if sparse.issparse(labels):
+        return labels.tocsr()
+    if len(labels) == 0:
+        return sparse.csr_matrix((0, 0))
+    return sparse.csr_matrix(np.asarray(labels))
+
+
+def persons_matrix(persons_ids, persons_index):
+    """
+    Build sparse indicator matrix which maps checks to persons.
+
+    :param persons_ids: list.
+        Person id of every check.
+
+    :param persons_index: dict.
+        Dict with person ids and their row numbers.
+
+    :return: sparse.csr_matrix.
+        Matrix with shape (number of checks, number of persons).
+    """
+    rows = [persons_index[x] for x in persons_ids]
+    return sparse.csr_matrix(
+        (np.ones(len(rows)), (np.arange(len(rows)), rows)),
+        shape=(len(rows), len(persons_index))
+    )
+
+
+def top_k_mask(scores, k):
+    """
+    Transform matrix of scores to interim labels with ones at k best goods
+    of every row. Goods with zero or negative score are not selected.
+
+    :param scores: np.ndarray.
+        Dense matrix of scores with shape (n_samples, n_goods).
+
+    :param k: int.
+        Number of goods to select.
+
+    :return: np.ndarray.
+        Matrix of interim labels with the same shape as scores.
+    """
+    k = min(k, scores.shape[1])
+    mask = np.zeros(scores.shape, dtype=np.int8)
+    if k == 0:
+        return mask
+
+    top_indices = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    rows = np.arange(scores.shape[0])[:, np.newaxis]
+    mask[rows, top_indices] = scores[rows, top_indices] > 0
+    return mask
+
+
+def predict_top_goods(samples, persons_index, score, popular_scores, columns,
+                      width, k, batch_size):
+    """
+    Predict k best candidate goods for every sample by scores of persons.
+    Every person is scored once, checks of the same person share one
+    prediction array.
+
+    :param samples: list.
+        Samples in format [[person_id, month, day], ...].
+
+    :param persons_index: dict.
+        Dict with person ids and their row numbers, unknown persons get only
+        popular_scores.
+
+    :param score: callable.
+        Function which takes np.ndarray of person rows and returns dense
+        scores of candidate goods with shape (len(rows), len(columns)).
+
+    :param popular_scores: np.ndarray.
+        Scores of candidate goods added for every person, they break ties
+        and fill predictions of persons with few scored goods.
+
+    :param columns: np.ndarray.
+        Good ids of candidate goods.
+
+    :param width: int.
+        Length of interim labels.
+
+    :param k: int.
+        Number of goods to predict.
+
+    :param batch_size: int.
+        Number of persons scored at once.
+
+    :return: list.
+        Interim labels of samples.
+    """
+    # Unknown persons have row -1.
+    rows = np.array([persons_index.get(sample[0], -1)
+                     for sample in samples], dtype=np.int64)
+    unique_rows, inverse = np.unique(rows, return_inverse=True)
+
+    labels = np.zeros((len(unique_rows), width), dtype=np.int8)
+    for begin in range(0, len(unique_rows), batch_size):
+        batch_rows = unique_rows[begin:begin + batch_size]
+        known = batch_rows >= 0
+
+        scores = np.tile(popular_scores, (len(batch_rows), 1))
+        if known.any():
+            scores[known] += score(batch_rows[known])
+        labels[begin:begin + len(batch_rows), columns] = top_k_mask(
+            scores, k
+        )
+    return [labels[i] for i in inverse]
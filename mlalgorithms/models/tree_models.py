@@ -6,11 +6,11 @@ from . import model
 
 class DecisionTreeModel(model.SimpleModel):
 
-    def __init__(self, **kwargs):
-        super().__init__(DecisionTreeRegressor(**kwargs))
+    def __init__(self, label_compression=None, **kwargs):
+        super().__init__(DecisionTreeRegressor(**kwargs), label_compression)
 
 
 class ExtraTreeModel(model.SimpleModel):
 
-    def __init__(self, **kwargs):
-        super().__init__(ExtraTreeRegressor(**kwargs))
+    def __init__(self, label_compression=None, **kwargs):
+        super().__init__(ExtraTreeRegressor(**kwargs), label_compression)
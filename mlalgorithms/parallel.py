@@ -0,0 +1,168 @@
+import multiprocessing
+import os
+import pickle
+import tempfile
+
+from . import checks
+from .shared_dataset import SharedDataset
+
+
+# Model and test samples of the current worker process. With "fork" start
+# method they are inherited from the parent process, otherwise the model is
+# loaded from the pickled artifact once per worker and samples are attached
+# from the shared dataset.
+_worker_model = None
+_worker_samples = None
+
+
+def _init_worker(model, samples):
+    global _worker_model, _worker_samples
+
+    _worker_model = model
+    _worker_samples = samples
+
+
+def _init_worker_from_file(model_filename, dataset):
+    with open(model_filename, "rb") as input_stream:
+        model = pickle.loads(input_stream.read())
+    _init_worker(model, dataset.samples)
+
+
+def _predict_shard(task):
+    # Samples are sent with the shard to workers of the shared pool,
+    # otherwise they are taken from samples of the worker.
+    indices, candidates, shard_samples = task
+    if shard_samples is None:
+        shard_samples = [_worker_samples[i] for i in indices]
+    if candidates is None:
+        return indices, _worker_model.predict(shard_samples)
+    return indices, _worker_model.predict(shard_samples,
+                                          candidates=candidates)
+
+
+def _collect_predictions(predictions, results):
+    for indices, shard_predictions in results:
+        for i, prediction in zip(indices, shard_predictions):
+            predictions[i] = prediction
+
+
+def _get_shards(n_samples, candidate_groups, shard_size):
+    """
+    Split every group of samples into shards with the candidates of the
+    group.
+    """
+    if candidate_groups is None:
+        candidate_groups = [(list(range(n_samples)), None)]
+
+    for indices, candidates in candidate_groups:
+        for begin in range(0, len(indices), shard_size):
+            yield indices[begin:begin + shard_size], candidates, None
+
+
+def _get_n_workers(n_jobs):
+    checks.check_types(n_jobs, int, var_name="n_jobs")
+    if n_jobs != -1:
+        checks.check_value(n_jobs, 1, None, var_name="n_jobs")
+    return n_jobs if n_jobs != -1 else os.cpu_count() or 1
+
+
+def create_pool(model, n_jobs=-1):
+    """
+    Create the pool of forked worker processes with the model for several
+    calls of predict_in_parallel, samples are sent with every shard to it.
+    Forked process has only the thread which forked it, so the pool must be
+    created before background threads are started: locks held by them stay
+    locked in workers forever.
+
+    :param model: IModel.
+        Trained model.
+
+    :param n_jobs: int, optional (default=-1).
+        Number of worker processes, -1 means number of CPUs.
+
+    :return: multiprocessing.pool.Pool, None.
+        Pool of worker processes or None if only one worker is used or
+        "fork" start method is not available. Pools of other start methods
+        do not inherit threads, predict_in_parallel creates them itself.
+    """
+    n_workers = _get_n_workers(n_jobs)
+    if (n_workers == 1 or
+            "fork" not in multiprocessing.get_all_start_methods()):
+        return None
+    return multiprocessing.get_context("fork").Pool(
+        n_workers, _init_worker, (model, None)
+    )
+
+
+def predict_in_parallel(model, samples, candidate_groups=None, n_jobs=-1,
+                        shard_size=10000, pool=None):
+    """
+    Predict shards of samples in the pool of worker processes. Model and
+    samples are sent to every worker only once: they are inherited by forked
+    workers or loaded from a temporary pickled file and shared dataset.
+    Workers of the pool from create_pool get samples with every shard.
+
+    :param model: IModel.
+        Trained model.
+
+    :param samples: list.
+        Test samples.
+
+    :param candidate_groups: list, optional (default=None).
+        Groups of samples with their candidate goods, see
+        IParser.get_test_candidates. None means one group without candidates.
+
+    :param n_jobs: int, optional (default=-1).
+        Number of worker processes, -1 means number of CPUs.
+
+    :param shard_size: int, optional (default=10000).
+        Maximal number of samples predicted by one task.
+
+    :param pool: multiprocessing.pool.Pool, optional (default=None).
+        Result of create_pool with the same model. None means that the pool
+        is created for this call.
+
+    :return: list.
+        Predictions in the order of samples.
+    """
+    n_workers = _get_n_workers(n_jobs)
+    checks.check_types(shard_size, int, var_name="shard_size")
+    checks.check_value(shard_size, 0, None, True, var_name="shard_size")
+
+    tasks = list(_get_shards(len(samples), candidate_groups, shard_size))
+    n_workers = max(1, min(n_workers, len(tasks)))
+
+    predictions = [None] * len(samples)
+    if pool is not None:
+        tasks = ((indices, candidates, [samples[i] for i in indices])
+                 for indices, candidates, _ in tasks)
+        _collect_predictions(predictions,
+                             pool.imap_unordered(_predict_shard, tasks))
+        return predictions
+
+    if n_workers == 1:
+        _init_worker(model, samples)
+        try:
+            _collect_predictions(predictions, map(_predict_shard, tasks))
+        finally:
+            _init_worker(None, None)
+        return predictions
+
+    if "fork" in multiprocessing.get_all_start_methods():
+        with multiprocessing.get_context("fork").Pool(
+                n_workers, _init_worker, (model, samples)) as pool:
+            _collect_predictions(predictions,
+                                 pool.imap_unordered(_predict_shard, tasks))
+        return predictions
+
+    with tempfile.TemporaryDirectory() as temp_dir, \
+            SharedDataset.create(samples=samples) as dataset:
+        model_filename = os.path.join(temp_dir, "model.pkl")
+        with open(model_filename, "wb") as output_stream:
+            output_stream.write(pickle.dumps(model))
+
+        with multiprocessing.Pool(n_workers, _init_worker_from_file,
+                                  (model_filename, dataset)) as pool:
+            _collect_predictions(predictions,
+                                 pool.imap_unordered(_predict_shard, tasks))
+    return predictions
@@ -1,5 +1,5 @@
 from pathlib import Path
 
 
-__all__ = [p.stem for p in Path().iterdir()
+__all__ = [p.stem for p in Path(__file__).parent.iterdir()
            if p.is_file() and p.suffix == ".py" and p.stem != "__init__"]
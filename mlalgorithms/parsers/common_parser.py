@@ -1,23 +1,212 @@
+import concurrent.futures
+import glob
+import hashlib
+import heapq
+import itertools
+import os
+import os.path
+import pickle
+
+import numpy as np
 import pandas as pd
+from scipy import sparse
 
 import mlalgorithms.checks as checks
+import mlalgorithms.kernels as kernels
+
+from mlalgorithms.dataset_stats import (LABEL_FORMATS, compute_dataset_stats,
+                                        choose_label_format,
+                                        choose_label_dtype,
+                                        format_dataset_stats)
+from mlalgorithms.logger import get_logger
+from mlalgorithms.shared_dataset import SharedDataset
+from mlalgorithms.sketches import SpaceSavingCounter
 
 from . import parser
 
 
+# Version of parsed partition format, cached partitions of other versions are
+# parsed again.
+PARTITION_CACHE_VERSION = 3
+
+SAMPLE_BY = ("person", "day")
+
+# Train data is read by chunks of this number of rows when sampling is
+# switched on, so only sampled rows of every chunk are kept in memory.
+SAMPLING_CHUNK_SIZE = 10 ** 6
+
+
+def sample_rows(df, fraction, by="person", seed=0):
+    """
+    Select rows of representative sample of train data. Rows are selected by
+    hash of the key with seed, so the same persons or checks are selected in
+    every chunk, file and run.
+
+    :param df: pd.DataFrame.
+        Rows of train data.
+
+    :param fraction: float.
+        Expected fraction of selected persons or checks.
+
+    :param by: str, optional (default="person").
+        "person" selects whole history of sampled persons, "day" selects
+        checks of every day independently, so every day keeps the fraction
+        of its checks.
+
+    :param seed: int, optional (default=0).
+        Seed of the sample.
+
+    :return: pd.DataFrame.
+        Selected rows.
+    """
+    if fraction == 1.0:
+        return df
+
+    key = df["person_id"] if by == "person" else df["chknum"]
+    # Chunk with missing values is read with float column, so numeric keys
+    # are hashed as floats to select the same ids in every chunk.
+    if pd.api.types.is_numeric_dtype(key):
+        key = key.astype(np.float64)
+    hash_key = hashlib.md5(str(seed).encode()).hexdigest()[:16]
+    hashes = pd.util.hash_pandas_object(key, index=False,
+                                        hash_key=hash_key).values
+
+    # Hash key is used only for strings, so seed is mixed into hashes of
+    # all keys too.
+    hashes = pd.util.hash_array(hashes ^ np.uint64(int(hash_key, 16)))
+    return df[hashes < fraction * 2.0 ** 64]
+
+
+def read_sampled_csv(filepath_or_buffer, fraction, by="person", seed=0,
+                     nrows=None):
+    """
+    Read sample of train data by chunks, rows which are not sampled are
+    dropped right after every chunk is read.
+
+    :param filepath_or_buffer: str, pathlib.Path, py._path.local.LocalPath,
+        pd.DataFrame or any object with a read() method.
+        Train data.
+
+    :param fraction: float.
+        Expected fraction of selected persons or checks.
+
+    :param by: str, optional (default="person").
+        Sampling key, see sample_rows.
+
+    :param seed: int, optional (default=0).
+        Seed of the sample.
+
+    :param nrows: int, optional (default=None).
+        Number of rows of file to read.
+
+    :return: pd.DataFrame.
+        Sampled rows.
+    """
+    if isinstance(filepath_or_buffer, pd.DataFrame):
+        df = filepath_or_buffer
+        if nrows is not None:
+            df = df.head(nrows)
+        return sample_rows(df, fraction, by, seed).reset_index(drop=True)
+
+    reader = pd.read_csv(filepath_or_buffer, nrows=nrows,
+                         chunksize=SAMPLING_CHUNK_SIZE)
+    return pd.concat([sample_rows(chunk, fraction, by, seed)
+                      for chunk in reader], ignore_index=True)
+
+
+def get_partitions(filepath_or_buffer):
+    """
+    Get files of partitioned train data.
+
+    :param filepath_or_buffer: object.
+        Directory with CSV files, glob pattern or any other input data.
+
+    :return: list, None.
+        Sorted file names of partitions or None if input is not partitioned.
+    """
+    if not isinstance(filepath_or_buffer, (str, os.PathLike)):
+        return None
+
+    path = os.fspath(filepath_or_buffer)
+    if os.path.isdir(path):
+        filenames = glob.glob(os.path.join(path, "*.csv"))
+    elif any(x in path for x in "*?["):
+        filenames = glob.glob(path)
+    else:
+        return None
+
+    if not filenames:
+        raise ValueError(f"No partitions are found by {path}.")
+    return sorted(filenames)
+
+
+def _parse_partition(filename, cache_dir=None, sampling=None):
+    """
+    Parse one partition of train data or load its parsed form from cache.
+    Cached form is valid while file size and modification time are not
+    changed. Sampling is a tuple of sample_rows parameters or None.
+    """
+    cache_filename = None
+    if cache_dir is not None:
+        filename = os.path.abspath(filename)
+        stat = os.stat(filename)
+        key = hashlib.sha1(
+            f"{PARTITION_CACHE_VERSION}:{filename}:{stat.st_size}:"
+            f"{stat.st_mtime_ns}:{sampling}".encode()
+        ).hexdigest()
+        cache_filename = os.path.join(cache_dir, key + ".pkl")
+        if os.path.exists(cache_filename):
+            with open(cache_filename, "rb") as input_stream:
+                return pickle.loads(input_stream.read())
+
+    if sampling is None:
+        df = pd.read_csv(filename)
+    else:
+        df = read_sampled_csv(filename, *sampling)
+    instances, labels = CommonParser._group_by_checks(df)
+    result = {
+        "good_id_counts": df["good_id"].value_counts(),
+        "help_data": CommonParser._sorted_by_date_train_data(df),
+        "chknums": df["chknum"].unique().tolist(),
+        "instances": instances,
+        "labels": labels
+    }
+
+    if cache_filename is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(cache_filename + ".tmp", "wb") as output_stream:
+            output_stream.write(pickle.dumps(result))
+        os.replace(cache_filename + ".tmp", cache_filename)
+    return result
+
+
 # Header: chknum, person_id, month, day, good, good_id
 class CommonParser(parser.IParser):
 
     def __init__(self, proportion=0.7, raw_date=True, n_rows=None,
-                 num_popular_ids=5, debug=False):
+                 num_popular_ids=5, popular_ids_capacity=None,
+                 popular_ids_decay=1.0, partition_n_jobs=1,
+                 partition_cache_dir=None, label_format="auto",
+                 sample_fraction=None, sample_by="person", sample_seed=0,
+                 debug=False):
         self._train_samples_num = 0
         self._list_of_instances = []
         self._list_of_labels = []
         self._list_of_samples = []
+        self._train_instances_and_samples = ([], [])
         self._help_data = dict()
+        self._train_help_data = dict()
+        self._max_good_id = None
+        self._menus_by_chknum = None
         self._chknums = list()
+        self._validation_chknums = list()
+        self._good_id_counter = None
         self._most_popular_good_ids = list()
         self._answers_for_train = list()
+        self._partial_train_slice = slice(0, 0)
+        self._dataset_stats = None
+        self._resolved_label_format = "list"
+        self._label_dtype = np.dtype(np.int64)
 
         self._proportion = proportion
         checks.check_types(self._proportion, float, var_name="proportion")
@@ -37,6 +226,42 @@ class CommonParser(parser.IParser):
         checks.check_types(self._num_popular_ids, int,
                            var_name="num_popular_ids")
 
+        self._popular_ids_capacity = popular_ids_capacity
+        self._popular_ids_decay = popular_ids_decay
+        self._good_id_counter = self._create_good_id_counter()
+
+        self._partition_n_jobs = partition_n_jobs
+        checks.check_types(self._partition_n_jobs, int,
+                           var_name="partition_n_jobs")
+        checks.check_value(self._partition_n_jobs, 1, None,
+                           var_name="partition_n_jobs")
+
+        self._partition_cache_dir = partition_cache_dir
+        checks.check_types(self._partition_cache_dir, type(None), str,
+                           var_name="partition_cache_dir")
+
+        self._label_format = label_format
+        if self._label_format not in LABEL_FORMATS:
+            raise ValueError(f"label_format parameter must be one of "
+                             f"{LABEL_FORMATS}: got {self._label_format}.")
+
+        self._sample_fraction = sample_fraction
+        checks.check_types(self._sample_fraction, type(None), float,
+                           var_name="sample_fraction")
+        if self._sample_fraction is not None:
+            checks.check_value(self._sample_fraction, 0.0, 1.0, True, False,
+                               var_name="sample_fraction")
+
+        self._sample_by = sample_by
+        if self._sample_by not in SAMPLE_BY:
+            raise ValueError(f"sample_by parameter must be one of "
+                             f"{SAMPLE_BY}: got {self._sample_by}.")
+
+        self._sample_seed = sample_seed
+        checks.check_types(self._sample_seed, int, var_name="sample_seed")
+        checks.check_value(self._sample_seed, 0, None,
+                           var_name="sample_seed")
+
         self._debug = debug
         checks.check_types(self._debug, bool, var_name="debug")
 
@@ -52,10 +277,45 @@ class CommonParser(parser.IParser):
     def most_popular_good_ids(self):
         return self._most_popular_good_ids
 
+    @property
+    def good_id_counter(self):
+        return self._good_id_counter
+
     @property
     def answers_for_train(self):
         return self._answers_for_train
 
+    @property
+    def dataset_stats(self):
+        return self._dataset_stats
+
+    @property
+    def label_format(self):
+        return self._resolved_label_format
+
+    @staticmethod
+    def _read_csv(filepath_or_buffer, nrows=None):
+        # Data frames are accepted as already read data, e.g. days of history
+        # in backtest.
+        if isinstance(filepath_or_buffer, pd.DataFrame):
+            df = filepath_or_buffer.reset_index(drop=True)
+            if nrows is not None:
+                return df.head(nrows)
+            return df
+        return pd.read_csv(filepath_or_buffer, nrows=nrows)
+
+    def _get_sampling(self):
+        if self._sample_fraction is None:
+            return None
+        return self._sample_fraction, self._sample_by, self._sample_seed
+
+    def _read_train_csv(self, filepath_or_buffer, nrows=None):
+        # Sampled train data is read by chunks instead of reading all rows.
+        sampling = self._get_sampling()
+        if sampling is None:
+            return self._read_csv(filepath_or_buffer, nrows=nrows)
+        return read_sampled_csv(filepath_or_buffer, *sampling, nrows=nrows)
+
     @staticmethod
     def _sorted_by_date_train_data(df):
         dfgroup = df[["month", "day", "good_id",
@@ -83,7 +343,7 @@ class CommonParser(parser.IParser):
         return df.set_index(["month", "day"]).to_dict("index")
 
     def _load_formatted_train_data(self, filepath_or_buffer):
-        df = pd.read_csv(filepath_or_buffer, nrows=self._n_rows)
+        df = self._read_csv(filepath_or_buffer, nrows=self._n_rows)
         dfgroup = df[["person_id", "month", "day", "chknum"]] \
             .groupby(["person_id", "month", "day", "chknum"], as_index=False) \
             .agg(list)
@@ -98,31 +358,112 @@ class CommonParser(parser.IParser):
 
         return dictionary
 
-    def _load_train_data(self, filepath_or_buffer):
-        df = pd.read_csv(filepath_or_buffer, nrows=self._n_rows)
-
-        self._most_popular_good_ids = df["good_id"].value_counts().head(
-            self._num_popular_ids).index.tolist()
-        self._help_data = self._sorted_by_date_train_data(df)
+    @staticmethod
+    def _merge_help_data(help_data, new_help_data):
+        # Help data is updated in place, so it is not copied for every
+        # merged partition.
+        for date, new_value in new_help_data.items():
+            value = help_data.get(date)
+            if value is None:
+                help_data[date] = new_value
+            else:
+                help_data[date] = {
+                    key: list(pd.Series(value[key] + new_value[key]).unique())
+                    for key in value
+                }
+        return help_data
 
+    @staticmethod
+    def _group_by_checks(df):
         result = df.groupby(["person_id", "month", "day", "chknum"],
                             as_index=False).agg(list)
 
-        self._chknums = df["chknum"].unique().tolist()
         list_of_instances = list(
             result.drop("good_id", axis=1).T.to_dict().values()
         )
         list_of_labels = result["good_id"].tolist()
         return list_of_instances, list_of_labels
 
+    def _create_good_id_counter(self):
+        return SpaceSavingCounter(self._popular_ids_capacity,
+                                  self._popular_ids_decay)
+
+    def _update_good_id_counter(self, good_id_counts):
+        self._good_id_counter.update_counts(good_id_counts)
+        self._most_popular_good_ids = self._good_id_counter.most_common(
+            self._num_popular_ids).index.tolist()
+
+    def _load_partitioned_train_data(self, filenames):
+        if self._partition_n_jobs == 1:
+            results = [_parse_partition(x, self._partition_cache_dir,
+                                        self._get_sampling())
+                       for x in filenames]
+        else:
+            with concurrent.futures.ProcessPoolExecutor(
+                    self._partition_n_jobs) as executor:
+                results = list(executor.map(
+                    _parse_partition, filenames,
+                    itertools.repeat(self._partition_cache_dir),
+                    itertools.repeat(self._get_sampling())
+                ))
+
+        self._good_id_counter = self._create_good_id_counter()
+        help_data = dict()
+        for result in results:
+            self._update_good_id_counter(result["good_id_counts"])
+            help_data = self._merge_help_data(help_data, result["help_data"])
+        self._train_help_data = help_data
+        self._set_help_data(self._train_help_data)
+
+        self._chknums = list(dict.fromkeys(itertools.chain.from_iterable(
+            result["chknums"] for result in results
+        )))
+
+        # Checks are sorted as they are sorted by groupby of concatenated
+        # partitions, so train and validation parts are the same. Checks of
+        # every partition are already sorted by groupby, so they are merged
+        # instead of sorting all of them again.
+        merged = heapq.merge(
+            *(zip(result["instances"], result["labels"])
+              for result in results),
+            key=lambda pair: (pair[0]["person_id"], pair[0]["month"],
+                              pair[0]["day"], pair[0]["chknum"])
+        )
+        instances, labels = [], []
+        for instance, label in merged:
+            instances.append(instance)
+            labels.append(label)
+        return instances, labels
+
+    def _load_train_data(self, filepath_or_buffer):
+        # Directory or glob pattern of daily partitions is parsed by
+        # partitions, n_rows is not applied to them.
+        filenames = get_partitions(filepath_or_buffer)
+        if filenames is not None:
+            return self._load_partitioned_train_data(filenames)
+
+        df = self._read_train_csv(filepath_or_buffer, nrows=self._n_rows)
+
+        self._good_id_counter = self._create_good_id_counter()
+        self._update_good_id_counter(df["good_id"].value_counts())
+        self._train_help_data = self._sorted_by_date_train_data(df)
+        self._set_help_data(self._train_help_data)
+
+        self._chknums = df["chknum"].unique().tolist()
+        return self._group_by_checks(df)
+
     def _load_test_data(self, filepath_or_buffer_set, filepath_or_buffer_menu):
-        df_set = pd.read_csv(filepath_or_buffer_set)
-        df_menu = pd.read_csv(filepath_or_buffer_menu)
+        # Test set and menu are read concurrently, C parser of pandas
+        # releases GIL.
+        with concurrent.futures.ThreadPoolExecutor(2) as executor:
+            future_set = executor.submit(self._read_csv,
+                                         filepath_or_buffer_set)
+            future_menu = executor.submit(self._read_csv,
+                                          filepath_or_buffer_menu)
+            df_set, df_menu = future_set.result(), future_menu.result()
 
         self._chknums = df_set["chknum"].tolist()
-        self._help_data = self._sorted_by_date_test_data(
-            df_set, df_menu
-        )
+        self._set_help_data(self._sorted_by_date_test_data(df_set, df_menu))
 
         list_of_instances = list(df_set.T.to_dict().values())
         return list_of_instances
@@ -140,32 +481,57 @@ class CommonParser(parser.IParser):
         return (self._get_person_id(instance) +
                 self._get_absolute_date(instance))
 
+    def _set_help_data(self, help_data):
+        self._help_data = help_data
+        self._max_good_id = None
+        self._menus_by_chknum = None
+
     def max_good_id(self):
+        # Value is cached until help data is changed, because this method is
+        # called for every label transformation.
+        if self._max_good_id is not None:
+            return self._max_good_id
+
         result = 0
         for _, goods_and_chknums in self.help_data.items():
             temp_max = max(goods_and_chknums["good_id"])
             result = max(temp_max, result)
+        self._max_good_id = result
         return result
 
     def get_menu_on_day_by_chknum(self, chknum):
-        for date, value in self.help_data.items():
-            if chknum in value["chknum"]:
-                return value["good_id"]
-        raise KeyError(f"No checks with given chknum={chknum}")
+        # Index of menus is built once for all checks instead of searching
+        # through all days for every check.
+        if self._menus_by_chknum is None:
+            days = list(self.help_data.values())
+            index = pd.DataFrame({
+                "chknum": list(itertools.chain.from_iterable(
+                    x["chknum"] for x in days
+                )),
+                "day": np.repeat(np.arange(len(days)),
+                                 [len(x["chknum"]) for x in days])
+            }, columns=["chknum", "day"])
+
+            # The first day with the chknum is used, like in search through
+            # days in their order.
+            index = index.drop_duplicates("chknum", keep="first")
+            self._menus_by_chknum = {
+                x: days[i]["good_id"]
+                for x, i in zip(index["chknum"], index["day"])
+            }
+
+        menu = self._menus_by_chknum.get(chknum)
+        if menu is None:
+            raise KeyError(f"No checks with given chknum={chknum}")
+        return menu
 
     def to_interim_label(self, label):
-        result = [0] * (self.max_good_id() + 1)
-        for elem in label:
-            result[elem] += 1
-        return result
+        return kernels.to_interim_label(label, self.max_good_id() + 1)\
+            .tolist()
 
     @staticmethod
     def to_final_label(interim_label):
-        result = []
-        for i, elem in enumerate(interim_label):
-            if elem != 0:
-                result += [i] * elem
-        return result
+        return kernels.to_final_label(interim_label).tolist()
 
     def parse_train_data(self, filepath_or_buffer):
         self._list_of_instances, self._list_of_labels = self._load_train_data(
@@ -176,12 +542,16 @@ class CommonParser(parser.IParser):
                               len(self._list_of_labels),
                               message="Instances of read data are not equal "
                                       "to their.")
-        checks.check_equality(self.to_final_label(self.to_interim_label(
-           [24, 42, 42])), [24, 42, 42], message="Processing data methods are "
-                                                 "not mutually inverse.")
+        if not checks.is_optimized():
+            checks.check_equality(
+                self.to_final_label(self.to_interim_label([24, 42, 42])),
+                [24, 42, 42],
+                message="Processing data methods are not mutually inverse."
+            )
 
         self._list_of_samples = list(map(self._to_sample,
                                          self._list_of_instances))
+        self._choose_label_storage()
 
         if self._debug:
             print(len(self._list_of_instances))
@@ -192,9 +562,62 @@ class CommonParser(parser.IParser):
         self._train_samples_num = int(self._proportion *
                                       len(self._list_of_labels))
         self._chknums = self._chknums[self._train_samples_num:]
+        self._validation_chknums = self._chknums
+        self._train_instances_and_samples = (self._list_of_instances,
+                                             self._list_of_samples)
         self._answers_for_train = [
             sorted(x) for x in self._list_of_labels[self._train_samples_num:]
         ]
+        self._partial_train_slice = slice(0, 0)
+
+    def parse_partial_train_data(self, filepath_or_buffer):
+        df = self._read_train_csv(filepath_or_buffer)
+
+        self._update_good_id_counter(df["good_id"].value_counts())
+
+        # Restore state of train data, because test data could be parsed
+        # after previous fit.
+        self._list_of_instances, self._list_of_samples = \
+            self._train_instances_and_samples
+        self._train_help_data = self._merge_help_data(
+            self._train_help_data, self._sorted_by_date_train_data(df)
+        )
+        self._set_help_data(self._train_help_data)
+        self._chknums = self._validation_chknums
+
+        new_instances, new_labels = self._group_by_checks(df)
+        new_samples = list(map(self._to_sample, new_instances))
+
+        # New rows are inserted at the end of train part, validation part
+        # stays the same.
+        begin = self._train_samples_num
+        self._list_of_instances[begin:begin] = new_instances
+        self._list_of_labels[begin:begin] = new_labels
+        self._list_of_samples[begin:begin] = new_samples
+        checks.check_equality(len(self._list_of_instances),
+                              len(self._list_of_labels),
+                              message="Train instances and labels have "
+                                      "different sizes")
+
+        self._train_samples_num += len(new_labels)
+        self._partial_train_slice = slice(begin, self._train_samples_num)
+
+        # Statistics are recomputed over all checks, so saved model has
+        # statistics of data it was fitted on. Storage format is kept, but
+        # new checks could have larger counts.
+        self._dataset_stats = compute_dataset_stats(
+            self._list_of_instances, self._list_of_labels,
+            self.max_good_id() + 1
+        )
+        self._label_dtype = np.promote_types(
+            self._label_dtype, choose_label_dtype(self._dataset_stats)
+        )
+
+        if self._debug:
+            print(len(new_instances))
+            print(new_instances[:3])
+            print(new_labels[:3])
+            print(new_samples[:3])
 
     def parse_test_data(self, filepath_or_buffer_set,
                         filepath_or_buffer_menu):
@@ -211,12 +634,55 @@ class CommonParser(parser.IParser):
             print(self._list_of_instances[:3])
             print(self._list_of_samples[:3])
 
+    def _choose_label_storage(self):
+        """
+        Compute statistics of parsed train data and choose format and type
+        of interim labels by them, unless format is set explicitly.
+        """
+        self._dataset_stats = compute_dataset_stats(
+            self._list_of_instances, self._list_of_labels,
+            self.max_good_id() + 1
+        )
+        self._label_dtype = choose_label_dtype(self._dataset_stats)
+        self._resolved_label_format = self._label_format
+        if self._label_format == "auto":
+            self._resolved_label_format = choose_label_format(
+                self._dataset_stats
+            )
+
+        get_logger().info(
+            f"Train data: {format_dataset_stats(self._dataset_stats)}. "
+            f"Labels are stored as {self._resolved_label_format} "
+            f"{self._label_dtype.name} values."
+        )
+
+    def _to_interim_labels(self, labels):
+        if self._resolved_label_format == "list":
+            return list(map(self.to_interim_label, labels))
+
+        matrix = self._to_csr_labels(labels, self.max_good_id() + 1)\
+            .astype(self._label_dtype)
+        if self._resolved_label_format == "sparse":
+            return matrix
+        return matrix.toarray()
+
     def get_train_data(self):
         train_samples = self._list_of_samples[:self._train_samples_num]
 
-        train_labels = list(map(
-            self.to_interim_label,
-            self._list_of_labels[:self._train_samples_num])
+        train_labels = self._to_interim_labels(
+            self._list_of_labels[:self._train_samples_num]
+        )
+
+        if self._debug:
+            print(train_samples[:3], end="\n\n")
+            print(train_labels[:3])
+        return train_samples, train_labels
+
+    def get_partial_train_data(self):
+        train_samples = self._list_of_samples[self._partial_train_slice]
+
+        train_labels = self._to_interim_labels(
+            self._list_of_labels[self._partial_train_slice]
         )
 
         if self._debug:
@@ -230,9 +696,8 @@ class CommonParser(parser.IParser):
 
         validation_samples = self._list_of_samples[self._train_samples_num:]
 
-        validation_labels = list(map(
-            self.to_interim_label,
-            self._list_of_labels[self._train_samples_num:])
+        validation_labels = self._to_interim_labels(
+            self._list_of_labels[self._train_samples_num:]
         )
 
         if self._debug:
@@ -240,7 +705,74 @@ class CommonParser(parser.IParser):
             print(validation_labels[:3])
         return validation_samples, validation_labels
 
+    def get_validation_info(self):
+        # Train instances are kept when test data is parsed.
+        instances = self._train_instances_and_samples[0]
+        return pd.DataFrame(instances[self._train_samples_num:],
+                            columns=["chknum", "person_id", "month", "day"])
+
     def get_test_data(self):
         if self._debug:
             print(self._list_of_samples[:3])
         return self._list_of_samples
+
+    @staticmethod
+    def _to_csr_labels(labels, width):
+        # Duplicated good ids of one check are summed, so rows are equal to
+        # interim labels.
+        lengths = [len(x) for x in labels]
+        rows = np.repeat(np.arange(len(labels)), lengths)
+        columns = np.fromiter((x for label in labels for x in label),
+                              dtype=np.int64, count=sum(lengths))
+        return sparse.csr_matrix(
+            (np.ones(len(columns), dtype=np.int64), (rows, columns)),
+            shape=(len(labels), width)
+        )
+
+    def get_shared_dataset(self, part="train", name=None, directory=None):
+        parts = ("train", "validation", "test")
+        if part not in parts:
+            raise ValueError(f"part parameter must be one of {parts}: "
+                             f"got {part}.")
+
+        if part == "test":
+            candidate_groups = self.get_test_candidates()
+            menu_ids = np.zeros(len(self._list_of_samples), dtype=np.int64)
+            menus = []
+            for i, (indices, candidates) in enumerate(candidate_groups):
+                menu_ids[indices] = i
+                menus.append([] if candidates is None else candidates)
+            return SharedDataset.create(
+                samples=self._list_of_samples,
+                chknums=self._chknums,
+                menus=self._to_csr_labels(menus, self.max_good_id() + 1),
+                menu_ids=menu_ids, name=name, directory=directory
+            )
+
+        if part == "train":
+            part_slice = slice(0, self._train_samples_num)
+            chknums = None
+        else:
+            part_slice = slice(self._train_samples_num, None)
+            chknums = self._validation_chknums
+        return SharedDataset.create(
+            samples=self._list_of_samples[part_slice],
+            labels=self._to_csr_labels(self._list_of_labels[part_slice],
+                                       self.max_good_id() + 1),
+            chknums=chknums, name=name, directory=directory
+        )
+
+    def get_test_candidates(self):
+        days = dict()
+        for i, instance in enumerate(self._list_of_instances):
+            days.setdefault((instance["month"], instance["day"]), []).append(i)
+
+        result = []
+        for date, indices in days.items():
+            day_data = self.help_data.get(date)
+            candidates = None
+            if day_data is not None:
+                candidates = np.unique(np.asarray(day_data["good_id"],
+                                                  dtype=np.int64))
+            result.append((indices, candidates))
+        return result
@@ -1,10 +1,139 @@
 import copy
 import importlib
 import json
+import threading
 
 import mlalgorithms.checks as checks
 
 
+# Entry point groups which are scanned for plugin classes. Plugin class is
+# resolved by the entry point name and the group name used as module name,
+# e.g. "model_module_name": "mlalgorithms.models" in ml_config.json.
+ENTRY_POINT_GROUPS = (
+    "mlalgorithms.models",
+    "mlalgorithms.parsers",
+    "mlalgorithms.metrics"
+)
+
+
+class ClassRegistry:
+
+    def __init__(self, entry_point_groups=ENTRY_POINT_GROUPS):
+        """
+        Constructor which initializes empty registry. Classes are resolved
+        lazily and cached until explicit invalidation.
+
+        :param entry_point_groups: tuple, optional
+            (default=ENTRY_POINT_GROUPS).
+            Names of the entry point groups to scan for plugins.
+        """
+        self._entry_point_groups = entry_point_groups
+        self._classes = dict()
+        self._entry_points = None
+        self._lock = threading.RLock()
+
+    def _load_entry_points(self):
+        """
+        Collect entry points of installed distributions. Plugin classes are
+        not imported here, only on the first request.
+
+        :return: dict.
+            Dict with (group name, entry point name) keys and entry point
+            values.
+        """
+        entry_points = dict()
+        # importlib.metadata is cheap to import unlike pkg_resources, the
+        # backport is used on Python older than 3.8.
+        try:
+            from importlib import metadata
+        except ImportError:
+            try:
+                import importlib_metadata as metadata
+            except ImportError:
+                return entry_points
+
+        for group in self._entry_point_groups:
+            try:
+                group_entry_points = metadata.entry_points(group=group)
+            except TypeError:
+                # Before Python 3.10 entry points are grouped in dict.
+                group_entry_points = metadata.entry_points().get(group, ())
+
+            for entry_point in group_entry_points:
+                entry_points[group, entry_point.name] = entry_point
+        return entry_points
+
+    def register(self, class_name, module_name, class_):
+        """
+        Register class explicitly, it will be returned for the pair of
+        class_name and module_name without any import.
+
+        :param class_name: str.
+            Name of the class in config file.
+
+        :param module_name: str.
+            Name of the module in config file.
+
+        :param class_: type.
+            Class to register.
+        """
+        checks.check_types(class_name, str, var_name="class_name")
+        checks.check_types(module_name, str, var_name="module_name")
+
+        with self._lock:
+            self._classes[module_name, class_name] = class_
+
+    def get_class(self, class_name, module_name):
+        """
+        Get class with class_name from module_name. Result is cached, so
+        module is imported only once.
+
+        :param class_name: str.
+            Name of the class to be created.
+
+        :param module_name: str.
+            Name of the module which stores class with class_name or name of
+            the entry point group.
+
+        :return: type of class_name from module_name
+        """
+        key = (module_name, class_name)
+        class_ = self._classes.get(key)
+        if class_ is not None:
+            return class_
+
+        with self._lock:
+            if key in self._classes:
+                return self._classes[key]
+
+            if self._entry_points is None:
+                self._entry_points = self._load_entry_points()
+
+            entry_point = self._entry_points.get(key)
+            if entry_point is not None:
+                class_ = entry_point.load()
+            else:
+                module = importlib.import_module(module_name)
+                class_ = getattr(module, class_name)
+
+            self._classes[key] = class_
+            return class_
+
+    def invalidate(self):
+        """
+        Drop all resolved classes and collected entry points, so the next
+        request imports modules and scans entry points again.
+        """
+        with self._lock:
+            self._classes.clear()
+            self._entry_points = None
+            importlib.invalidate_caches()
+
+
+# Registry shared by all config parsers of the process.
+class_registry = ClassRegistry()
+
+
 class ConfigParser:
 
     def __init__(self, existing_parsed_json_dict=None,
@@ -42,6 +171,22 @@ class ConfigParser:
         """
         return self._parsed_json[item]
 
+    def get(self, item, default=None):
+        """
+        Get value of parameter in config file or default value if parameter
+        is missed.
+
+        :param item: str.
+            Parameter name in config file.
+
+        :param default: object, optional (default=None).
+            Value to return if parameter is missed.
+
+        :return: int, float, str, dict, list, bool, None.
+            Value of parameter in config file.
+        """
+        return self._parsed_json.get(item, default)
+
     @staticmethod
     def get_class(class_name, module_name):
         """
@@ -55,9 +200,15 @@ class ConfigParser:
 
         :return: type of class_name from module_name
         """
-        importlib.invalidate_caches()
-        module = importlib.import_module(module_name)
-        return getattr(module, class_name)
+        return class_registry.get_class(class_name, module_name)
+
+    @staticmethod
+    def invalidate_classes():
+        """
+        Drop cached classes, so modules and entry points are looked up again
+        on the next get_class call.
+        """
+        class_registry.invalidate()
 
     def get_instance(self, class_name, module_name, **kwargs):
         """
@@ -28,6 +28,28 @@ class IParser(abc.ABC):
         """
         raise NotImplementedError("Called abstract class method!")
 
+    @property
+    def dataset_stats(self):
+        """
+        Return statistics of parsed train data: number of persons, goods,
+        days and checks, mean basket size and density of interim labels.
+
+        :return: dict, None.
+            Statistics or None if parser does not compute them.
+        """
+        return None
+
+    @property
+    def label_format(self):
+        """
+        Return storage of interim labels returned by get_*_data methods.
+
+        :return: str.
+            "list" for list of lists, "dense" for np.ndarray or "sparse" for
+            sparse.csr_matrix.
+        """
+        return "list"
+
     @abc.abstractmethod
     def max_good_id(self):
         """
@@ -96,6 +118,21 @@ class IParser(abc.ABC):
         """
         raise NotImplementedError("Called abstract class method!")
 
+    def parse_partial_train_data(self, filepath_or_buffer):
+        """
+        Parse new rows of train data and add them to already parsed train
+        data. Used to update trained model incrementally.
+
+        :param filepath_or_buffer: str, pathlib.Path, py._path.local.LocalPath
+            or any object with a read() method (such as a file handle or
+            StringIO)
+            The string could be a URL. Valid URL schemes include http, ftp, s3,
+            and file. For file URLs, a host is expected. For instance, a local
+            file could be file://localhost/path/to/table.csv.
+        """
+        raise NotImplementedError("Parser does not support incremental "
+                                  "parsing!")
+
     @abc.abstractmethod
     def parse_test_data(self, filepath_or_buffer_set, filepath_or_buffer_menu):
         """
@@ -131,6 +168,17 @@ class IParser(abc.ABC):
         """
         raise NotImplementedError("Called abstract class method!")
 
+    def get_partial_train_data(self):
+        """
+        Get data for incremental model training from the last parsed part of
+        train set.
+
+        :return: tuple of two array-like, sparse matrix.
+            Returns parsed data.
+        """
+        raise NotImplementedError("Parser does not support incremental "
+                                  "parsing!")
+
     @abc.abstractmethod
     def get_validation_data(self):
         """
@@ -141,6 +189,18 @@ class IParser(abc.ABC):
         """
         raise NotImplementedError("Called abstract class method!")
 
+    def get_validation_info(self):
+        """
+        Get information about checks of validation set for sliced
+        evaluation.
+
+        :return: pd.DataFrame.
+            Data frame with chknum, person_id, month and day of every check
+            in the order of validation data.
+        """
+        raise NotImplementedError("Parser does not support validation "
+                                  "info!")
+
     @abc.abstractmethod
     def get_test_data(self):
         """
@@ -151,6 +211,39 @@ class IParser(abc.ABC):
         """
         raise NotImplementedError("Called abstract class method!")
 
+    def get_shared_dataset(self, part="train", name=None, directory=None):
+        """
+        Put arrays of parsed data into shared memory, so worker processes can
+        attach to them by name without copying and pickling.
+
+        :param part: str, optional (default="train").
+            Part of parsed data: "train", "validation" or "test".
+
+        :param name: str, optional (default=None).
+            Name of the shared dataset. None means random unique name.
+
+        :param directory: str, optional (default=None).
+            Directory for shared files, see
+            shared_dataset.get_shared_directory.
+
+        :return: SharedDataset.
+            Shared dataset, it must be unlinked by the caller.
+        """
+        raise NotImplementedError("Parser does not support shared "
+                                  "datasets!")
+
+    def get_test_candidates(self):
+        """
+        Group test samples by days and get candidate goods for every group,
+        so model can score only goods from the day menu.
+
+        :return: list, None.
+            List of pairs with indices of test samples and sorted np.ndarray
+            of candidate good ids (None if all goods are candidates). None
+            means that parser does not group test data.
+        """
+        return None
+
 
 class SimpleParser:
 
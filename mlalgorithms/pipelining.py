@@ -0,0 +1,170 @@
+import os
+import queue
+import threading
+
+
+# Marker of the end of data in queues between threads.
+_END = object()
+
+
+def read_csv(filepath_or_buffer, **kwargs):
+    """
+    Read CSV file, already read data frames are returned as is.
+
+    :param filepath_or_buffer: str, pathlib.Path, py._path.local.LocalPath,
+        pd.DataFrame or any object with a read() method.
+        Input data.
+
+    :param kwargs: dict, optional(default={}).
+        Passes additional arguments to the pd.read_csv method.
+
+    :return: pd.DataFrame.
+        Read data.
+    """
+    import pandas as pd
+
+    if isinstance(filepath_or_buffer, pd.DataFrame):
+        return filepath_or_buffer
+    return pd.read_csv(filepath_or_buffer, **kwargs)
+
+
+def read_csv_chunks(filepath_or_buffer, chunk_size):
+    """
+    Read CSV file by chunks of rows, already read data frames are split into
+    chunks.
+
+    :param filepath_or_buffer: str, pathlib.Path, py._path.local.LocalPath,
+        pd.DataFrame or any object with a read() method.
+        Input data.
+
+    :param chunk_size: int.
+        Number of rows in one chunk.
+
+    :return: iterator.
+        Iterator over pd.DataFrame chunks.
+    """
+    import pandas as pd
+
+    if isinstance(filepath_or_buffer, pd.DataFrame):
+        for begin in range(0, len(filepath_or_buffer), chunk_size):
+            yield filepath_or_buffer.iloc[begin:begin + chunk_size]\
+                .reset_index(drop=True)
+        return
+
+    yield from pd.read_csv(filepath_or_buffer, chunksize=chunk_size)
+
+
+def prefetch(iterable, buffer_size=1):
+    """
+    Produce items of iterable on background thread, so the next item is
+    prepared while the current one is processed. Exceptions of the producer
+    are raised in the consumer.
+
+    :param iterable: iterable.
+        Items to produce, e.g. chunks of input file.
+
+    :param buffer_size: int, optional (default=1).
+        Maximal number of items prepared in advance.
+
+    :return: iterator.
+        Iterator over items in the same order.
+    """
+    items = queue.Queue(maxsize=buffer_size)
+
+    def produce():
+        try:
+            for item in iterable:
+                items.put((item, None))
+        except Exception as e:
+            items.put((None, e))
+            return
+        items.put((_END, None))
+
+    # Producer is started right now, not on the first request of item.
+    # Daemon thread does not block exit if consumer stops early.
+    threading.Thread(target=produce, daemon=True).start()
+    return _consume(items)
+
+
+def _consume(items):
+    while True:
+        item, error = items.get()
+        if error is not None:
+            raise error
+        if item is _END:
+            return
+        yield item
+
+
+class AsyncCSVWriter:
+
+    def __init__(self, output_filename, buffer_size=2):
+        """
+        Writer of data frames to one CSV file on background thread. Header is
+        written with the first data frame. Use it as context manager, the
+        file is completed on exit.
+
+        :param output_filename: str, file or buffer.
+            Filename to output.
+
+        :param buffer_size: int, optional (default=2).
+            Maximal number of data frames waiting for writing, write blocks
+            if writer falls behind.
+        """
+        self.output_filename = output_filename
+        self._frames = queue.Queue(maxsize=buffer_size)
+        self._error = None
+        self._thread = None
+
+    def _write_frames(self, output_stream):
+        # Queue is drained after an error too, so write never blocks.
+        header = True
+        while True:
+            df = self._frames.get()
+            if df is _END:
+                return
+            if self._error is not None:
+                continue
+            try:
+                df.to_csv(output_stream, header=header, index=False)
+            except Exception as e:
+                self._error = e
+            header = False
+
+    def _run(self):
+        if not isinstance(self.output_filename, (str, os.PathLike)):
+            self._write_frames(self.output_filename)
+            return
+
+        try:
+            output_stream = open(self.output_filename, "w", newline="")
+        except Exception as e:
+            self._error = e
+            output_stream = None
+        try:
+            self._write_frames(output_stream)
+        finally:
+            if output_stream is not None:
+                output_stream.close()
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._run)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._frames.put(_END)
+        self._thread.join()
+        if exc_type is None and self._error is not None:
+            raise self._error
+
+    def write(self, df):
+        """
+        Queue data frame for writing.
+
+        :param df: pd.DataFrame.
+            Rows to append to the file.
+        """
+        if self._error is not None:
+            raise self._error
+        self._frames.put(df)
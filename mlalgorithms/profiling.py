@@ -0,0 +1,182 @@
+import contextlib
+import cProfile
+import os
+import os.path
+import threading
+import time
+import tracemalloc
+
+from . import checks
+
+
+SUMMARY_FILENAME = "summary.txt"
+
+
+class StageProfiler:
+
+    def __init__(self, output_dir="profiles", top_allocations=10,
+                 trace_allocations=True):
+        """
+        Profiler of pipeline stages: CPU profile, time and peak allocations
+        are collected for every stage separately.
+
+        :param output_dir: str, optional (default="profiles").
+            Directory to write profiles and summary.
+
+        :param top_allocations: int, optional (default=10).
+            Number of top allocation sites of every stage in summary.
+
+        :param trace_allocations: bool, optional (default=True).
+            Trace allocations with tracemalloc. Tracing slows down the
+            pipeline, switch it off to measure time only.
+        """
+        self.output_dir = output_dir
+        checks.check_types(self.output_dir, str, var_name="output_dir")
+
+        self.top_allocations = top_allocations
+        checks.check_types(self.top_allocations, int,
+                           var_name="top_allocations")
+        checks.check_value(self.top_allocations, 0, None,
+                           var_name="top_allocations")
+
+        self.trace_allocations = trace_allocations
+        checks.check_types(self.trace_allocations, bool,
+                           var_name="trace_allocations")
+
+        # Stage names in order of the first call and their statistics. Stages
+        # are entered only from the main thread, so the active stage is not
+        # shared with background threads of reading and writing.
+        self.stages = dict()
+        self._active_stage = None
+
+    @staticmethod
+    def _create_stats():
+        return {
+            "calls": 0,
+            "time": 0.0,
+            "peak_memory": 0,
+            "profile": cProfile.Profile(),
+            "allocations": []
+        }
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """
+        Profile code inside the context as the stage. Repeated calls of the
+        stage are accumulated. Nested stages are counted in the outer one.
+        Stages must be entered from the main thread, stages entered from
+        other threads are not profiled. CPU profile contains only the main
+        thread, but allocations of background threads are traced.
+
+        :param name: str.
+            Stage name.
+        """
+        if (self._active_stage is not None or
+                threading.current_thread() is not threading.main_thread()):
+            yield
+            return
+
+        stats = self.stages.setdefault(name, self._create_stats())
+        self._active_stage = name
+
+        started_tracing = False
+        start_memory = 0
+        if self.trace_allocations:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            else:
+                # Traces of the caller are kept, only the peak is reset. Before
+                # Python 3.9 the peak could be reached before the stage.
+                if hasattr(tracemalloc, "reset_peak"):
+                    tracemalloc.reset_peak()
+                start_memory = tracemalloc.get_traced_memory()[0]
+
+        start = time.perf_counter()
+        stats["profile"].enable()
+        try:
+            yield
+        finally:
+            stats["profile"].disable()
+            stats["time"] += time.perf_counter() - start
+            stats["calls"] += 1
+
+            if self.trace_allocations:
+                stats["peak_memory"] = max(
+                    stats["peak_memory"],
+                    tracemalloc.get_traced_memory()[1] - start_memory
+                )
+                snapshot = tracemalloc.take_snapshot().filter_traces([
+                    tracemalloc.Filter(False, tracemalloc.__file__)
+                ])
+                stats["allocations"] = snapshot.statistics("lineno")[
+                    :self.top_allocations
+                ]
+                if started_tracing:
+                    tracemalloc.stop()
+
+            self._active_stage = None
+
+    def summary(self):
+        """
+        Format table of stages with number of calls, time and peak traced
+        memory, and top allocation sites alive at the end of every stage.
+
+        :return: str.
+            Summary table.
+        """
+        lines = [f"{'stage':<12}{'calls':>8}{'time, s':>12}"
+                 f"{'peak, MB':>12}"]
+        for name, stats in self.stages.items():
+            lines.append(f"{name:<12}{stats['calls']:>8}"
+                         f"{stats['time']:>12.4f}"
+                         f"{stats['peak_memory'] / 2 ** 20:>12.2f}")
+
+        for name, stats in self.stages.items():
+            if not stats["allocations"]:
+                continue
+            lines.append("")
+            lines.append(f"Top allocation sites of {name}:")
+            for statistic in stats["allocations"]:
+                frame = statistic.traceback[0]
+                lines.append(f"  {frame.filename}:{frame.lineno} "
+                             f"{statistic.size / 2 ** 10:.1f}KB "
+                             f"in {statistic.count} blocks")
+        return "\n".join(lines)
+
+    def dump(self):
+        """
+        Write CPU profile of every stage to <stage>.prof file, which can be
+        read by pstats or snakeviz, and summary to summary.txt.
+
+        :return: str.
+            Summary table.
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        for name, stats in self.stages.items():
+            stats["profile"].dump_stats(os.path.join(self.output_dir,
+                                                     f"{name}.prof"))
+
+        summary = self.summary()
+        with open(os.path.join(self.output_dir, SUMMARY_FILENAME), "w") as f:
+            f.write(summary + "\n")
+        return summary
+
+
+@contextlib.contextmanager
+def profile_stage(profiler, name):
+    """
+    Profile stage if profiler is passed, otherwise do nothing.
+
+    :param profiler: StageProfiler, None.
+        Profiler of the pipeline.
+
+    :param name: str.
+        Stage name.
+    """
+    if profiler is None:
+        yield
+        return
+
+    with profiler.stage(name):
+        yield
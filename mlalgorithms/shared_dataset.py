@@ -0,0 +1,207 @@
+import json
+import os
+import os.path
+import shutil
+import tempfile
+import uuid
+
+import numpy as np
+from scipy import sparse
+
+from . import checks
+
+
+# Memory-backed file system, files in it are shared pages of RAM.
+SHARED_MEMORY_DIR = "/dev/shm"
+
+NAME_PREFIX = "mlalgorithms_"
+META_FILENAME = "meta.json"
+
+
+def get_shared_directory(directory=None):
+    """
+    Get directory for shared dataset files.
+
+    :param directory: str, optional (default=None).
+        Directory to use. None means /dev/shm if it is available, otherwise
+        temporary directory.
+
+    :return: str.
+        Directory name.
+    """
+    if directory is not None:
+        return directory
+    if (os.path.isdir(SHARED_MEMORY_DIR) and
+            os.access(SHARED_MEMORY_DIR, os.W_OK)):
+        return SHARED_MEMORY_DIR
+    return tempfile.gettempdir()
+
+
+def _split_csr(prefix, matrix, arrays):
+    matrix = sparse.csr_matrix(matrix)
+    arrays[f"{prefix}_data"] = matrix.data
+    arrays[f"{prefix}_indices"] = matrix.indices
+    arrays[f"{prefix}_indptr"] = matrix.indptr
+    return list(matrix.shape)
+
+
+class SharedDataset:
+
+    def __init__(self, name, directory=None):
+        """
+        Attach to the dataset which was created by SharedDataset.create.
+        Arrays are memory-mapped read only, so attaching does not copy data.
+        Pickled dataset contains only its name, so it can be passed to
+        worker processes.
+
+        :param name: str.
+            Name of the dataset.
+
+        :param directory: str, optional (default=None).
+            Directory with shared datasets, see get_shared_directory.
+        """
+        checks.check_types(name, str, var_name="name")
+
+        self.name = name
+        self.directory = get_shared_directory(directory)
+        self.path = os.path.join(self.directory, NAME_PREFIX + self.name)
+
+        with open(os.path.join(self.path, META_FILENAME), "r") as f:
+            self._meta = json.load(f)
+
+        self._arrays = dict()
+        for array_name, array_meta in self._meta["arrays"].items():
+            shape = tuple(array_meta["shape"])
+            if np.prod(shape) == 0:
+                # Empty files can not be memory-mapped.
+                self._arrays[array_name] = np.zeros(shape,
+                                                    array_meta["dtype"])
+                continue
+            self._arrays[array_name] = np.memmap(
+                os.path.join(self.path, f"{array_name}.bin"),
+                dtype=array_meta["dtype"], mode="r", shape=shape
+            )
+
+    @classmethod
+    def create(cls, samples=None, labels=None, chknums=None, menus=None,
+               menu_ids=None, name=None, directory=None):
+        """
+        Write arrays of parsed data into shared files and attach to them.
+
+        :param samples: array-like, optional (default=None).
+            Samples matrix.
+
+        :param labels: array-like, sparse matrix, optional (default=None).
+            Interim labels, they are stored as CSR matrix.
+
+        :param chknums: array-like, optional (default=None).
+            Chknums of samples.
+
+        :param menus: array-like, sparse matrix, optional (default=None).
+            Menus of days with days in rows and goods in columns, stored as
+            CSR matrix.
+
+        :param menu_ids: array-like, optional (default=None).
+            Row of menus matrix for every sample.
+
+        :param name: str, optional (default=None).
+            Name of the dataset. None means random unique name.
+
+        :param directory: str, optional (default=None).
+            Directory with shared datasets, see get_shared_directory.
+
+        :return: SharedDataset.
+            Attached dataset.
+        """
+        if name is None:
+            name = uuid.uuid4().hex
+        checks.check_types(name, str, var_name="name")
+
+        arrays = dict()
+        meta = {"arrays": dict()}
+        if samples is not None:
+            arrays["samples"] = np.asarray(samples)
+        if labels is not None:
+            meta["labels_shape"] = _split_csr("labels", labels, arrays)
+        if chknums is not None:
+            arrays["chknums"] = np.asarray(chknums)
+        if menus is not None:
+            meta["menus_shape"] = _split_csr("menus", menus, arrays)
+        if menu_ids is not None:
+            arrays["menu_ids"] = np.asarray(menu_ids, dtype=np.int64)
+
+        path = os.path.join(get_shared_directory(directory),
+                            NAME_PREFIX + name)
+        os.makedirs(path)
+        for array_name, array in arrays.items():
+            checks.check_equality(array.dtype.hasobject, False,
+                                  message=f"Array {array_name} has objects "
+                                          f"which can not be shared")
+            meta["arrays"][array_name] = {
+                "dtype": array.dtype.str,
+                "shape": list(array.shape)
+            }
+            if array.size == 0:
+                continue
+            shared_array = np.memmap(
+                os.path.join(path, f"{array_name}.bin"),
+                dtype=array.dtype, mode="w+", shape=array.shape
+            )
+            shared_array[...] = array
+            shared_array.flush()
+            del shared_array
+
+        # Meta file is written last, so dataset can not be attached before
+        # all arrays are written.
+        meta_filename = os.path.join(path, META_FILENAME)
+        with open(meta_filename + ".tmp", "w") as f:
+            json.dump(meta, f)
+        os.replace(meta_filename + ".tmp", meta_filename)
+
+        return cls(name, directory)
+
+    def __reduce__(self):
+        return type(self), (self.name, self.directory)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.unlink()
+
+    def _get_csr(self, prefix):
+        if f"{prefix}_shape" not in self._meta:
+            return None
+        return sparse.csr_matrix(
+            (self._arrays[f"{prefix}_data"],
+             self._arrays[f"{prefix}_indices"],
+             self._arrays[f"{prefix}_indptr"]),
+            shape=tuple(self._meta[f"{prefix}_shape"]), copy=False
+        )
+
+    @property
+    def samples(self):
+        return self._arrays.get("samples")
+
+    @property
+    def labels(self):
+        return self._get_csr("labels")
+
+    @property
+    def chknums(self):
+        return self._arrays.get("chknums")
+
+    @property
+    def menus(self):
+        return self._get_csr("menus")
+
+    @property
+    def menu_ids(self):
+        return self._arrays.get("menu_ids")
+
+    def unlink(self):
+        """
+        Remove shared files of the dataset. Already attached arrays stay
+        valid until they are deleted.
+        """
+        shutil.rmtree(self.path, ignore_errors=True)
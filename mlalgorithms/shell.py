@@ -1,27 +1,35 @@
 import pickle
 import os.path
 
-import numpy as np
-import pandas as pd
+from .logger import (decor_class_logging_error_and_time, setup_logging,
+                     is_logging_configured, get_logger)
 
-from .logger import decor_class_logging_error_and_time, setup_logging
-
-from .tester import Tester
-
-from .parsers.parser import IParser
-from .parsers.common_parser import CommonParser
 from .parsers.config_parsers import ConfigParser
-
-from .models.model import IModel
+from .profiling import StageProfiler, profile_stage
 
 from . import checks
 
 
+# ATTENTION: heavy dependencies (numpy, pandas, sklearn) and the tester,
+# parser and model modules are imported lazily inside Shell methods, so
+# "import mlalgorithms.shell" stays cheap and has no side effects.
+
 file_path = os.path.abspath(os.path.dirname(__file__))
 ml_config_path = os.path.join(file_path, "ml_config.json")
 log_config_path = os.path.join(file_path, "log_config.json")
 
-setup_logging(log_config_path)
+
+def init_logging(config_filename=log_config_path):
+    """
+    Setup library logging if it has not been set up yet. Called on the first
+    Shell construction, can be called explicitly to configure logging
+    earlier.
+
+    :param config_filename: str, optional (default=log_config_path).
+        File name of the logger config.
+    """
+    if not is_logging_configured():
+        setup_logging(config_filename)
 
 
 @decor_class_logging_error_and_time()
@@ -38,8 +46,13 @@ class Shell:
         :param existing_parsed_json_dict: dict, optional (default=None).
             If config file was parsed, you can pass it to this class.
         """
+        init_logging()
+
+        from .tester import Tester
+
         self._validation_labels = None
         self._predictions = None
+        self._model_info = dict()
         self._config_parser = ConfigParser(existing_parsed_json_dict,
                                            ml_config_path)
         self._tester = Tester(
@@ -47,6 +60,25 @@ class Shell:
             **self._config_parser.get_tester_params()
         )
 
+        # Optimised mode is set by config of every shell in both directions,
+        # so optimised config does not leak into later shells of the process.
+        # Environment variable switches it on for all shells.
+        checks.set_optimized(
+            bool(self._config_parser.get("optimized", False)) or
+            checks.OPTIMIZED_BY_ENVIRONMENT
+        )
+
+        # Profiling mode collects CPU profile and allocations of every
+        # pipeline stage, see dump_profile.
+        self._profiler = None
+        profiling_params = self._config_parser.get("profiling")
+        if profiling_params and profiling_params.get("enabled", False):
+            self._profiler = StageProfiler(
+                profiling_params.get("output_dir", "profiles"),
+                profiling_params.get("top_allocations", 10),
+                profiling_params.get("trace_allocations", True)
+            )
+
         self._model_parameters = self._config_parser.get_params_for("model")
         self._parser_parameters = self._config_parser.get_params_for("parser")
 
@@ -81,10 +113,25 @@ class Shell:
         """
         return self._predictions
 
+    @property
+    def model_info(self):
+        """
+        Get information about train data of loaded model: dataset statistics
+        and storage format of labels.
+
+        :return: dict.
+            Dict with "dataset_stats" and "label_format" keys or empty dict
+            if model was saved without this information.
+        """
+        return self._model_info
+
     def _check_interfaces(self):
         """
         Check parser and model classes on the according interfaces.
         """
+        from .parsers.parser import IParser
+        from .models.model import IModel
+
         checks.check_inheritance(self._parser, IParser)
         checks.check_inheritance(self._model, IModel)
 
@@ -102,9 +149,14 @@ class Shell:
         :return: list.
             Right predictions without inconsistencies with the menu.
         """
+        # Every daily menu is converted to set only once.
+        menu_sets = dict()
         for chknum, i in zip(chknums, range(len(predictions))):
             daily_menu = self._parser.get_menu_on_day_by_chknum(chknum)
-            predictions[i] = ([x for x in predictions[i] if x in daily_menu])
+            menu_set = menu_sets.get(id(daily_menu))
+            if menu_set is None:
+                menu_set = menu_sets[id(daily_menu)] = set(daily_menu)
+            predictions[i] = ([x for x in predictions[i] if x in menu_set])
 
     def _process_empty_predictions(self, predictions):
         """
@@ -123,20 +175,49 @@ class Shell:
         Format raw predictions, process empty predictions and remove extra
         items from predictions.
         """
+        import numpy as np
+
         if self._predictions is None:
             return
 
-        self._predictions = [x.tolist() for x in self._predictions]
-
-        self._predictions = [[int(round(x)) for x in lst]
-                             for lst in self._predictions]
-        self._predictions = [CommonParser.to_final_label(x)
-                             for x in self._predictions]
+        # np.rint rounds half to even as built-in round does.
+        self._predictions = [
+            self._parser.to_final_label(np.rint(x).astype(np.int64))
+            for x in self._predictions
+        ]
 
         self._process_empty_predictions(self._predictions)
         self._format_predictions_by_menu(self._parser.chknums,
                                          self._predictions)
 
+    def _rank_predictions(self, raw_predictions):
+        """
+        Order goods of every formatted prediction by raw scores of the model,
+        the highest score first. Goods with equal scores keep their order.
+
+        :param raw_predictions: list, np.ndarray.
+            Predictions returned by predict method of the model before
+            formatting.
+        """
+        import numpy as np
+
+        from . import kernels
+
+        values, offsets = kernels.flatten(self._predictions)
+        rows = np.repeat(np.arange(len(self._predictions)), np.diff(offsets))
+        if isinstance(raw_predictions, np.ndarray):
+            scores = raw_predictions[rows, values]
+        else:
+            scores = np.concatenate([np.zeros(0)] + [
+                np.asarray(raw)[prediction] for raw, prediction
+                in zip(raw_predictions, self._predictions)
+            ])
+
+        # Sort is stable, rows stay in the same order.
+        values = values[np.lexsort((-scores, rows))].tolist()
+        self._predictions = [values[begin:end] for begin, end
+                             in zip(offsets[:-1], offsets[1:])]
+
     def _concat_predictions_with_chknums(self):
         """
         Concat results of prediction with chknums for output.
@@ -144,12 +225,15 @@ class Shell:
         :return: pd.DataFrame.
             Formatted predictions.
         """
-        formatted_output = [{
-                "chknum": chknum,
-                "pred": " ".join(str(x) for x in pred)
-            } for chknum, pred in zip(self._parser.chknums, self._predictions)
-        ]
-        return pd.DataFrame(formatted_output, dtype=np.int64)
+        import numpy as np
+        import pandas as pd
+
+        # Only chknum is integer, predictions are strings of good ids.
+        return pd.DataFrame({
+            "chknum": np.asarray(self._parser.chknums, dtype=np.int64),
+            "pred": [" ".join(str(x) for x in pred)
+                     for pred in self._predictions]
+        }, columns=["chknum", "pred"])
 
     def is_debug(self, flag_name="debug"):
         """
@@ -163,45 +247,44 @@ class Shell:
         """
         return self._config_parser[flag_name]
 
-    def fit(self, filepath_or_buffer):
+    def _get_fit_kwargs(self):
         """
-        Train model on input dataset.
+        Get additional arguments for fit method of selected model.
 
-        :param filepath_or_buffer: str, pathlib.Path, py._path.local.LocalPath
-            or any object with a read() method (such as a file handle or
-            StringIO).
-            The string could be a URL. Valid URL schemes include http, ftp, s3,
-            and file. For file URLs, a host is expected. For instance, a local
-            file could be file://localhost/path/to/table.csv.
+        :return: dict.
+            Keyword arguments for fit and partial_fit methods of model.
         """
-        self._parser.parse_train_data(filepath_or_buffer)
-
-        train_samples, train_labels = self._parser.get_train_data()
         if (self._config_parser["selected_model"] == "MostPopular" or
                 self._config_parser["selected_model"] == "SameAsBefore"):
-            self._model.fit(
-                train_samples, train_labels,
-                most_popular_goods=self._parser.to_interim_label(
+            return {
+                "most_popular_goods": self._parser.to_interim_label(
                     self._parser.most_popular_good_ids
                 )
-            )
+            }
         elif (self._config_parser["selected_model"] ==
               "MostPopularFromOwnOrders"):
-            self._model.fit(
-                train_samples, train_labels,
-                most_popular_goods=self._parser.to_interim_label(
+            return {
+                "most_popular_goods": self._parser.to_interim_label(
                     self._parser.most_popular_good_ids
                 ),
-                most_popular_good_ids=self._parser.most_popular_good_ids,
-                max_good_id=self._parser.max_good_id()
-            )
-        else:
-            self._model.fit(train_samples, train_labels)
+                "most_popular_good_ids": self._parser.most_popular_good_ids,
+                "max_good_id": self._parser.max_good_id()
+            }
+        return {}
+
+    def predict_validation(self):
+        """
+        Make predictions on validation part of train dataset. Called by fit,
+        results can be checked by test method.
+        """
+        if self._parser_parameters["params"]["proportion"] == 1.0:
+            return
 
-        if self._parser_parameters["params"]["proportion"] != 1.0:
+        with profile_stage(self._profiler, "labels"):
             validation_samples, self._validation_labels = \
                 self._parser.get_validation_data()
 
+        with profile_stage(self._profiler, "predict"):
             if self._config_parser["selected_model"] == "TestModel":
                 self._predictions = self._model.predict(
                     validation_samples,
@@ -210,7 +293,192 @@ class Shell:
             else:
                 self._predictions = self._model.predict(validation_samples)
 
+        # Ranking metrics of evaluate method use order of goods in validation
+        # predictions, so goods are ordered by confidence of the model.
+        with profile_stage(self._profiler, "format"):
+            raw_predictions = self._predictions
             self._format_predictions()
+            self._rank_predictions(raw_predictions)
+
+    def _get_model_cache(self, filepath_or_buffer):
+        """
+        Get model cache and key of the entry for input dataset if cache is
+        switched on in config.
+
+        :return: tuple.
+            Pair of ModelCache and key or pair of None if cache is not used.
+        """
+        cache_params = self._config_parser.get("model_cache")
+        if not cache_params or not cache_params.get("enabled", False):
+            return None, None
+
+        from .model_cache import ModelCache, file_fingerprint
+
+        fingerprint = file_fingerprint(filepath_or_buffer)
+        if fingerprint is None:
+            return None, None
+
+        cache = ModelCache(cache_params.get("directory"),
+                           cache_params.get("max_size_mb", 1024))
+        key = cache.get_key(self._model_parameters, self._parser_parameters,
+                            fingerprint)
+        return cache, key
+
+    def fit(self, filepath_or_buffer):
+        """
+        Train model on input dataset. If model cache is switched on in config
+        and the same model was trained on the same data, trained model and
+        parser state are loaded from cache.
+
+        :param filepath_or_buffer: str, pathlib.Path, py._path.local.LocalPath
+            or any object with a read() method (such as a file handle or
+            StringIO).
+            The string could be a URL. Valid URL schemes include http, ftp, s3,
+            and file. For file URLs, a host is expected. For instance, a local
+            file could be file://localhost/path/to/table.csv.
+            Already read pd.DataFrame is accepted too, as well as directory
+            or glob pattern of daily CSV partitions.
+        """
+        cache, key = self._get_model_cache(filepath_or_buffer)
+        cached = cache.load(key) if cache is not None else None
+        if cached is not None:
+            get_logger().info(f"Trained model is loaded from cache: {key}.")
+            self._model, self._parser = cached
+            self.predict_validation()
+            return
+
+        with profile_stage(self._profiler, "parse"):
+            self._parser.parse_train_data(filepath_or_buffer)
+        self._fit_parsed_data()
+
+        if cache is not None:
+            cache.save(key, self._model, self._parser)
+
+        self.predict_validation()
+
+    def _fit_parsed_data(self):
+        with profile_stage(self._profiler, "labels"):
+            train_samples, train_labels = self._parser.get_train_data()
+        with profile_stage(self._profiler, "fit"):
+            self._model.fit(train_samples, train_labels,
+                            **self._get_fit_kwargs())
+
+    def parse_train_data(self, filepath_or_buffer):
+        """
+        Parse input dataset without training, so one parsed dataset can be
+        used by several shells, see fit_parsed.
+
+        :param filepath_or_buffer: str, pathlib.Path, py._path.local.LocalPath
+            or any object accepted by fit method.
+            Train data.
+
+        :return: IParser.
+            Parser with parsed train data.
+        """
+        with profile_stage(self._profiler, "parse"):
+            self._parser.parse_train_data(filepath_or_buffer)
+        return self._parser
+
+    def fit_parsed(self, parser, predict_validation=True):
+        """
+        Train model on already parsed train data.
+
+        :param parser: IParser.
+            Parser with parsed train data, e.g. result of parse_train_data
+            method of other shell.
+
+        :param predict_validation: bool, optional (default=True).
+            Make predictions on validation data after training.
+        """
+        self._parser = parser
+        self._fit_parsed_data()
+
+        if predict_validation:
+            self.predict_validation()
+
+    def supports_partial_fit(self):
+        """
+        Check whether model supports incremental training.
+
+        :return: bool.
+            True if model overrides partial_fit method.
+        """
+        from .models.model import IModel
+
+        return type(self._model).partial_fit is not IModel.partial_fit
+
+    def partial_fit(self, filepath_or_buffer, validate=True):
+        """
+        Update trained model with new rows of train data, e.g. with checks of
+        the next day. Only new rows are parsed and passed into model, so model
+        must support incremental training. Test data could be parsed after
+        previous fit, train data is restored before update.
+
+        :param filepath_or_buffer: str, pathlib.Path, py._path.local.LocalPath
+            or any object with a read() method (such as a file handle or
+            StringIO).
+            The string could be a URL. Valid URL schemes include http, ftp, s3,
+            and file. For file URLs, a host is expected. For instance, a local
+            file could be file://localhost/path/to/table.csv.
+            Already read pd.DataFrame is accepted too.
+
+        :param validate: bool, optional (default=True).
+            Predict the whole validation set again, so test method evaluates
+            updated model. Cost of it does not depend on the size of update,
+            set False when many updates are applied in a row.
+        """
+        with profile_stage(self._profiler, "parse"):
+            self._parser.parse_partial_train_data(filepath_or_buffer)
+
+        with profile_stage(self._profiler, "labels"):
+            train_samples, train_labels = \
+                self._parser.get_partial_train_data()
+        with profile_stage(self._profiler, "fit"):
+            self._model.partial_fit(train_samples, train_labels,
+                                    **self._get_fit_kwargs())
+
+        if validate:
+            self.predict_validation()
+        else:
+            self._predictions = None
+
+    def _predict_test_data(self, pool=None):
+        """
+        Make predictions on parsed test data. Checks are grouped by days and
+        model gets menu of the day as candidate goods for every group. If
+        "predict_n_jobs" in config is not equal to 1, shards of test data are
+        predicted in the pool of worker processes.
+
+        :param pool: multiprocessing.pool.Pool, optional (default=None).
+            Pool of worker processes from parallel.create_pool. None means
+            that the pool is created for this call if it is needed.
+
+        :return: list.
+            Raw predictions in the order of test samples.
+        """
+        test_samples = self._parser.get_test_data()
+        candidate_groups = self._parser.get_test_candidates()
+
+        n_jobs = self._config_parser.get("predict_n_jobs", 1)
+        if n_jobs != 1:
+            from .parallel import predict_in_parallel
+
+            return predict_in_parallel(
+                self._model, test_samples, candidate_groups, n_jobs,
+                self._config_parser.get("predict_shard_size", 10000), pool
+            )
+
+        if candidate_groups is None:
+            return self._model.predict(test_samples)
+
+        predictions = [None] * len(test_samples)
+        for indices, candidates in candidate_groups:
+            group_predictions = self._model.predict(
+                [test_samples[i] for i in indices], candidates=candidates
+            )
+            for i, prediction in zip(indices, group_predictions):
+                predictions[i] = prediction
+        return predictions
 
     def predict(self, filepath_or_buffer_set, filepath_or_buffer_menu):
         """
@@ -222,6 +490,7 @@ class Shell:
             The string could be a URL. Valid URL schemes include http, ftp, s3,
             and file. For file URLs, a host is expected. For instance, a local
             file could be file://localhost/path/to/table.csv.
+            Already read pd.DataFrame is accepted too.
 
         :param filepath_or_buffer_menu: str, pathlib.Path,
             py._path.local.LocalPath or any object with a read() method
@@ -229,31 +498,172 @@ class Shell:
             The string could be a URL. Valid URL schemes include http, ftp, s3,
             and file. For file URLs, a host is expected. For instance, a local
             file could be file://localhost/path/to/table.csv.
+            Already read pd.DataFrame is accepted too.
         """
-        self._parser.parse_test_data(filepath_or_buffer_set,
-                                     filepath_or_buffer_menu)
+        with profile_stage(self._profiler, "parse"):
+            self._parser.parse_test_data(filepath_or_buffer_set,
+                                         filepath_or_buffer_menu)
 
-        self._predictions = self._model.predict(self._parser.get_test_data())
-        self._format_predictions()
+        with profile_stage(self._profiler, "predict"):
+            self._predictions = self._predict_test_data()
+        with profile_stage(self._profiler, "format"):
+            self._format_predictions()
 
-    def test(self):
+    def predict_to_file(self, filepath_or_buffer_set,
+                        filepath_or_buffer_menu, output_filename="result.csv"):
+        """
+        Make predictions on input dataset by chunks and output them to
+        filename. Reading of the next test chunk and writing of formatted
+        predictions run on background threads while the current chunk is
+        predicted. Predictions are not kept in memory, so test method can
+        not be used after this method. If "predict_n_jobs" in config is not
+        equal to 1, worker processes are forked once before the threads are
+        started.
+
+        :param filepath_or_buffer_set: str, pathlib.Path,
+            py._path.local.LocalPath or any object accepted by predict method.
+            Test set, it is read by chunks of "predict_chunk_size" rows from
+            config.
+
+        :param filepath_or_buffer_menu: str, pathlib.Path,
+            py._path.local.LocalPath or any object accepted by predict method.
+            Menu, it is read concurrently with the first chunk of test set.
+
+        :param output_filename: str, file or buffer,
+            optional (default="result.csv").
+            Filename to output.
+        """
+        import concurrent.futures
+
+        from .pipelining import (AsyncCSVWriter, prefetch, read_csv,
+                                 read_csv_chunks)
+
+        chunk_size = self._config_parser.get("predict_chunk_size", 100000)
+        checks.check_types(chunk_size, int, var_name="predict_chunk_size")
+        checks.check_value(chunk_size, 0, None, True,
+                           var_name="predict_chunk_size")
+
+        # Process forked while reading or writing thread holds a lock, e.g.
+        # of file or allocator, could hang, so the pool is forked first.
+        pool = None
+        n_jobs = self._config_parser.get("predict_n_jobs", 1)
+        if n_jobs != 1:
+            from .parallel import create_pool
+
+            pool = create_pool(self._model, n_jobs)
+
+        try:
+            with concurrent.futures.ThreadPoolExecutor(1) as executor:
+                future_menu = executor.submit(read_csv,
+                                              filepath_or_buffer_menu)
+                chunks = prefetch(read_csv_chunks(filepath_or_buffer_set,
+                                                  chunk_size))
+                df_menu = future_menu.result()
+
+            with AsyncCSVWriter(output_filename) as writer:
+                for df_set in chunks:
+                    with profile_stage(self._profiler, "parse"):
+                        self._parser.parse_test_data(df_set, df_menu)
+                    with profile_stage(self._profiler, "predict"):
+                        self._predictions = self._predict_test_data(pool)
+                    with profile_stage(self._profiler, "format"):
+                        self._format_predictions()
+                    with profile_stage(self._profiler, "output"):
+                        writer.write(self._concat_predictions_with_chknums())
+        finally:
+            if pool is not None:
+                pool.terminate()
+        self._predictions = None
+
+    def test(self, confidence_interval=None, random_state=None):
         """
         Test prediction quality of algorithm.
 
+        :param confidence_interval: float, optional (default=None).
+            Confidence level of bootstrap interval of the metric, e.g. 0.95.
+            None means that interval is not computed.
+
+        :param random_state: int, optional (default=None).
+            Seed of bootstrap resamples.
+
         :return: tuple (float, float), tuple (None, None).
             Pair of two values from tester class. Or None if nothing to test.
+            If confidence_interval is passed, the first value is pair of
+            metric value and bounds of its confidence interval.
         """
         if self._predictions is None:
             print("Nothing to test!")
             return None, None
 
-        test_result = self._tester.test(self._parser.answers_for_train,
-                                        self._predictions)
-        quality = self._tester.quality_control(self._parser.answers_for_train,
-                                               self._predictions)
+        with profile_stage(self._profiler, "test"):
+            test_result = self._tester.test(
+                self._parser.answers_for_train, self._predictions,
+                confidence_interval=confidence_interval,
+                random_state=random_state
+            )
+            quality = self._tester.quality_control(
+                self._parser.answers_for_train, self._predictions
+            )
 
         return test_result, quality
 
+    def evaluate(self, metric_names=None, k=5):
+        """
+        Test prediction quality of algorithm by several metrics computed in
+        one pass over predictions. Ranking metrics use goods of validation
+        predictions ordered by scores of the model.
+
+        :param metric_names: tuple, optional (default=None).
+            Names of metric classes. None means tester.EVALUATOR_METRICS.
+
+        :param k: int, optional (default=5).
+            Number of top predicted goods for ranking metrics.
+
+        :return: tuple (dict, dict), tuple (None, None).
+            Values of metrics and bool values which define quality of the
+            algorithm by every metric. Or None if nothing to test.
+        """
+        from .tester import Evaluator, EVALUATOR_METRICS
+
+        if self._predictions is None:
+            print("Nothing to test!")
+            return None, None
+
+        if metric_names is None:
+            metric_names = EVALUATOR_METRICS
+
+        evaluator = Evaluator(metric_names, k=k,
+                              **self._config_parser.get_tester_params())
+        with profile_stage(self._profiler, "test"):
+            test_result = evaluator.test(self._parser.answers_for_train,
+                                         self._predictions)
+            quality = evaluator.quality_control(
+                self._parser.answers_for_train, self._predictions
+            )
+
+        return test_result, quality
+
+    def evaluate_slices(self):
+        """
+        Evaluate predictions on validation data by slices: scores of every
+        check, mean scores of every person, day and basket size and hit
+        rates of every good.
+
+        :return: dict, None.
+            Dict with pd.DataFrame values, see
+            evaluation.sliced_evaluation. Or None if nothing to evaluate.
+        """
+        from .evaluation import sliced_evaluation
+
+        if self._predictions is None:
+            print("Nothing to evaluate!")
+            return None
+
+        with profile_stage(self._profiler, "test"):
+            return sliced_evaluation(self._parser.answers_for_train,
+                                     self._predictions,
+                                     self._parser.get_validation_info())
+
     def output(self, output_filename="result.csv"):
         """
         Output current prediction to filename.
@@ -266,25 +676,60 @@ class Shell:
             print("Nothing to output!")
             return
 
-        out = self._concat_predictions_with_chknums()
-        out.to_csv(output_filename, index=False)
+        with profile_stage(self._profiler, "output"):
+            out = self._concat_predictions_with_chknums()
+            out.to_csv(output_filename, index=False)
+
+    def dump_profile(self):
+        """
+        Write CPU profiles of pipeline stages and summary with time, peak
+        memory and top allocation sites of every stage. Profiling must be
+        switched on in config.
+
+        :return: str, None.
+            Summary table or None if profiling is switched off.
+        """
+        if self._profiler is None:
+            print("Profiling is switched off!")
+            return None
+        return self._profiler.dump()
 
     def load_model(self, filename="model.mdl"):
         """
-        Load trained model with all parameters from file.
+        Load trained model with all parameters from file. Files with only
+        pickled model, which were saved by older versions, are supported too.
 
         :param filename: str, optional (default="model.mdl").
             File name of model.
         """
         with open(filename, "rb") as input_stream:
-            self._model = pickle.loads(input_stream.read())
+            artifact = pickle.loads(input_stream.read())
+
+        if isinstance(artifact, dict) and "model" in artifact:
+            self._model = artifact["model"]
+            self._model_info = {
+                "dataset_stats": artifact.get("dataset_stats"),
+                "label_format": artifact.get("label_format")
+            }
+            get_logger().info(f"Model is trained on data with statistics "
+                              f"{self._model_info['dataset_stats']} and "
+                              f"{self._model_info['label_format']} labels.")
+        else:
+            self._model = artifact
+            self._model_info = dict()
 
     def save_model(self, filename="model.mdl"):
         """
-        Save trained model with all parameters to file.
+        Save trained model with all parameters to file. Statistics of train
+        data and storage format of labels are saved with the model.
 
         :param filename: str, optional (default="model.mdl").
             File name of model.
         """
+        artifact = {
+            "model": self._model,
+            "dataset_stats": self._parser.dataset_stats,
+            "label_format": self._parser.label_format
+        }
         with open(filename, "wb") as output_stream:
-            output_stream.write(pickle.dumps(self._model))
+            output_stream.write(pickle.dumps(artifact))
@@ -0,0 +1,126 @@
+import pandas as pd
+
+from . import checks
+
+
+class SpaceSavingCounter:
+
+    def __init__(self, capacity=None, decay=1.0):
+        """
+        Bounded memory counter of the most frequent items (Space-Saving
+        algorithm). Counts are updated by chunks of items, counters of
+        different shards can be merged.
+
+        :param capacity: int, optional (default=None).
+            Maximal number of tracked items. None means exact counting of all
+            items.
+
+        :param decay: float, optional (default=1.0).
+            Multiplier of old counts applied before every update, values less
+            than 1.0 make counter follow recent items.
+        """
+        self.capacity = capacity
+        checks.check_types(self.capacity, type(None), int,
+                           var_name="capacity")
+        if self.capacity is not None:
+            checks.check_value(self.capacity, 0, None, True,
+                               var_name="capacity")
+
+        self.decay = decay
+        checks.check_types(self.decay, float, var_name="decay")
+        checks.check_value(self.decay, 0.0, 1.0, True, False,
+                           var_name="decay")
+
+        # Estimated counts sorted in descending order and maximal
+        # overestimation of every count.
+        self.counts = pd.Series(dtype="float64")
+        self.errors = pd.Series(dtype="float64")
+
+    def __len__(self):
+        return len(self.counts)
+
+    def _is_full(self):
+        return self.capacity is not None and len(self) >= self.capacity
+
+    def _floor(self):
+        # Untracked item of full counter could have any count up to the
+        # minimal tracked one.
+        if not self._is_full():
+            return 0.0
+        return float(self.counts.iloc[-1])
+
+    def _merge_counts(self, counts, errors, floor):
+        if self.capacity is None:
+            # Exact counter keeps items in order of their first appearance,
+            # so items with equal counts are ordered like by value_counts.
+            index = self.counts.index.append(
+                counts.index[~counts.index.isin(self.counts.index)]
+            )
+        else:
+            index = self.counts.index.union(counts.index)
+        own_floor = self._floor()
+
+        merged_counts = (self.counts.reindex(index, fill_value=own_floor) +
+                         counts.reindex(index, fill_value=floor))
+        merged_errors = (
+            self.errors.reindex(index, fill_value=own_floor) +
+            errors.reindex(index, fill_value=floor)
+        )
+
+        # Items with equal counts of bounded counter are ordered by
+        # themselves, so result does not depend on order of updates.
+        if self.capacity is not None:
+            merged_counts = merged_counts.sort_index(kind="mergesort")
+        merged_counts = merged_counts.sort_values(ascending=False,
+                                                  kind="mergesort")
+        if self.capacity is not None:
+            merged_counts = merged_counts.head(self.capacity)
+        self.counts = merged_counts
+        self.errors = merged_errors.reindex(merged_counts.index)
+
+    def update(self, items):
+        """
+        Count chunk of items.
+
+        :param items: array-like.
+            Items of the chunk, e.g. column of good ids.
+        """
+        self.update_counts(pd.Series(items).value_counts())
+
+    def update_counts(self, counts):
+        """
+        Add exact counts of chunk of items.
+
+        :param counts: pd.Series.
+            Counts of items of the chunk, e.g. result of value_counts.
+        """
+        if self.decay != 1.0:
+            self.counts *= self.decay
+            self.errors *= self.decay
+
+        counts = counts.astype("float64")
+        self._merge_counts(counts, pd.Series(0.0, index=counts.index), 0.0)
+
+    def merge(self, other):
+        """
+        Add counts of other counter, e.g. counter of another shard of data.
+
+        :param other: SpaceSavingCounter.
+            Counter to merge.
+        """
+        checks.check_types(other, SpaceSavingCounter, var_name="other")
+        self._merge_counts(other.counts, other.errors, other._floor())
+
+    def most_common(self, n=None):
+        """
+        Get the most frequent items.
+
+        :param n: int, optional (default=None).
+            Number of items. None means all tracked items.
+
+        :return: pd.Series.
+            Estimated counts of items in descending order.
+        """
+        if n is None:
+            return self.counts.copy()
+        return self.counts.head(n)
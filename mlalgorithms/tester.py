@@ -4,15 +4,104 @@ import numpy as np
 from sklearn.metrics import mean_squared_error, r2_score
 
 from .models import model
+from . import kernels
+from .evaluation import ranking_scores
 from .parsers.common_parser import CommonParser
+from .parsers.config_parsers import class_registry
 
 from . import checks
 
 
+# Maximal number of elements in one matrix of bootstrap resamples, resamples
+# are drawn by batches to fit into memory.
+BOOTSTRAP_BATCH_ELEMENTS = 2 ** 24
+
+# Metrics computed by Evaluator by default.
+EVALUATOR_METRICS = ("MeanF1Score", "PrecisionAtK", "RecallAtK", "HitRate",
+                     "MeanAveragePrecision")
+
+
+def bootstrap_confidence_interval(scores, confidence=0.95, n_resamples=10000,
+                                  random_state=None):
+    """
+    Calculate percentile bootstrap confidence interval of mean score.
+
+    :param scores: array-like.
+        Score of every check.
+
+    :param confidence: float, optional (default=0.95).
+        Confidence level of the interval.
+
+    :param n_resamples: int, optional (default=10000).
+        Number of bootstrap resamples.
+
+    :param random_state: int, optional (default=None).
+        Seed of random generator.
+
+    :return: tuple (float, float).
+        Lower and upper bounds of the interval.
+    """
+    checks.check_types(confidence, float, var_name="confidence")
+    checks.check_value(confidence, 0.0, 1.0, True, True,
+                       var_name="confidence")
+    checks.check_types(n_resamples, int, var_name="n_resamples")
+    checks.check_value(n_resamples, 0, None, True, var_name="n_resamples")
+
+    scores = np.asarray(scores, dtype=np.float64)
+    n_scores = len(scores)
+    checks.check_value(n_scores, 0, None, True, var_name="len(scores)")
+    random_state = np.random.RandomState(random_state)
+
+    # Scores such as F1 have few distinct values, so resample is drawn as
+    # multinomial counts of the values. It is equivalent to resampling of
+    # checks, but its cost does not depend on number of checks.
+    values, counts = np.unique(scores, return_counts=True)
+    use_counts = len(values) < n_scores
+    width = len(values) if use_counts else n_scores
+    batch_size = max(1, BOOTSTRAP_BATCH_ELEMENTS // width)
+
+    means = []
+    for begin in range(0, n_resamples, batch_size):
+        size = min(batch_size, n_resamples - begin)
+        if use_counts:
+            resampled_counts = random_state.multinomial(
+                n_scores, counts / n_scores, size=size
+            )
+            means.append(resampled_counts.dot(values) / n_scores)
+        else:
+            indices = random_state.randint(n_scores, size=(size, n_scores))
+            means.append(scores[indices].mean(axis=1))
+
+    alpha = (1.0 - confidence) / 2
+    low, high = np.percentile(np.concatenate(means),
+                              [100 * alpha, 100 * (1 - alpha)])
+    return float(low), float(high)
+
+
+def format_labels(validation_labels, predictions):
+    """
+    Transform interim validation labels and predictions to lists of good ids.
+
+    :param validation_labels: list.
+        List of interim known labels.
+
+    :param predictions: list.
+        List of interim predicted labels.
+
+    :return: tuple (tuple, tuple).
+        Formatted validation labels and predictions.
+    """
+    predictions, validation_labels = zip(*[
+        MeanF1Score._format_data(x, y)
+        for x, y in zip(validation_labels, predictions)
+    ])
+    return validation_labels, predictions
+
+
 class Tester:
 
     def __init__(self, metric_name="MeanF1Score", border=0.5,
-                 invert_list=None):
+                 invert_list=None, metric_module_name=__name__):
         """
         Initializing object of main class with testing algorithm.
 
@@ -26,18 +115,24 @@ class Tester:
         :param invert_list: list, optional (default=None).
             List of the metrics name which need to invert comparison with
             border.
+
+        :param metric_module_name: str,
+            optional (default="mlalgorithms.tester").
+            Name of the module or entry point group which stores metric class.
         """
         self._metric_name = metric_name
         checks.check_types(self._metric_name, str, var_name="metric_name")
 
-        class_ = globals()[self._metric_name]
+        class_ = class_registry.get_class(self._metric_name,
+                                          metric_module_name)
         self._metric = class_(border)
         checks.check_inheritance(self._metric, IMetric)
 
         self._invert_list = invert_list
         checks.check_types(self._invert_list, list, var_name="invert_list")
 
-    def test(self, validation_labels, predictions, **kwargs):
+    def test(self, validation_labels, predictions, confidence_interval=None,
+             n_resamples=10000, random_state=None, **kwargs):
         """
         Main testing function.
 
@@ -47,13 +142,36 @@ class Tester:
         :param validation_labels: array-like, sparse matrix.
             Known data.
 
+        :param confidence_interval: float, optional (default=None).
+            Confidence level of bootstrap interval of the metric, e.g. 0.95.
+            None means that only the metric value is returned. Metric must
+            support per-check scores.
+
+        :param n_resamples: int, optional (default=10000).
+            Number of bootstrap resamples.
+
+        :param random_state: int, optional (default=None).
+            Seed of bootstrap resamples.
+
         :param kwargs: dict, optional(default={}).
             Additional arguments for metric test method.
 
-        :return: float.
-            A numerical estimate of the accuracy of the algorithm.
+        :return: float, tuple (float, tuple (float, float)).
+            A numerical estimate of the accuracy of the algorithm or pair of
+            the estimate and bounds of its confidence interval.
         """
-        return self._metric.test(validation_labels, predictions, **kwargs)
+        if confidence_interval is None:
+            return self._metric.test(validation_labels, predictions,
+                                     **kwargs)
+
+        # Metric is the mean of per-check scores, so scores are computed
+        # once for the estimate, the interval and quality control.
+        scores = self._metric.scores(validation_labels, predictions,
+                                     **kwargs)
+        interval = bootstrap_confidence_interval(
+            scores, confidence_interval, n_resamples, random_state
+        )
+        return self._metric.test_scores(scores), interval
 
     def quality_control(self, validation_labels, predictions):
         """
@@ -73,8 +191,115 @@ class Tester:
                                             invert_comparison)
 
 
+class Evaluator:
+
+    def __init__(self, metric_names=EVALUATOR_METRICS, border=0.5,
+                 invert_list=None, k=5, metric_module_name=__name__):
+        """
+        Initializing object which computes several metrics in one pass over
+        predictions.
+
+        :param metric_names: tuple, optional (default=EVALUATOR_METRICS).
+            Names of the metrics, every metric must support per-check scores
+            of evaluation.ranking_scores.
+
+        :param border: float, optional (default=0.5).
+            The accuracy boundary at which the algorithm is considered to be
+            exact, it is the same for all metrics.
+
+        :param invert_list: list, optional (default=None).
+            List of the metrics name which need to invert comparison with
+            border. None means empty list.
+
+        :param k: int, optional (default=5).
+            Number of top predicted goods for ranking metrics.
+
+        :param metric_module_name: str,
+            optional (default="mlalgorithms.tester").
+            Name of the module or entry point group which stores metric
+            classes.
+        """
+        self._invert_list = [] if invert_list is None else invert_list
+        checks.check_types(self._invert_list, list, var_name="invert_list")
+
+        self._k = k
+        self._metrics = dict()
+        for metric_name in metric_names:
+            checks.check_types(metric_name, str, var_name="metric_name")
+            class_ = class_registry.get_class(metric_name,
+                                              metric_module_name)
+            if issubclass(class_, RankingMetric):
+                metric = class_(border, k=k)
+            else:
+                metric = class_(border)
+            checks.check_inheritance(metric, IMetric)
+            if metric.score_name is None:
+                raise ValueError(f"Metric {metric_name} is not supported by "
+                                 f"evaluator.")
+            self._metrics[metric_name] = metric
+        self._result = None
+
+    def test(self, validation_labels, predictions, need_format=False):
+        """
+        Compute all metrics.
+
+        :param validation_labels: list.
+            List of lists with known data.
+
+        :param predictions: list.
+            List of lists with predicted data.
+
+        :param need_format: bool, optional (default=False).
+            Used to define that data is not formatted.
+
+        :return: dict.
+            Metric names and numerical estimates of the accuracy of the
+            algorithm.
+        """
+        if need_format:
+            validation_labels, predictions = format_labels(validation_labels,
+                                                           predictions)
+
+        # Scores of all metrics are computed together, so flattening and
+        # matching of predictions with labels are done only once.
+        scores = ranking_scores(validation_labels, predictions, self._k)
+        self._result = {
+            name: metric.test_scores(scores)
+            for name, metric in self._metrics.items()
+        }
+        return self._result
+
+    def quality_control(self, validation_labels, predictions):
+        """
+        Function to get threshold estimation of the accuracy of the algorithm
+        for every metric.
+
+        :param predictions: array-like, sparse matrix.
+            Predicted data.
+
+        :param validation_labels: array-like, sparse matrix.
+            Known data.
+
+        :return: dict.
+            Metric names and bool values which define quality of the
+            algorithm.
+        """
+        if self._result is None:
+            self.test(validation_labels, predictions)
+
+        return {
+            name: metric.quality_control(validation_labels, predictions,
+                                         name in self._invert_list)
+            for name, metric in self._metrics.items()
+        }
+
+
 class IMetric(abc.ABC):
 
+    # Key of per-check scores in evaluation.ranking_scores result. None
+    # means that metric is not supported by Evaluator.
+    score_name = None
+
     def __init__(self, border):
         """
         Initializing object of testing algorithm's class.
@@ -107,6 +332,47 @@ class IMetric(abc.ABC):
         """
         raise NotImplementedError("Called abstract class method!")
 
+    def scores(self, validation_labels, predictions, **kwargs):
+        """
+        Score of every check, mean of scores is the result of test method.
+        Metrics which support confidence intervals override this method.
+
+        :param predictions: array-like, sparse matrix.
+            Predicted data.
+
+        :param validation_labels: array-like, sparse matrix.
+            Known data.
+
+        :param kwargs: dict.
+            Additional arguments for test method.
+
+        :return: np.ndarray.
+            Score of every check.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support "
+                                  f"per-check scores!")
+
+    def test_scores(self, scores):
+        """
+        Calculate the metric from already computed per-check scores, the
+        value is used by quality control the same as value of test method.
+
+        :param scores: np.ndarray, dict.
+            Score of every check, e.g. result of scores method, or result of
+            evaluation.ranking_scores with scores of all metrics.
+
+        :return: float.
+            A numerical estimate of the accuracy of the algorithm.
+        """
+        if isinstance(scores, dict):
+            if self.score_name is None:
+                raise NotImplementedError(f"{type(self).__name__} does not "
+                                          f"support ranking scores!")
+            scores = scores[self.score_name]
+
+        self._cache = float(scores.sum()) / len(scores)
+        return self._cache
+
     def quality_control(self, validation_labels, predictions,
                         invert_comparison=False):
         """
@@ -160,6 +426,8 @@ class MeanSquaredError(IMetric):
 
 class MeanF1Score(IMetric):
 
+    score_name = "f1"
+
     @staticmethod
     def _format_data(validation_label, prediction):
         """
@@ -267,6 +535,36 @@ class MeanF1Score(IMetric):
             return 0
         return 2 * p * r / (p + r)
 
+    def scores(self, validation_labels, predictions, need_format=False):
+        """
+        F1 score of every check.
+
+        :param validation_labels: list.
+            List of lists with known data.
+
+        :param predictions: list.
+            List of lists with predicted data.
+
+        :param need_format: bool, optional (default=False).
+            Used to define that data is not formatted.
+
+        :return: np.ndarray.
+            F1 score of every check.
+        """
+        if not checks.is_optimized():
+            checks.check_equality(
+                self.conjunction([1, 1, 2, 3, 5], [1, 2, 4, 5]), 3,
+                message="There are error in conjunction method"
+            )
+
+        if need_format:
+            validation_labels, predictions = format_labels(validation_labels,
+                                                           predictions)
+
+        # Scores of all checks are computed by one kernel call instead of
+        # test_check call for every check.
+        return kernels.f1_scores(validation_labels, predictions)
+
     def test(self, validation_labels, predictions, need_format=False):
         """
         Main testing function.
@@ -284,32 +582,113 @@ class MeanF1Score(IMetric):
             A numerical estimate of the accuracy of the algorithm. 1.0 is
             perfect prediction.
         """
-        checks.check_equality(self.conjunction([1, 1, 2, 3, 5],
-                                               [1, 2, 4, 5]), 3,
-                              message="There are error in conjunction method")
-
         num_checks = len(validation_labels)
-        result = [self.test_check(validation_labels[i],
-                                  predictions[i],
-                                  need_format) for i in range(num_checks)]
-        self._cache = sum(result) / num_checks
+        result = self.scores(validation_labels, predictions, need_format)
+        self._cache = float(result.sum()) / num_checks
+        return self._cache
+
+
+class RankingMetric(IMetric):
+
+    def __init__(self, border, k=5):
+        """
+        Initializing object of ranking metric which is computed on top k
+        predicted goods. Predicted goods are ranked by their order in the
+        prediction.
+
+        :param border: float.
+            The accuracy boundary at which the algorithm is considered to be
+            exact.
+
+        :param k: int, optional (default=5).
+            Number of top predicted goods.
+        """
+        super().__init__(border)
+        self._k = k
+        checks.check_types(self._k, int, var_name="k")
+        checks.check_value(self._k, 0, None, True, var_name="k")
+
+    def scores(self, validation_labels, predictions, need_format=False):
+        """
+        Metric score of every check.
+
+        :param validation_labels: list.
+            List of lists with known data.
+
+        :param predictions: list.
+            List of lists with predicted data.
+
+        :param need_format: bool, optional (default=False).
+            Used to define that data is not formatted.
+
+        :return: np.ndarray.
+            Score of every check.
+        """
+        if need_format:
+            validation_labels, predictions = format_labels(validation_labels,
+                                                           predictions)
+
+        return ranking_scores(validation_labels, predictions,
+                              self._k)[self.score_name]
+
+    def test(self, validation_labels, predictions, need_format=False):
+        """
+        Main testing function.
+
+        :param validation_labels: list.
+            List of lists with known data.
+
+        :param predictions: list.
+            List of lists with predicted data.
+
+        :param need_format: bool, optional (default=False).
+            Used to define that data is not formatted.
+
+        :return: float.
+            A numerical estimate of the accuracy of the algorithm. 1.0 is
+            perfect prediction.
+        """
+        result = self.scores(validation_labels, predictions, need_format)
+        self._cache = float(result.sum()) / len(result)
         return self._cache
 
 
+class PrecisionAtK(RankingMetric):
+
+    score_name = "precision_at_k"
+
+
+class RecallAtK(RankingMetric):
+
+    score_name = "recall_at_k"
+
+
+class HitRate(RankingMetric):
+
+    score_name = "hit_rate"
+
+
+class MeanAveragePrecision(RankingMetric):
+
+    score_name = "average_precision"
+
+
 class TestModel(model.IModel):
 
     def fit(self, train_samples, train_labels, **kwargs):
-        checks.check_equality(len(train_samples), len(train_labels),
+        checks.check_equality(len(train_samples),
+                              model.get_labels_count(train_labels),
                               message="Samples and labels have different "
                                       "sizes")
 
     def predict(self, samples, **kwargs):
-        checks.check_equality(len(samples), len(kwargs["labels"]),
+        checks.check_equality(len(samples),
+                              model.get_labels_count(kwargs["labels"]),
                               message="Samples and labels have different "
                                       "sizes")
 
         predictions = []
         for _, label in zip(samples, kwargs["labels"]):
-            prediction = np.array(label)
+            prediction = model.to_dense_label(label)
             predictions.append(prediction)
         return predictions
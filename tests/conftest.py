@@ -0,0 +1,77 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mlalgorithms.shell import Shell, ml_config_path
+
+
+N_PERSONS = 60
+N_GOODS = 50
+CHECKS_PER_DAY = 40
+
+
+def generate_checks(n_days, first_day=0, first_chknum=1, random_state=0):
+    """
+    Generate checks in the Tinkoff schema, every person prefers own goods.
+    """
+    random_state = np.random.RandomState(random_state)
+    favourites = np.random.RandomState(1).randint(N_GOODS,
+                                                  size=(N_PERSONS, 3))
+
+    n_checks = n_days * CHECKS_PER_DAY
+    persons = random_state.randint(N_PERSONS, size=n_checks)
+    check_ids = np.repeat(np.arange(n_checks),
+                          random_state.randint(1, 5, size=n_checks))
+    goods = random_state.randint(N_GOODS, size=len(check_ids))
+    use_favourite = random_state.rand(len(check_ids)) < 0.6
+    goods[use_favourite] = favourites[
+        persons[check_ids], random_state.randint(3, size=len(check_ids))
+    ][use_favourite]
+
+    days = first_day + check_ids // CHECKS_PER_DAY
+    df = pd.DataFrame({
+        "chknum": first_chknum + check_ids,
+        "person_id": persons[check_ids],
+        "month": days // 28 + 1,
+        "day": days % 28 + 1,
+        "good": ["good_" + str(x) for x in goods],
+        "good_id": goods
+    }, columns=["chknum", "person_id", "month", "day", "good", "good_id"])
+    return df.drop_duplicates(["chknum", "good_id"]).reset_index(drop=True)
+
+
+@pytest.fixture
+def train_data():
+    return generate_checks(n_days=14)
+
+
+@pytest.fixture
+def next_day_data():
+    return generate_checks(n_days=1, first_day=14, first_chknum=10 ** 5,
+                           random_state=2)
+
+
+@pytest.fixture
+def test_data():
+    df = generate_checks(n_days=2, first_day=15, first_chknum=10 ** 6,
+                         random_state=3)
+    df_set = df[["chknum", "person_id", "month", "day"]].drop_duplicates()
+    df_menu = df[["month", "day", "good", "good_id"]].drop_duplicates()
+    return df_set.reset_index(drop=True), df_menu.reset_index(drop=True)
+
+
+@pytest.fixture
+def make_shell(tmp_path, monkeypatch):
+    # Log file of the shell is written to temporary directory.
+    monkeypatch.chdir(tmp_path)
+
+    def make(model_name, **config_params):
+        with open(ml_config_path, "r") as f:
+            config = json.loads(f.read())
+        config["selected_model"] = model_name
+        config.update(config_params)
+        return Shell(existing_parsed_json_dict=config)
+
+    return make
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def test_partial_fit_after_predict(make_shell, train_data, next_day_data,
+                                   test_data):
+    # Parsing of test data must not change incremental training, so both
+    # shells have the same validation score.
+    expected_shell = make_shell("MostPopularFromOwnOrders")
+    expected_shell.fit(train_data)
+    np.random.seed(0)
+    expected_shell.partial_fit(next_day_data)
+    expected_f1, _ = expected_shell.test()
+
+    shell = make_shell("MostPopularFromOwnOrders")
+    shell.fit(train_data)
+    shell.predict(*test_data)
+    np.random.seed(0)
+    shell.partial_fit(next_day_data)
+    f1, _ = shell.test()
+
+    assert expected_f1 > 0.0
+    assert f1 == expected_f1
+
+
+def test_partial_fit_updates_saved_dataset_stats(make_shell, train_data,
+                                                 next_day_data):
+    shell = make_shell("MostPopularFromOwnOrders")
+    shell.fit(train_data)
+    shell.partial_fit(next_day_data, validate=False)
+    shell.save_model("model.mdl")
+
+    loaded_shell = make_shell("MostPopularFromOwnOrders")
+    loaded_shell.load_model("model.mdl")
+    stats = loaded_shell.model_info["dataset_stats"]
+    assert stats["n_checks"] == (train_data["chknum"].nunique() +
+                                 next_day_data["chknum"].nunique())
+    assert stats["n_days"] == 15
+
+
+@pytest.mark.parametrize("predict_n_jobs", [1, 2])
+def test_predict_to_file_equals_predict(make_shell, train_data, test_data,
+                                        predict_n_jobs):
+    # Test set is split into several chunks.
+    shell = make_shell("MostPopularFromOwnOrders",
+                       predict_n_jobs=predict_n_jobs, predict_chunk_size=30,
+                       predict_shard_size=10)
+    shell.fit(train_data)
+    shell.predict(*test_data)
+    shell.output("expected.csv")
+    shell.predict_to_file(*test_data, output_filename="result.csv")
+
+    expected = pd.read_csv("expected.csv")
+    result = pd.read_csv("result.csv")
+    assert len(result) == len(test_data[0])
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_evaluate_ranks_by_model_scores(make_shell, train_data):
+    shell = make_shell("CooccurrenceModel")
+    shell.fit(train_data)
+    f1, _ = shell.test()
+    result, quality = shell.evaluate(k=3)
+
+    # Ranking changes only order of goods, not predicted multisets.
+    assert result["MeanF1Score"] == pytest.approx(f1)
+    assert 0.0 < result["MeanAveragePrecision"] <= result["HitRate"]
+    assert set(quality) == set(result)
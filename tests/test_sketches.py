@@ -0,0 +1,15 @@
+import numpy as np
+import pandas as pd
+
+from mlalgorithms.sketches import SpaceSavingCounter
+
+
+def test_exact_counter_orders_ties_like_value_counts():
+    random_state = np.random.RandomState(0)
+    for _ in range(50):
+        items = pd.Series(random_state.randint(10, size=40))
+        counter = SpaceSavingCounter()
+        counter.update_counts(items.value_counts())
+
+        assert (counter.most_common(5).index.tolist() ==
+                items.value_counts().head(5).index.tolist())
@@ -0,0 +1,39 @@
+import pytest
+
+from mlalgorithms import tester as tester_module
+
+
+GOOD = [[1, 2], [3]]
+BAD = [[4], [5, 6]]
+
+
+@pytest.mark.parametrize("confidence_interval", [None, 0.9])
+def test_quality_control_uses_last_test(confidence_interval):
+    # Quality control must use the value of the last test call, not the
+    # value cached by the first one.
+    tester = tester_module.Tester(invert_list=["MeanF1Score"])
+    for predictions in (GOOD, BAD, GOOD):
+        result = tester.test(GOOD, predictions,
+                             confidence_interval=confidence_interval,
+                             random_state=0)
+        value = result if confidence_interval is None else result[0]
+        assert tester.quality_control(GOOD, predictions) == (value > 0.5)
+
+
+def test_confidence_interval_contains_value():
+    tester = tester_module.Tester(invert_list=[])
+    value, (lower, upper) = tester.test(GOOD, [[1], [3]],
+                                        confidence_interval=0.9,
+                                        random_state=0)
+    assert value == pytest.approx(tester.test(GOOD, [[1], [3]]))
+    assert lower <= value <= upper
+
+
+def test_evaluator_without_invert_list():
+    evaluator = tester_module.Evaluator(["MeanF1Score", "HitRate"], k=1)
+    result = evaluator.test(GOOD, [[2, 1], [4, 3]])
+    assert result == {"MeanF1Score": pytest.approx(5 / 6),
+                      "HitRate": pytest.approx(0.5)}
+    assert evaluator.quality_control(GOOD, [[2, 1], [4, 3]]) == {
+        "MeanF1Score": False, "HitRate": False
+    }